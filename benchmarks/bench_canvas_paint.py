@@ -0,0 +1,63 @@
+"""画布重绘基准：比较每帧新建字体/画笔/文字与使用共享绘制缓存的 paintEvent 耗时
+
+运行方式（项目根目录）：python -m benchmarks.bench_canvas_paint [帧数]
+无显示环境下可设置 QT_QPA_PLATFORM=offscreen
+"""
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtCore import Qt
+
+from src.view.render_cache import RenderCache, shared_render_cache
+from src.view.stack_canvas import StackCanvas
+from src.view.queue_canvas import QueueCanvas
+from src.view.linked_list_canvas import LinkedListCanvas
+
+
+def _make_canvases():
+    stack = StackCanvas(capacity=200)
+    stack.resize(400, 900)
+    stack.update_data([f"v{i}" for i in range(200)])
+
+    queue = QueueCanvas(capacity=200)
+    queue.resize(1600, 300)
+    queue.update_data([f"v{i}" for i in range(200)])
+
+    linked = LinkedListCanvas()
+    linked.resize(1600, 300)
+    linked.update_data([f"v{i}" for i in range(1000)])
+    return [("StackCanvas", stack), ("QueueCanvas", queue), ("LinkedListCanvas", linked)]
+
+
+def _measure(widget, frames):
+    """把画布重复渲染到离屏图像上，返回平均每帧毫秒数"""
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.white)
+    widget.render(image)  # 预热
+    start = time.perf_counter()
+    for _ in range(frames):
+        painter = QPainter(image)
+        widget.render(painter)
+        painter.end()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = QApplication.instance() or QApplication(sys.argv)
+    canvases = _make_canvases()
+
+    print(f"帧数: {frames}")
+    for name, widget in canvases:
+        widget.render_cache = RenderCache(enabled=False)
+        uncached = _measure(widget, frames)
+        widget.render_cache = shared_render_cache()
+        cached = _measure(widget, frames)
+        print(f"{name:<18} 无缓存 {uncached:7.3f} ms/帧   有缓存 {cached:7.3f} ms/帧   "
+              f"加速 {uncached / cached:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
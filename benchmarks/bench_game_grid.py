@@ -0,0 +1,76 @@
+"""地图网格后端基准：在合成的大地图上比较各后端的内存占用与整图扫描耗时
+
+运行方式（项目根目录）：python -m benchmarks.bench_game_grid [边长]
+"""
+import sys
+import time
+import tracemalloc
+
+from src.game.grid import LIST, ARRAY, NUMPY, numpy_available, make_grid, copy_grid, changed_rows
+
+
+def synthetic_rows(size):
+    """确定性的合成地图：大部分空地，夹杂墙、道具与虚空"""
+    palette = [0, 0, 0, 0, 0, 1, 1, 3, 4, 5, 6, 7, 8, -1]
+    return [[palette[(x * 7 + y * 13 + x * y) % len(palette)] for x in range(size)]
+            for y in range(size)]
+
+
+def _measure_memory(rows, backend):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    grid = make_grid(rows, backend)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return grid, after - before
+
+
+def _full_scan(grid, snapshot):
+    """旧版 render 的扫描方式：逐格与上次的值比较"""
+    changed = 0
+    for y in range(len(grid)):
+        for x in range(len(grid[0])):
+            if grid[y][x] != snapshot[y][x]:
+                changed += 1
+    return changed
+
+
+def _row_scan(grid, snapshot):
+    """新版 render 的扫描方式：先整行比较，只逐格扫描变化的行"""
+    changed = 0
+    for y in changed_rows(grid, snapshot):
+        row, old = grid[y], snapshot[y]
+        for x in range(len(row)):
+            if row[x] != old[x]:
+                changed += 1
+    return changed
+
+
+def _time(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rows = synthetic_rows(size)
+    backends = [LIST, ARRAY] + ([NUMPY] if numpy_available() else [])
+    if not numpy_available():
+        print("未安装 NumPy，跳过 numpy 后端")
+
+    print(f"地图: {size} x {size}（修改 1 个格子后扫描）")
+    for backend in backends:
+        grid, total = _measure_memory(rows, backend)
+        snapshot = copy_grid(grid)
+        grid[size // 2][size // 3] = 9 if grid[size // 2][size // 3] != 9 else 0
+
+        full_ms, full_changed = _time(_full_scan, grid, snapshot)
+        row_ms, row_changed = _time(_row_scan, grid, snapshot)
+        assert full_changed == row_changed == 1
+        print(f"{backend:<6} 内存 {total / 1024 / 1024:7.2f} MB ({total / size / size:5.2f} 字节/格)   "
+              f"逐格扫描 {full_ms:8.1f} ms   整行比较 {row_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
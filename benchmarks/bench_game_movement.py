@@ -0,0 +1,112 @@
+"""移动与碰撞基准：比较逐格查 grid 的旧碰撞检测与属性掩码查表，并测量无界面引擎与 process_movement 的吞吐
+
+运行方式（项目根目录）：python -m benchmarks.bench_game_movement [次数]
+无显示环境下可设置 QT_QPA_PLATFORM=offscreen；缺少 QtMultimedia 时跳过 process_movement 部分
+"""
+import sys
+import time
+
+from src.game.game_model import GameModel
+from src.game.game_engine import GameEngine, LEFT, RIGHT, DOWN
+
+
+def _legacy_try_move(model, new_x, new_y):
+    """旧版 try_move 的纯查询部分（每次构造格子列表，逐格查 grid），仅用于对照"""
+    size = model.player_size
+    left = new_x + (1 - size) / 2
+    right = left + size
+    top = new_y + (1 - size) / 2
+    bottom = top + size
+    tiles = []
+    for y in range(int(top), int(bottom) + 1):
+        for x in range(int(left), int(right) + 1):
+            tiles.append((x, y))
+    for tx, ty in tiles:
+        if not (0 <= tx < model.grid_width and 0 <= ty < model.grid_height):
+            return False
+        val = model.grid[ty][tx]
+        if val == 1 or val == -1 or val == 8:
+            return False
+        if val in [3, 4, 5, 6, 7]:
+            return True
+    return True
+
+
+def _positions(model, count):
+    """在地图上均匀取样的玩家坐标"""
+    w, h = model.grid_width, model.grid_height
+    return [((i * 0.37) % w, (i * 0.23) % h) for i in range(count)]
+
+
+def bench_collision(count):
+    model = GameModel(preload=False)
+    positions = _positions(model, count)
+
+    start = time.perf_counter()
+    for x, y in positions:
+        _legacy_try_move(model, x, y)
+    legacy = time.perf_counter() - start
+
+    probe = model.collision_flags
+    start = time.perf_counter()
+    for x, y in positions:
+        probe(x, y)
+    masked = time.perf_counter() - start
+
+    print(f"碰撞检测 {count} 次")
+    print(f"  逐格查 grid   {legacy / count * 1e9:8.1f} ns/次")
+    print(f"  属性掩码查表  {masked / count * 1e9:8.1f} ns/次   加速 {legacy / masked:5.2f}x")
+
+
+def bench_engine(steps):
+    """无界面引擎：左右往返、偶尔下移，每 200 步换一次方向"""
+    model = GameModel(preload=False)
+    engine = GameEngine(model)
+    start = time.perf_counter()
+    for i in range(steps):
+        inputs = RIGHT if (i // 200) % 2 == 0 else LEFT
+        if i % 50 == 0:
+            inputs |= DOWN
+        engine.step(inputs)
+        if model.is_game_over:
+            engine.reset()
+    elapsed = time.perf_counter() - start
+    print(f"GameEngine.step {steps} 步: {elapsed / steps * 1e6:8.2f} us/步   {steps / elapsed:10.0f} 步/秒")
+
+
+def bench_process_movement(frames):
+    try:
+        from PyQt6.QtWidgets import QApplication
+        from PyQt6.QtCore import Qt
+        app = QApplication.instance() or QApplication(sys.argv)
+        from src.game.game_view import GameView
+        from src.game.game_controller import GameController
+    except ImportError as e:
+        print(f"跳过 process_movement 基准：{e}")
+        return
+
+    view = GameView()
+    view.resize(1200, 800)
+    controller = GameController(view)
+    controller.step_sound.setVolume(0)
+
+    # 左右往返移动，每 200 帧换一次方向
+    start = time.perf_counter()
+    for i in range(frames):
+        controller.pressed_keys = {Qt.Key.Key_D if (i // 200) % 2 == 0 else Qt.Key.Key_A}
+        controller.process_movement()
+    elapsed = time.perf_counter() - start
+    print(f"process_movement {frames} 帧: {elapsed / frames * 1e6:8.1f} us/帧   "
+          f"{frames / elapsed:8.0f} 帧/秒")
+    controller.shutdown()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    bench_collision(count)
+    bench_engine(count)
+    bench_process_movement(min(count, 5000))
+
+
+if __name__ == "__main__":
+    main()
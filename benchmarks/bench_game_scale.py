@@ -0,0 +1,99 @@
+"""大地图压力基准：用程序化生成的地图测量加载、场景构建、每帧渲染、内存与模拟吞吐
+
+运行方式（项目根目录）：python -m benchmarks.bench_game_scale [边长 ...]
+无显示环境下可设置 QT_QPA_PLATFORM=offscreen
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage, QPainter
+
+from benchmarks.bench_game_scene import rss_mb
+from src.game.game_model import GameModel
+from src.game.game_engine import GameEngine, RIGHT, DOWN
+from src.game.game_view import GameView
+from src.game.grid import COMPACT
+from src.game.map_generator import MapSpec, write_map
+
+FRAMES = 200
+ENGINE_STEPS = 20_000
+
+
+def _load(map_dir, name):
+    model = GameModel(grid_backend=COMPACT, preload=False)
+    model.maps_path = map_dir
+    model.level_files = [name]
+    gc.collect()
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    model.load_level(0)
+    load_ms = (time.perf_counter() - start) * 1000
+    return model, load_ms, rss_mb() - rss_before
+
+
+def _render(model):
+    gc.collect()
+    rss_before = rss_mb()
+    view = GameView()
+    view.resize(1200, 800)
+    pos = (model.player_x, model.player_y)
+    start = time.perf_counter()
+    view.render(model.grid, pos, model.message, dirty_tiles=model.take_dirty_tiles())
+    build_ms = (time.perf_counter() - start) * 1000
+    rss = rss_mb() - rss_before
+
+    # 每帧：玩家移动 0.1 格，更新场景并把视口画到离屏图像上
+    image = QImage(view.view.viewport().size(), QImage.Format.Format_ARGB32_Premultiplied)
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        view.render(model.grid, (pos[0] + i * 0.1, pos[1]), model.message, dirty_tiles=())
+        painter = QPainter(image)
+        view.view.render(painter)
+        painter.end()
+    frame_ms = (time.perf_counter() - start) * 1000 / FRAMES
+    view.deleteLater()
+    return build_ms, frame_ms, rss
+
+
+def _simulate(model):
+    engine = GameEngine(model)
+    start = time.perf_counter()
+    for i in range(ENGINE_STEPS):
+        engine.step(RIGHT if (i // 100) % 2 == 0 else DOWN)
+        if model.is_game_over:
+            engine.reset()
+    return ENGINE_STEPS / (time.perf_counter() - start)
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [250, 500, 1000, 2000]
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            name = f"gen_{size}.txt"
+            start = time.perf_counter()
+            write_map(MapSpec(size, size, seed=size), os.path.join(tmp, name))
+            gen_ms = (time.perf_counter() - start) * 1000
+            file_mb = os.path.getsize(os.path.join(tmp, name)) / 1024 / 1024
+
+            model, load_ms, load_rss = _load(tmp, name)
+            build_ms, frame_ms, view_rss = _render(model)
+            steps_per_s = _simulate(model)
+            app.processEvents()
+
+            print(f"地图 {size} x {size}（{file_mb:.1f} MB，生成 {gen_ms:.0f} ms）")
+            print(f"  加载       {load_ms:9.1f} ms   内存 +{load_rss:7.1f} MB")
+            print(f"  场景构建   {build_ms:9.1f} ms   内存 +{view_rss:7.1f} MB")
+            print(f"  每帧渲染   {frame_ms:9.2f} ms   ({1000 / frame_ms:6.0f} FPS)")
+            print(f"  模拟       {steps_per_s:9.0f} 步/秒")
+            # 同一张地图第二次加载时会读取编译好的 .lvl
+            _, reload_ms, _ = _load(tmp, name)
+            print(f"  再次加载   {reload_ms:9.1f} ms（.lvl）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""游戏场景基准：比较每格一个文字图元（一次性/分块）与图集贴图分块的加载耗时、内存与帧率
+
+运行方式（项目根目录）：python -m benchmarks.bench_game_scene [边长 ...]
+无显示环境下可设置 QT_QPA_PLATFORM=offscreen
+"""
+import gc
+import os
+import sys
+import time
+
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage, QPainter
+
+from benchmarks.bench_game_grid import synthetic_rows
+from src.game.game_view import GameView
+from src.game.grid import make_grid
+
+EAGER_MAX_SIZE = 250  # 一次性生成全部文字图元太慢、太占内存，只在小地图上对照
+
+
+def rss_mb():
+    """当前进程常驻内存 (MB)，仅 Linux 可用"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        return float("nan")
+
+
+def _measure(grid, lazy, atlas, frames):
+    gc.collect()
+    rss_before = rss_mb()
+    view = GameView()
+    view.resize(1200, 800)
+    view.lazy_chunks = lazy
+    view.use_tile_atlas = atlas
+    size = len(grid)
+
+    start = time.perf_counter()
+    view.render(grid, (size / 2, size / 2), "bench")
+    load_ms = (time.perf_counter() - start) * 1000
+    items = len(view.scene.items())
+    rss = rss_mb() - rss_before
+
+    # 帧率：玩家每帧移动 0.1 格（与游戏移速相同），每帧更新场景并把视口画到离屏图像上
+    viewport = view.view.viewport()
+    image = QImage(viewport.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    start = time.perf_counter()
+    for i in range(frames):
+        p = size / 2 + i * 0.1
+        view.render(grid, (p, p), "bench", dirty_tiles=())
+        painter = QPainter(image)
+        view.view.render(painter)
+        painter.end()
+    fps = frames / (time.perf_counter() - start)
+
+    view.deleteLater()
+    return load_ms, items, rss, fps
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 250, 500]
+    frames = 300
+    app = QApplication.instance() or QApplication(sys.argv)
+    cases = [
+        ("文字图元 一次性", False, False),
+        ("文字图元 分块", True, False),
+        ("图集 分块", True, True),
+    ]
+    for size in sizes:
+        grid = make_grid(synthetic_rows(size))
+        print(f"地图: {size} x {size}")
+        for name, lazy, atlas in cases:
+            if not lazy and size > EAGER_MAX_SIZE:
+                continue
+            load_ms, items, rss, fps = _measure(grid, lazy, atlas, frames)
+            print(f"  {name:<10} 加载 {load_ms:9.1f} ms   图元 {items:7d}   内存 +{rss:7.1f} MB   "
+                  f"{fps:7.1f} FPS")
+            app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
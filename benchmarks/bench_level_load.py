@@ -0,0 +1,63 @@
+"""文本地图解析基准：在合成的大地图文件上比较整文件读入与流式 / mmap 解析的耗时与峰值内存
+
+运行方式（项目根目录）：python -m benchmarks.bench_level_load [边长]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.game.level_format import parse_text, parse_file
+
+SYMBOLS = ".....##WSKFMD "
+
+
+def write_synthetic_map(path, size):
+    """确定性的合成文本地图（逐行写出，不在内存中拼整张图）"""
+    with open(path, "w", encoding="utf-8") as f:
+        for y in range(size):
+            row = "".join(SYMBOLS[(x * 7 + y * 13 + x * y) % len(SYMBOLS)] for x in range(size))
+            if y == size // 2:
+                row = "P" + row[1:]
+            f.write(row + "\n")
+
+
+def _read_whole(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_text(f.read())
+
+
+def _measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    level = func(*args)
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return level, elapsed, peak
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    cases = [
+        ("整文件读入", _read_whole),
+        ("流式逐行", lambda p: parse_file(p, use_mmap=False)),
+        ("mmap", lambda p: parse_file(p, use_mmap=True)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.txt")
+        write_synthetic_map(path, size)
+        file_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"地图: {size} x {size}，文件 {file_mb:.1f} MB（网格本身 {size * size / 1024 / 1024:.1f} MB）")
+        reference = None
+        for name, func in cases:
+            level, elapsed, peak = _measure(func, path)
+            if reference is None:
+                reference = level
+            assert level.cells == reference.cells and level.player_start == reference.player_start
+            print(f"  {name:<8} 耗时 {elapsed:8.1f} ms   峰值内存 {peak / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
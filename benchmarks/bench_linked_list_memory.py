@@ -0,0 +1,68 @@
+"""链表节点内存基准：比较 __dict__ 节点、__slots__ 节点与数组池后端的每节点字节数
+
+运行方式（项目根目录）：python -m benchmarks.bench_linked_list_memory [节点数]
+"""
+import sys
+import tracemalloc
+
+from src.model.linked_list import create_linked_list
+
+
+class _DictNode:
+    """旧版节点（带 __dict__），仅用于对照"""
+    def __init__(self, data):
+        self.data = data
+        self.next = None
+
+
+def _build_dict_nodes(values):
+    head = tail = None
+    for v in values:
+        node = _DictNode(v)
+        if head is None:
+            head = node
+        else:
+            tail.next = node
+        tail = node
+    return head
+
+
+def _measure(build, values):
+    """返回构建结构所分配的字节数（数据对象本身事先创建，不计入）"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    structure = build(values)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return after - before
+
+
+def _build_linked_list(storage, doubly):
+    def build(values):
+        ll = create_linked_list(storage, doubly=doubly)
+        for v in values:
+            ll.append(v)
+        return ll
+    return build
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    values = list(range(count))
+
+    cases = [
+        ("__dict__ 节点 (旧)", _build_dict_nodes),
+        ("__slots__ 节点", _build_linked_list("node", False)),
+        ("__slots__ 节点 (双向)", _build_linked_list("node", True)),
+        ("数组池", _build_linked_list("pool", False)),
+        ("数组池 (双向)", _build_linked_list("pool", True)),
+    ]
+    print(f"节点数: {count}")
+    for name, build in cases:
+        total = _measure(build, values)
+        print(f"{name:<20} {total / count:8.1f} 字节/节点   共 {total / 1024 / 1024:7.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
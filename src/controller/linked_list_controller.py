@@ -4,7 +4,7 @@ from PyQt6.QtMultimedia import QSoundEffect
 from src.model.linked_list import LinkedList
 from src.view.linked_list_canvas import LinkedListCanvas
 from src.model.exceptions import StructureEmptyError, StructureValueError
-from src.utils import get_base_path
+from src.utils import get_base_path, split_batch_input
 
 import os
 
@@ -37,7 +37,10 @@ class LinkedListController:
         self.error_sound.setVolume(0.3)
         self.done_sound.setVolume(0.5)
 
+        # 初始化画布显示，之后画布只订阅模型的增量变更事件，
+        # 并按事件顺序排队播放插入/删除动画
         self.refresh_view()
+        self.linked_list.subscribe(self.canvas.apply_change)
 
     def on_append_click(self):
         """尾插"""
@@ -46,13 +49,23 @@ class LinkedListController:
             self._show_error("请先输入数据！")
             return
         
-        old_size = self.linked_list.size()
+        # 画布根据模型事件排队播放尾部插入动画
         self.linked_list.append(value)
-        self.refresh_view()
-        # 触发尾部插入滑动动画
-        self.canvas.animate_insert_slide(old_size)
         self._on_success(f"尾部添加: {value}", self.add_sound)
 
+    def on_extend_click(self):
+        """批量尾插（输入框内容以逗号分隔）"""
+        values = split_batch_input(self.input_field.text())
+        if not values:
+            self._show_error("请先输入数据（多个元素用逗号分隔）！")
+            return
+        self.load_items(values)
+
+    def load_items(self, values):
+        """批量尾插：一次挂接整段节点，画布只刷新一次（不逐个播放插入动画）"""
+        self.linked_list.extend(values)
+        self._on_success(f"尾部批量添加 {len(values)} 个元素", self.add_sound)
+
     def on_prepend_click(self):
         """头插"""
         value = self.input_field.text().strip()
@@ -61,9 +74,6 @@ class LinkedListController:
             return
         
         self.linked_list.prepend(value)
-        self.refresh_view()
-        # 触发头部插入滑动动画
-        self.canvas.animate_insert_slide(0)
         self._on_success(f"头部添加: {value}", self.add_sound)
 
     def on_delete_click(self):
@@ -74,15 +84,10 @@ class LinkedListController:
             return
 
         try:
-            items = self.linked_list.get_items()
-            delete_index = -1
-            for i, item in enumerate(items):
-                if str(item) == str(value):
-                    delete_index = i
-                    break
-
+            # 一次调用同时完成查找与删除
+            delete_index = self.linked_list.delete_value(value)
             if delete_index >= 0:
-                self._execute_delete(value, delete_index)
+                self._on_success(f"成功删除: {value}", self.remove_sound)
             else:
                 self.status_message.setText(f"未找到元素: {value}")
                 self.status_message.setStyleSheet("color: orange;")
@@ -90,15 +95,6 @@ class LinkedListController:
                 self.input_field.setFocus()
         except StructureEmptyError:
             self._show_error("链表为空！")
-    
-    def _execute_delete(self, value, index):
-        """执行删除操作"""
-        success = self.linked_list.delete(value)
-        if success:
-            self.refresh_view()
-            # 删除几何动画
-            self.canvas.animate_delete(index, value)
-            self._on_success(f"成功删除: {value}", self.remove_sound)
 
     def on_insert_at_click(self):
         """在指定位置插入"""
@@ -119,9 +115,6 @@ class LinkedListController:
         try:
             position = int(position_text)
             self.linked_list.insert_at(position, value)
-            self.refresh_view()
-            # 触发插入滑动动画
-            self.canvas.animate_insert_slide(position)
             self._on_success(f"在位置 {position} 插入: {value}", self.add_sound)
             if self.position_input:
                 self.position_input.clear()
@@ -134,9 +127,6 @@ class LinkedListController:
         """头部删除"""
         try:
             deleted_value = self.linked_list.delete_head()
-            self.refresh_view()
-            # 头部删除几何动画
-            self.canvas.animate_delete(0, deleted_value)
             self._on_success(f"头部删除: {deleted_value}", self.remove_sound)
         except StructureEmptyError:
             self._show_error("链表为空！")
@@ -144,11 +134,7 @@ class LinkedListController:
     def on_delete_tail_click(self):
         """尾部删除"""
         try:
-            tail_index = max(0, self.linked_list.size() - 1)
             deleted_value = self.linked_list.delete_tail()
-            self.refresh_view()
-            # 尾部删除几何动画
-            self.canvas.animate_delete(tail_index, deleted_value)
             self._on_success(f"尾部删除: {deleted_value}", self.remove_sound)
         except StructureEmptyError:
             self._show_error("链表为空！")
@@ -176,17 +162,21 @@ class LinkedListController:
         """执行指定位置删除"""
         try:
             deleted_value = self.linked_list.delete_at(position)
-            self.refresh_view()
-            # 指定位置删除几何动画
-            self.canvas.animate_delete(position, deleted_value)
-            self.status_message.setText(f"位置 {position} 删除: {deleted_value}")
+            self.status_message.setText(self._with_backlog(f"位置 {position} 删除: {deleted_value}"))
             self.status_message.setStyleSheet("color: green;")
             self.remove_sound.play()
             self.position_input.setFocus()
         except (StructureValueError, StructureEmptyError) as e:
             self._show_error(str(e))
 
+    def on_skip_animation_click(self):
+        """跳过动画：结束当前动画并直接显示所有等待中的操作结果"""
+        self.canvas.flush_animations()
+        self.status_message.setText("已跳过动画")
+        self.status_message.setStyleSheet("color: green;")
+
     def refresh_view(self):
+        """整体同步链表画布显示（初始化时使用，之后依靠增量事件）"""
         self.canvas.update_data(self.linked_list.get_items())
 
     # 辅助方法：减少重复代码
@@ -197,9 +187,13 @@ class LinkedListController:
         self.input_field.setFocus()
 
     def _on_success(self, msg, sound):
-        self.refresh_view()
         self.input_field.clear()
         self.input_field.setFocus()
-        self.status_message.setText(msg)
+        self.status_message.setText(self._with_backlog(msg))
         self.status_message.setStyleSheet("color: green;")
-        sound.play()
\ No newline at end of file
+        sound.play()
+
+    def _with_backlog(self, msg):
+        """动画积压时在状态栏提示等待播放的操作数"""
+        depth = self.canvas.backlog_depth()
+        return f"{msg}（{depth} 个操作等待动画）" if depth else msg
\ No newline at end of file
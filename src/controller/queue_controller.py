@@ -2,7 +2,7 @@ from PyQt6.QtWidgets import QLineEdit, QLabel
 from src.model.queue import Queue
 from src.view.queue_canvas import QueueCanvas
 from src.model.exceptions import StructureFullError, StructureEmptyError, StructureValueError
-from src.utils import get_base_path
+from src.utils import get_base_path, split_batch_input
 
 import os
 from PyQt6.QtCore import QUrl
@@ -39,8 +39,9 @@ class QueueController:
         self.error_sound.setVolume(0.3)
         self.done_sound.setVolume(0.5)
 
-        # 初始化画布显示
+        # 初始化画布显示，之后画布只订阅模型的增量变更事件
         self.queue_refresh_view()
+        self.queue.subscribe(self.canvas.apply_change)
 
 
     def on_enqueue_click(self):
@@ -55,11 +56,9 @@ class QueueController:
             return
         
         try:
-            # 1. 修改后端数据
+            # 1. 修改后端数据（画布通过变更事件自动同步）
             self.queue.enqueue(value)
-            # 2. 刷新前端显示
-            self.queue_refresh_view()
-            # 3. 清空输入框
+            # 2. 清空输入框
             self.input_field.clear()
             self.input_field.setFocus()
 
@@ -73,13 +72,38 @@ class QueueController:
             self.input_field.setFocus()
             self.error_sound.play()
 
+    def on_enqueue_many_click(self):
+        """处理批量入队逻辑（输入框内容以逗号分隔）"""
+        values = split_batch_input(self.input_field.text())
+        if not values:
+            self.status_message.setText("请先输入数据（多个元素用逗号分隔）！")
+            self.status_message.setStyleSheet("color: orange;")
+            self.input_field.setFocus()
+            self.error_sound.play()
+            return
+        self.load_items(values)
+
+    def load_items(self, values):
+        """批量入队：容量只校验一次，画布只刷新一次"""
+        try:
+            self.queue.enqueue_many(values)
+            self.input_field.clear()
+            self.input_field.setFocus()
+
+            self.status_message.setText(f"成功批量入队 {len(values)} 个元素")
+            self.status_message.setStyleSheet("color: green;")
+            self.enqueue_sound.play()
+        except StructureFullError:
+            self.status_message.setText(f"剩余容量不足，无法入队 {len(values)} 个元素！")
+            self.status_message.setStyleSheet("color: red;")
+            self.input_field.setFocus()
+            self.error_sound.play()
+
     def on_dequeue_click(self):
         """处理出队逻辑"""
         try:
-            # 1. 修改后端数据
+            # 1. 修改后端数据（画布通过变更事件自动同步）
             dequeued_val = self.queue.dequeue()
-            # 2. 刷新前端显示
-            self.queue_refresh_view()
             self.status_message.setText(f"成功出队元素: {dequeued_val}")
             self.status_message.setStyleSheet("color: green;")
             self.input_field.setFocus()
@@ -103,8 +127,6 @@ class QueueController:
         new_capacity = int(new_capacity_str)
         try:
             self.queue.set_capacity(new_capacity)
-            self.canvas.set_capacity(new_capacity)
-            self.queue_refresh_view()
             self.status_message.setText(f"队列容量已设置为: {new_capacity}")
             self.status_message.setStyleSheet("color: green;")
             self.queue_capacity_input.clear()
@@ -123,8 +145,6 @@ class QueueController:
         current_capacity = self.queue.capacity()
         new_capacity = current_capacity + 1
         self.queue.set_capacity(new_capacity)
-        self.canvas.set_capacity(new_capacity)
-        self.queue_refresh_view()
         self.status_message.setText(f"队列容量已增加到: {new_capacity}")
         self.status_message.setStyleSheet("color: green;")
         self.done_sound.play()
@@ -143,8 +163,6 @@ class QueueController:
         new_capacity = current_capacity - 1
         try:
             self.queue.set_capacity(new_capacity)
-            self.canvas.set_capacity(new_capacity)
-            self.queue_refresh_view()
             self.status_message.setText(f"队列容量已减少到: {new_capacity}")
             self.status_message.setStyleSheet("color: green;")
             self.done_sound.play()
@@ -154,6 +172,5 @@ class QueueController:
             self.error_sound.play()
 
     def queue_refresh_view(self):
-        """刷新队列画布显示"""
-        current_items = self.queue.get_items()
-        self.canvas.update_data(current_items)
\ No newline at end of file
+        """同步队列画布显示（传入零拷贝视图，无需复制列表）"""
+        self.canvas.update_data(self.queue.view())
\ No newline at end of file
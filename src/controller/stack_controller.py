@@ -2,7 +2,7 @@ from PyQt6.QtWidgets import QLineEdit, QLabel, QMessageBox
 from src.model.stack import Stack
 from src.view.stack_canvas import StackCanvas
 from src.model.exceptions import StructureFullError, StructureEmptyError, StructureValueError
-from src.utils import get_base_path
+from src.utils import get_base_path, split_batch_input
 
 import os
 from PyQt6.QtCore import QUrl
@@ -43,8 +43,9 @@ class StackController:
         self.done_sound.setVolume(0.5)
 
 
-        # 初始化画布显示
+        # 初始化画布显示，之后画布只订阅模型的增量变更事件
         self.stack_refresh_view()
+        self.stack.subscribe(self.canvas.apply_change)
 
 
     def on_push_click(self):
@@ -60,11 +61,9 @@ class StackController:
             return
         
         try:
-            # 1. 修改后端数据
+            # 1. 修改后端数据（画布通过变更事件自动同步）
             self.stack.push(value)
-            # 2. 刷新前端显示
-            self.stack_refresh_view()
-            # 3. 清空输入框
+            # 2. 清空输入框
             self.stack_input_field.clear()
             self.stack_input_field.setFocus()
 
@@ -79,13 +78,38 @@ class StackController:
             self.stack_input_field.setFocus()
             self.error_sound.play()
 
+    def on_push_many_click(self):
+        """处理批量入栈逻辑（输入框内容以逗号分隔）"""
+        values = split_batch_input(self.stack_input_field.text())
+        if not values:
+            self.stack_status_message.setText("请先输入数据（多个元素用逗号分隔）！")
+            self.stack_status_message.setStyleSheet("color: orange;")
+            self.stack_input_field.setFocus()
+            self.error_sound.play()
+            return
+        self.load_items(values)
+
+    def load_items(self, values):
+        """批量入栈：容量只校验一次，画布只刷新一次"""
+        try:
+            self.stack.push_many(values)
+            self.stack_input_field.clear()
+            self.stack_input_field.setFocus()
+
+            self.stack_status_message.setText(f"成功批量入栈 {len(values)} 个元素")
+            self.stack_status_message.setStyleSheet("color: green;")
+            self.push_sound.play()
+        except StructureFullError:
+            self.stack_status_message.setText(f"剩余容量不足，无法入栈 {len(values)} 个元素！")
+            self.stack_status_message.setStyleSheet("color: red;")
+            self.stack_input_field.setFocus()
+            self.error_sound.play()
+
     def on_pop_click(self):
         """处理出栈逻辑"""
         try:
-            # 1. 修改后端数据
+            # 1. 修改后端数据（画布通过变更事件自动同步）
             popped_val = self.stack.pop()
-            # 2. 刷新前端显示
-            self.stack_refresh_view()
             self.stack_status_message.setText(f"成功出栈元素: {popped_val}")
             self.stack_status_message.setStyleSheet("color: green;")
             self.stack_input_field.setFocus()
@@ -111,8 +135,6 @@ class StackController:
         new_capacity = int(new_capacity_str)
         try:
             self.stack.set_capacity(new_capacity)
-            self.canvas.set_capacity(new_capacity)
-            self.stack_refresh_view()
             self.stack_status_message.setText(f"栈容量已设置为: {new_capacity}")
             self.stack_status_message.setStyleSheet("color: green;")
             self.stack_capacity_input.clear()
@@ -129,8 +151,6 @@ class StackController:
         current_capacity = self.stack.capacity()
         new_capacity = current_capacity + 1
         self.stack.set_capacity(new_capacity)
-        self.canvas.set_capacity(new_capacity)
-        self.stack_refresh_view()
         self.stack_status_message.setText(f"栈容量已增加到: {new_capacity}")
         self.stack_status_message.setStyleSheet("color: green;")
         self.done_sound.play()
@@ -147,8 +167,6 @@ class StackController:
         new_capacity = current_capacity - 1
         try:
             self.stack.set_capacity(new_capacity)
-            self.canvas.set_capacity(new_capacity)
-            self.stack_refresh_view()
             self.stack_status_message.setText(f"栈容量已减少到: {new_capacity}")
             self.stack_status_message.setStyleSheet("color: green;")
             self.done_sound.play()
@@ -158,6 +176,6 @@ class StackController:
             self.error_sound.play()
 
     def stack_refresh_view(self):
-        """刷新栈画布显示"""
+        """整体同步栈画布显示（初始化时使用，之后依靠增量事件）"""
         current_items = self.stack.get_items()
         self.canvas.update_data(current_items)
\ No newline at end of file
@@ -1,11 +1,17 @@
 from PyQt6.QtCore import Qt, QObject,QTimer,QUrl
 from src.game.game_model import GameModel
 from src.game.game_view import GameView
-from src.model.exceptions import StructureFullError,StructureEmptyError
+from src.game.game_loop import FixedTimestep, RateCounter, interpolate
+from src.game import game_engine
+from src.game.game_engine import GameEngine
+from src.game.replay import InputRecorder, save_recording
 from PyQt6.QtMultimedia import QSoundEffect
-import os,math,time
+import os,time
+import logging
 from src.utils import get_base_path
 
+logger = logging.getLogger(__name__)
+
 class GameController(QObject):
     def __init__(self, view: GameView):
         super().__init__()
@@ -34,6 +40,7 @@ class GameController(QObject):
         # 初始化 MVC 组件
         self.view = view
         self.model = GameModel() 
+        self.engine = GameEngine(self.model)  # 游戏规则都在无界面的引擎中
 
         # 连接键盘信号
         self.view.key_pressed_signal.connect(self.on_key_pressed)
@@ -43,30 +50,51 @@ class GameController(QObject):
         self.view.game_over_overlay.retry_signal.connect(self.reset_game)
         self.view.game_over_overlay.quit_signal.connect(self.quit_game)
 
-        # 移动循环
+        # 移动循环：定时器只负责渲染帧，模拟按固定步长推进（见 src/game/game_loop.py）
         self.pressed_keys = set()
         self.move_timer = QTimer()
-        self.move_timer.setInterval(16)  # 每16毫秒处理一次移动
+        self.move_timer.setInterval(16)  # 渲染帧间隔
         self.move_timer.timeout.connect(self.process_movement)
-        # 记录上次帧时间，用于按实际时间步长移动
+        self.timestep = FixedTimestep()
+        self.prev_pos = (self.model.player_x, self.model.player_y)  # 上一模拟步的位置，用于插值
+        self.sim_rate = RateCounter()
+        self.render_rate = RateCounter()
+        # 记录上次帧时间，用于累加真实经过的时间
         self.last_update_time = time.perf_counter()
-        # 重要信息保护：记录最近一次“非移动提示”的时间与上次消息
-        self.last_important_msg_time = self.last_update_time
-        self.last_seen_message = ""
+        # 引擎事件 -> 音效
+        self.event_sounds = {
+            game_engine.PICKED_UP: self.push_sound,
+            game_engine.DOOR_OPENED: self.pop_sound,
+            game_engine.MONSTER_KILLED: self.pop_sound,
+            game_engine.FIRE_EXTINGUISHED: self.pop_sound,
+            game_engine.BACKPACK_FULL: self.error_sound,
+            game_engine.DOOR_LOCKED: self.error_sound,
+        }
+
+        # 输入录制（F9 开始 / 结束，见 src/game/replay.py）
+        self.recorder = None
+        self.recordings_dir = os.path.join(project_root, 'recordings')
 
         # 初始刷新
         self.refresh_view()
 
     def on_key_pressed(self, key_code):
         """处理按键按下事件"""
+        if key_code == Qt.Key.Key_F9:
+            self.toggle_recording()
+            return
         if self.model.is_game_over:
             return
 
         self.pressed_keys.add(key_code)
         if not self.move_timer.isActive():
-            self.process_movement()  # 立即处理一次移动
-            # 防止第一帧 dt 过大导致跃迁
+            # 按下即走一步保证响应，之后交给定时器；累加器清零防止第一帧补算过多
             self.last_update_time = time.perf_counter()
+            self.timestep.reset()
+            self.simulate_step()
+            if self.model.is_game_over:
+                return
+            self.refresh_view()
             self.move_timer.start()
 
     def on_key_released(self, key_code):
@@ -76,197 +104,99 @@ class GameController(QObject):
         if not self.pressed_keys:
             self.move_timer.stop()
 
+    def _inputs(self):
+        """把当前按键转换为引擎的输入位掩码"""
+        inputs = 0
+        if Qt.Key.Key_W in self.pressed_keys: inputs |= game_engine.UP
+        if Qt.Key.Key_S in self.pressed_keys: inputs |= game_engine.DOWN
+        if Qt.Key.Key_A in self.pressed_keys: inputs |= game_engine.LEFT
+        if Qt.Key.Key_D in self.pressed_keys: inputs |= game_engine.RIGHT
+        return inputs
+
     def process_movement(self):
-        """根据当前按下的键处理移动"""
+        """渲染帧：按真实经过的时间补算若干个固定模拟步，再按插值位置刷新画面
+
+        每个模拟步移动 move_speed 格（小于一格），卡顿时多补算几步而不是放大步长，
+        因此不会穿过薄墙；补算步数有上限，极端卡顿时丢弃多余时间。
+        """
         if self.model.is_game_over:
             self.move_timer.stop()
             return
-        # 记录移动前状态
-        prev_x, prev_y = self.model.player_x, self.model.player_y
-        prev_msg = self.model.message
-        # 计算与上帧的真实时间差，确保低帧率下移速不变
         now = time.perf_counter()
         dt = now - self.last_update_time
         self.last_update_time = now
-        baseline = max(self.move_timer.interval() / 1000.0, 1e-3)
-        scale = dt / baseline
-        # 防止极端卡顿导致穿墙，限制单帧最大放大倍数
-        if scale > 2.0:
-            scale = 2.0
-        
-        # 1. 计算合力方向
-        dx, dy = 0.0, 0.0
-        if Qt.Key.Key_W in self.pressed_keys: dy -= 1
-        if Qt.Key.Key_S in self.pressed_keys: dy += 1
-        if Qt.Key.Key_A in self.pressed_keys: dx -= 1
-        if Qt.Key.Key_D in self.pressed_keys: dx += 1
-
-        # 归一化 (防止斜走加速)
-        if dx != 0 or dy != 0:
-            length = math.sqrt(dx**2 + dy**2)
-            dx /= length
-            dy /= length
-
-        # 应用速度（按时间步长缩放，保持每秒速度稳定）
-        step_x = dx * self.model.move_speed * scale
-        step_y = dy * self.model.move_speed * scale
-
-        # 2. 分轴移动 (实现贴墙滑行)
-        # 尝试 X 轴移动
-        if step_x != 0:
-            if self.try_move(self.model.player_x + step_x, self.model.player_y):
-                self.model.player_x += step_x
-        
-        # 尝试 Y 轴移动
-        if step_y != 0:
-            if self.try_move(self.model.player_x, self.model.player_y + step_y):
-                self.model.player_y += step_y
-
-        # 如果本帧中消息被改为非“移动提示”，记录为最新的重要信息时间
-        if self.model.message != prev_msg and self.model.message != "栈，移动！":
-            self.last_important_msg_time = now
-
-        # 若本帧确实产生位移，且没有更高优先级事件覆盖消息，且重要信息已显示≥1秒，则显示“栈，移动！”
-        if (
-            (self.model.player_x != prev_x or self.model.player_y != prev_y)
-            and self.model.message == prev_msg
-            and (now - self.last_important_msg_time) >= 1.0
-        ):
-            self.model.message = "栈，移动！"
-
-        # 记录当前消息供跨帧检测
-        self.last_seen_message = self.model.message
-
-        # 3. 播放脚步
-        if (step_x != 0 or step_y != 0) and not self.step_sound.isPlaying():
-            self.step_sound.play()
 
-        self.refresh_view()
-
-    def try_move(self, new_x, new_y):
-        """
-        尝试移动到新位置。
-        返回 True 表示允许移动（可能是空地，也可能是踩到了道具）。
-        返回 False 表示被阻挡（撞墙，或撞到没钥匙的门）。
-        副作用：如果碰到了道具/怪物，会直接触发交互逻辑。
-        """
-        # 1. 获取玩家在新位置的碰撞箱覆盖的所有格子
-        overlapped_tiles = self.get_overlapped_tiles(new_x, new_y)
-        
-        can_move = True
-        
-        for tx, ty in overlapped_tiles:
-            # 越界检查
-            if not (0 <= tx < self.model.grid_width and 0 <= ty < self.model.grid_height):
-                return False # 撞世界边界
-            
-            val = self.model.grid[ty][tx]
-            
-            # === 🧱 阻挡判定 (墙/门/虚空) ===
-            if val == 1 or val == -1: # 墙或虚空
-                return False # 只要角碰到墙，就不能动
-            
-            if val == 8: # 门
-                # 特殊逻辑：如果是门，检查是否有钥匙
-                top_item = self._get_stack_top()
-                if top_item == 5: # 有钥匙
-                    self.model.message = "门打开了！"
-                    self.model.backpack.pop()
-                    self.model.grid[ty][tx] = 0 # 门变成了空地
-                    self.pop_sound.play()
-                    # 检查是否通关
-                    if not self.model.next_level():
-                        self.model.message = "恭喜通关！"
-                    return False 
-                else:
-                    self.model.message = "门锁着，需要钥匙！"
-                    self.error_sound.play()
-                    return False # 撞门
-
-            # === 🎒 交互判定 (道具/怪物/火) ===
-            # 这些东西也是“允许移动”的，但会触发副作用
-            if val in [3, 4, 5, 6, 7]:
-                self.handle_interaction(tx, ty, val)
-                
-        return True
-    
-    def handle_interaction(self, tx, ty, val):
-        """处理与物体的交互 (拾取/战斗)"""
-        top_item = self._get_stack_top()
-        
-        # 道具 (3水, 4剑, 5匙)
-        if val in [3, 4, 5]:
-            item_names = {3:"水", 4:"剑", 5:"钥匙"}
-            try:
-                self.model.backpack.push(val)
-                self.model.message = f"获得 {item_names[val]}"
-                self.model.grid[ty][tx] = 0 # 物品消失
-                self.push_sound.play()
-            except StructureFullError:
-                self.model.message = "背包满了！"
-                self.error_sound.play()
-        
-        # 怪物 (7)
-        elif val == 7:
-            if top_item == 4: # 剑
-                self.model.message = "击杀怪物！"
-                self.model.backpack.pop() # 消耗剑
-                self.model.grid[ty][tx] = 0 # 怪物消失
-                self.pop_sound.play()
-            else:
-                self.trigger_death("你被怪物吃掉了！")
-        
-        # 火焰 (6)
-        elif val == 6:
-            if top_item == 3: # 水
-                self.model.message = "熄灭火焰！"
-                self.model.backpack.pop()
-                self.model.grid[ty][tx] = 0
-                self.pop_sound.play()
-            else:
-                self.trigger_death("你被烧死了！")
+        steps = self.timestep.advance(dt)
+        for _ in range(steps):
+            self.simulate_step()
+            if self.model.is_game_over:
+                return  # trigger_death 已刷新画面
+
+        current = (self.model.player_x, self.model.player_y)
+        self.refresh_view(player_pos=interpolate(self.prev_pos, current, self.timestep.alpha()))
+
+        self.sim_rate.tick(now, steps)
+        if self.render_rate.tick(now):
+            logger.debug("模拟 %.1f 步/秒，渲染 %.1f 帧/秒（丢弃 %.3f 秒）",
+                         self.sim_rate.rate, self.render_rate.rate, self.timestep.dropped)
+
+    def simulate_step(self):
+        """让引擎推进一个固定步长，并把事件转换为音效与界面反馈"""
+        level_index = self.model.current_level_index
+        self.prev_pos = (self.model.player_x, self.model.player_y)
+        inputs = self._inputs()
+        if self.recorder is not None:
+            self.recorder.record(inputs)
+        for event in self.engine.step(inputs):
+            sound = self.event_sounds.get(event.kind)
+            if sound is not None:
+                sound.play()
+            elif event.kind == game_engine.STEPPED:
+                if not self.step_sound.isPlaying():
+                    self.step_sound.play()
+            elif event.kind == game_engine.DIED:
+                self.trigger_death(event.value)
+        # 换关后不在两关之间插值
+        if self.model.current_level_index != level_index:
+            self.prev_pos = (self.model.player_x, self.model.player_y)
 
-    def _get_stack_top(self):
-        """安全获取栈顶元素，如果栈为空则返回 None"""
-        try:
-            return self.model.backpack.peek()
-        except StructureEmptyError:
-            return None
-
-    def get_overlapped_tiles(self, px, py):
-        """根据玩家坐标和大小，计算出接触到的所有网格坐标"""
-        size = self.model.player_size
-        # 玩家中心在 px, py。我们需要计算左上角和右下角
-        # 假设 px, py 是格子的逻辑坐标 (比如 1.5, 2.5 是格子中心)
-        # 这里为了简单，假设 px, py 就是玩家的【中心点坐标】
-        
-        # 碰撞箱边界
-        left = px + (1 - size) / 2
-        right = left + size
-        top = py + (1 - size) / 2
-        bottom = top + size
-        
-        # 涉及到的网格索引范围
-        min_x, max_x = int(left), int(right) # right如果是 1.9，int是1。如果是2.01，int是2
-        min_y, max_y = int(top), int(bottom)
-        
-        tiles = []
-        for y in range(min_y, max_y + 1):
-            for x in range(min_x, max_x + 1):
-                tiles.append((x, y))
-        return tiles
-
-        
     def reset_game(self):
         """复活：重置当前关卡"""
-        self.model.reset_current_level()
+        if self.recorder is not None:
+            self.recorder.record_reset()
+        self.engine.reset()
         # 隐藏复活覆盖层
         self.view.hide_game_over()
         self.refresh_view()
 
+    def toggle_recording(self):
+        """开始录制（从本关开头重新开始），或结束录制并保存录像"""
+        if self.recorder is None:
+            self.engine.reset()
+            self.view.hide_game_over()
+            self.recorder = InputRecorder(self.engine)
+            self.model.message = "开始录制（F9 结束）"
+        else:
+            recording = self.recorder.finish()
+            self.recorder = None
+            path = os.path.join(self.recordings_dir, time.strftime('%Y%m%d-%H%M%S') + '.dsr')
+            try:
+                os.makedirs(self.recordings_dir, exist_ok=True)
+                save_recording(recording, path)
+                self.model.message = f"录像已保存：{os.path.basename(path)}"
+            except OSError:
+                self.model.message = "录像保存失败！"
+        self.refresh_view()
+
+    def shutdown(self):
+        """停止移动循环与后台预加载线程（退出或关闭窗口时调用）"""
+        self.move_timer.stop()
+        self.model.shutdown()
+
     def quit_game(self):
         """退出游戏"""
         import sys
+        self.shutdown()
         sys.exit(0)
 
     def trigger_death(self,death_message):
@@ -277,12 +207,16 @@ class GameController(QObject):
          # 显示复活覆盖层
         self.view.show_game_over()
 
-    def refresh_view(self):
-        """把 Model 的数据解包，喂给 View"""
+    def refresh_view(self, player_pos=None):
+        """把 Model 的数据解包，喂给 View；player_pos 为插值后的绘制位置，默认取模型位置"""
+        if player_pos is None:
+            player_pos = (self.model.player_x, self.model.player_y)
+            self.prev_pos = player_pos
         self.view.render(
             grid=self.model.grid,
-            player_pos=(self.model.player_x, self.model.player_y),
-            msg=self.model.message
+            player_pos=player_pos,
+            msg=self.model.message,
+            dirty_tiles=self.model.take_dirty_tiles()
         )
         #刷新背包
         backpack_items = self.model.backpack.get_items()
@@ -0,0 +1,233 @@
+"""栈国杀的无界面模拟核心：状态 + step(输入) -> 事件
+
+不依赖 Qt：碰撞、道具 / 怪物 / 门的规则都在这里，音效与界面由 GameController
+根据返回的事件处理。时间按固定步长推进（模拟时间），同样的输入序列总得到同样的结果。
+"""
+import math
+from typing import List, NamedTuple, Optional
+from src.game.game_model import GameModel, BLOCKED
+from src.game.game_loop import SIM_STEP
+from src.model.exceptions import StructureFullError, StructureEmptyError
+
+# 输入：方向键位掩码
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+
+# 事件类型
+STEPPED = "stepped"                    # 本步尝试了移动（脚步声）
+PICKED_UP = "picked_up"                # 拾取道具，value 为道具
+BACKPACK_FULL = "backpack_full"        # 背包满，无法拾取
+DOOR_OPENED = "door_opened"            # 用钥匙开门
+DOOR_LOCKED = "door_locked"            # 没有钥匙，撞门
+MONSTER_KILLED = "monster_killed"      # 用剑击杀怪物
+FIRE_EXTINGUISHED = "fire_extinguished"  # 用水灭火
+DIED = "died"                          # 玩家死亡，value 为死因
+LEVEL_CHANGED = "level_changed"        # 进入下一关，value 为关卡下标
+GAME_COMPLETED = "game_completed"      # 通过所有关卡
+
+MOVE_MESSAGE = "栈，移动！"
+ITEM_NAMES = {3: "水", 4: "剑", 5: "钥匙"}
+
+class GameEvent(NamedTuple):
+    """一次模拟步中发生的事件"""
+    kind: str
+    x: int = -1
+    y: int = -1
+    value: object = None
+
+class GameEngine:
+    """包装 GameModel 的模拟引擎，每次 step 推进一个固定步长"""
+    def __init__(self, model: Optional[GameModel] = None, step: float = SIM_STEP):
+        self.model = model if model is not None else GameModel()
+        self.step_seconds = step
+        self.steps = 0  # 已推进的步数（用整数计时，回放时结果逐位一致）
+        # 重要信息保护：记录最近一次“非移动提示”出现时的步数
+        self.last_important_msg_step = 0
+        self._events: List[GameEvent] = []
+
+    @property
+    def time(self) -> float:
+        """模拟时间（秒）"""
+        return self.steps * self.step_seconds
+
+    def _emit(self, kind, x=-1, y=-1, value=None):
+        self._events.append(GameEvent(kind, x, y, value))
+
+    @staticmethod
+    def direction(inputs: int):
+        """输入位掩码对应的合力方向（已归一化，防止斜走加速）"""
+        dx = (1 if inputs & RIGHT else 0) - (1 if inputs & LEFT else 0)
+        dy = (1 if inputs & DOWN else 0) - (1 if inputs & UP else 0)
+        if dx and dy:
+            return dx / math.sqrt(2), dy / math.sqrt(2)
+        return float(dx), float(dy)
+
+    def step(self, inputs: int) -> List[GameEvent]:
+        """按输入推进一个固定步长，返回本步发生的事件"""
+        self._events = []
+        model = self.model
+        self.steps += 1
+        if model.is_game_over:
+            return self._events
+
+        # 记录移动前状态
+        prev_x, prev_y = model.player_x, model.player_y
+        prev_msg = model.message
+
+        dx, dy = self.direction(inputs)
+        step_x = dx * model.move_speed
+        step_y = dy * model.move_speed
+        if step_x != 0 or step_y != 0:
+            self._emit(STEPPED)
+
+        # 分轴移动 (实现贴墙滑行)
+        if step_x != 0:
+            if self.try_move(model.player_x + step_x, model.player_y):
+                model.player_x += step_x
+        if step_y != 0:
+            if self.try_move(model.player_x, model.player_y + step_y):
+                model.player_y += step_y
+
+        # 如果本步中消息被改为非“移动提示”，记录为最新的重要信息时间
+        if model.message != prev_msg and model.message != MOVE_MESSAGE:
+            self.last_important_msg_step = self.steps
+
+        # 若本步确实产生位移，且没有更高优先级事件覆盖消息，且重要信息已显示≥1秒，则显示“栈，移动！”
+        if (
+            (model.player_x != prev_x or model.player_y != prev_y)
+            and model.message == prev_msg
+            and (self.steps - self.last_important_msg_step) * self.step_seconds >= 1.0
+        ):
+            model.message = MOVE_MESSAGE
+        return self._events
+
+    def run(self, inputs: int, steps: int) -> List[GameEvent]:
+        """以同一输入连续推进 steps 步，返回全部事件（死亡后提前结束）"""
+        events = []
+        for _ in range(steps):
+            events.extend(self.step(inputs))
+            if self.model.is_game_over:
+                break
+        return events
+
+    def try_move(self, new_x, new_y):
+        """
+        尝试移动到新位置。
+        返回 True 表示允许移动（可能是空地，也可能是踩到了道具）。
+        返回 False 表示被阻挡（撞墙，或撞到没钥匙的门）。
+        副作用：如果碰到了道具/怪物，会直接触发交互逻辑。
+        """
+        model = self.model
+        # 0. 快速路径：先查属性掩码，空地直接放行、纯阻挡直接拒绝（无副作用，不分配对象）
+        flags = model.collision_flags(new_x, new_y)
+        if flags == 0:
+            return True
+        if flags == BLOCKED:
+            return False
+
+        # 1. 涉及门、交互物或越界时，按原顺序逐格处理
+        for tx, ty in self.get_overlapped_tiles(new_x, new_y):
+            # 越界检查
+            if not (0 <= tx < model.grid_width and 0 <= ty < model.grid_height):
+                return False # 撞世界边界
+
+            val = int(model.grid[ty][tx])
+
+            # === 🧱 阻挡判定 (墙/门/虚空) ===
+            if val == 1 or val == -1: # 墙或虚空
+                return False # 只要角碰到墙，就不能动
+
+            if val == 8: # 门
+                # 特殊逻辑：如果是门，检查是否有钥匙
+                if self._get_stack_top() == 5: # 有钥匙
+                    model.message = "门打开了！"
+                    model.backpack.pop()
+                    model.set_tile(tx, ty, 0) # 门变成了空地
+                    self._emit(DOOR_OPENED, tx, ty)
+                    # 检查是否通关
+                    if model.next_level():
+                        self._emit(LEVEL_CHANGED, value=model.current_level_index)
+                    else:
+                        model.message = "恭喜通关！"
+                        self._emit(GAME_COMPLETED)
+                    return False
+                model.message = "门锁着，需要钥匙！"
+                self._emit(DOOR_LOCKED, tx, ty)
+                return False # 撞门
+
+            # === 🎒 交互判定 (道具/怪物/火) ===
+            # 这些东西也是“允许移动”的，但会触发副作用
+            if 3 <= val <= 7:
+                self.handle_interaction(tx, ty, val)
+
+        return True
+
+    def handle_interaction(self, tx, ty, val):
+        """处理与物体的交互 (拾取/战斗)"""
+        model = self.model
+        top_item = self._get_stack_top()
+
+        # 道具 (3水, 4剑, 5匙)
+        if val in ITEM_NAMES:
+            try:
+                model.backpack.push(val)
+                model.message = f"获得 {ITEM_NAMES[val]}"
+                model.set_tile(tx, ty, 0) # 物品消失
+                self._emit(PICKED_UP, tx, ty, val)
+            except StructureFullError:
+                model.message = "背包满了！"
+                self._emit(BACKPACK_FULL, tx, ty, val)
+
+        # 怪物 (7)
+        elif val == 7:
+            if top_item == 4: # 剑
+                model.message = "击杀怪物！"
+                model.backpack.pop() # 消耗剑
+                model.set_tile(tx, ty, 0) # 怪物消失
+                self._emit(MONSTER_KILLED, tx, ty)
+            else:
+                self.kill("你被怪物吃掉了！")
+
+        # 火焰 (6)
+        elif val == 6:
+            if top_item == 3: # 水
+                model.message = "熄灭火焰！"
+                model.backpack.pop()
+                model.set_tile(tx, ty, 0)
+                self._emit(FIRE_EXTINGUISHED, tx, ty)
+            else:
+                self.kill("你被烧死了！")
+
+    def kill(self, death_message):
+        """玩家死亡"""
+        self.model.is_game_over = True
+        self.model.message = death_message
+        self._emit(DIED, value=death_message)
+
+    def reset(self):
+        """复活：重置当前关卡"""
+        self.model.reset_current_level()
+        self.last_important_msg_step = self.steps
+
+    def _get_stack_top(self):
+        """安全获取栈顶元素，如果栈为空则返回 None"""
+        try:
+            return self.model.backpack.peek()
+        except StructureEmptyError:
+            return None
+
+    def get_overlapped_tiles(self, px, py):
+        """根据玩家坐标和大小，计算出接触到的所有网格坐标（px, py 为玩家中心点坐标）"""
+        size = self.model.player_size
+        # 碰撞箱边界
+        left = px + (1 - size) / 2
+        right = left + size
+        top = py + (1 - size) / 2
+        bottom = top + size
+
+        # 涉及到的网格索引范围
+        min_x, max_x = int(left), int(right) # right如果是 1.9，int是1。如果是2.01，int是2
+        min_y, max_y = int(top), int(bottom)
+        return [(x, y) for y in range(min_y, max_y + 1) for x in range(min_x, max_x + 1)]
@@ -0,0 +1,59 @@
+from typing import Optional, Tuple
+
+SIM_STEP = 0.016        # 固定模拟步长（秒），与原先 16ms 一帧、每帧 move_speed 格的手感一致
+MAX_STEPS_PER_FRAME = 8  # 单帧最多补算的步数，超出部分丢弃，避免卡顿后越算越慢
+
+class FixedTimestep:
+    """固定步长累加器（不依赖 Qt）
+
+    每帧把真实经过的时间累加进来，按固定步长取出若干个模拟步；
+    剩余不足一步的时间用作渲染插值系数 alpha。
+    """
+    def __init__(self, step: float = SIM_STEP, max_steps: int = MAX_STEPS_PER_FRAME):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0  # 因超出 max_steps 而丢弃的累计时间（秒）
+
+    def reset(self) -> None:
+        self.accumulator = 0.0
+
+    def advance(self, dt: float) -> int:
+        """累加 dt 秒，返回本帧需要执行的模拟步数"""
+        self.accumulator += max(0.0, dt)
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            self.dropped += (steps - self.max_steps) * self.step
+            self.accumulator -= (steps - self.max_steps) * self.step
+            steps = self.max_steps
+        self.accumulator -= steps * self.step
+        return steps
+
+    def alpha(self) -> float:
+        """上一步与当前步之间的插值系数 0->1"""
+        return min(1.0, self.accumulator / self.step)
+
+def interpolate(prev: Tuple[float, float], current: Tuple[float, float], alpha: float) -> Tuple[float, float]:
+    return (prev[0] + (current[0] - prev[0]) * alpha,
+            prev[1] + (current[1] - prev[1]) * alpha)
+
+class RateCounter:
+    """统计每秒次数（模拟步数 / 渲染帧数），每满一个窗口给出一次读数"""
+    def __init__(self, window: float = 1.0):
+        self.window = window
+        self.count = 0
+        self.rate = 0.0
+        self._start: Optional[float] = None
+
+    def tick(self, now: float, count: int = 1) -> bool:
+        """记录 count 次，窗口结束时更新 rate 并返回 True"""
+        if self._start is None:
+            self._start = now
+        self.count += count
+        elapsed = now - self._start
+        if elapsed < self.window:
+            return False
+        self.rate = self.count / elapsed
+        self.count = 0
+        self._start = now
+        return True
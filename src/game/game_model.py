@@ -1,10 +1,23 @@
 from src.model.stack import Stack
 import os
+from concurrent.futures import ThreadPoolExecutor
 from src.model.exceptions import MapLoadError,InventoryFullError
 from src.utils import get_base_path
+from src.game.grid import LIST, grid_from_cells, grid_flags
+from src.game.level_format import load_level_file
+
+# 格子属性位（碰撞掩码）
+BLOCKED = 1        # 墙、虚空：不可进入
+DOOR = 2           # 门：需要钥匙
+INTERACTIVE = 4    # 道具/怪物/火：可进入但会触发交互
+OUT_OF_BOUNDS = 8  # 碰撞箱越出地图
+
+# 格子数值 -> 属性位，按 值 + 1 下标查表（-1 为虚空）
+TILE_FLAGS = bytes([BLOCKED, 0, BLOCKED, 0, INTERACTIVE, INTERACTIVE, INTERACTIVE,
+                    INTERACTIVE, INTERACTIVE, DOOR])
 
 class GameModel:
-    def __init__(self):
+    def __init__(self, grid_backend=LIST, preload=True):
         #定位资源路径
         project_root = get_base_path()
         self.resources_path = os.path.join(project_root, 'resources')
@@ -20,6 +33,13 @@ class GameModel:
 
         ]
         self.current_level_index = 0
+        self._level_cache = {}  # 地图文件路径 -> 解析后的 Level
+        self._level = None      # 当前关卡的原始快照（只读）
+        self._modified_tiles = set()  # 加载后被修改过的格子，重置时据此还原
+        # 后台预加载：玩当前关时在工作线程里解析下一关，开门时直接交接
+        self.preload_enabled = preload
+        self._preload_executor = None
+        self._preloads = {}  # 地图文件路径 -> Future[Level]
         # 玩家背包 
         self.backpack = Stack(capacity=3)
         # 游戏消息 (用于显示在界面上)
@@ -31,10 +51,16 @@ class GameModel:
         self.player_start_y = 0.0
         self.move_speed=0.1  # 每次刷新移动的格子数
         self.player_size=0.6  # 玩家碰撞箱大小（格子数）
-        # 地图定义
+        # 地图定义（grid_backend 见 src/game/grid.py，大地图可用 "compact" 节省内存）
+        self.grid_backend = grid_backend
         self.grid_width = 0
         self.grid_height = 0
         self.grid = []
+        # 与 grid 对应的扁平属性掩码，下标为 y * grid_width + x
+        self.tile_flags = bytearray()
+        # 脏格子：上次渲染后被修改过的坐标 (x, y)；加载关卡后需整图刷新
+        self.dirty_tiles = set()
+        self._needs_full_redraw = True
         
         self.load_level(self.current_level_index)
 
@@ -43,68 +69,43 @@ class GameModel:
 
       
     def load_level(self, level_index):
-        """从文件加载关卡"""
+        """从文件加载关卡，成功返回 True；已无更多关卡或地图文件缺失时返回 False"""
         self.is_game_over = False
+        self._level = None
         if level_index >= len(self.level_files):
             self.message = " 恭喜！你已通过所有关卡！"
-            return MapLoadError 
+            return False
 
         file_name = self.level_files[level_index]
         full_path = os.path.join(self.maps_path,file_name)
 
         if not os.path.exists(full_path):
             print(f"Error: Map file not found: {full_path}")
-            return MapLoadError
+            return False
         
-        # 符号 -> 数字 ID 映射表
-        # 0=空地, 1=墙, 2=玩家
-        # 3=水, 4=剑, 5=钥匙 (道具-入栈)
-        # 6=火, 7=怪, 8=门 (障碍-需出栈)
-        char_map = {
-            '#': 1, '.': 0, 'P': 0, # P也是空地，但记录坐标
-            'K': 5, 'D': 8,'M': 7, 'F': 6,
-            'S': 4, 'W': 3,' ': -1
-        }
-
-        new_grid = []
-        player_found = False  # 标记是否在文件中找到玩家位置
-        
-        # 读取文件
-        with open(full_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-            # 1. 预处理：去掉换行符
-            lines = [line.rstrip('\n') for line in lines]
-            
-            # 2. 找最大宽度 (为了把矩阵补齐)
-            max_width = 0
-            if lines:
-                max_width = max(len(line) for line in lines)
-            
-            # 3. 解析每一行
-            for y, line in enumerate(lines):
-                row_data = []
-                
-                # 4. 自动补全：如果这就行短，后面补空格
-                padded_line = line.ljust(max_width, ' ')
-                
-                for x, char in enumerate(padded_line):
-                    if char == 'P':
-                        self.player_x = float(x)
-                        self.player_y = float(y)
-                        self.player_start_x = float(x)  # 记录初始位置
-                        self.player_start_y = float(y)
-                        player_found = True
-                        val = 0
-                    else:
-                        # 如果遇到未知的字符，默认当做虚空(-1)
-                        val = char_map.get(char, -1) 
-                    row_data.append(val)
-                new_grid.append(row_data)
-
-        self.grid = new_grid
+        # 预加载的关卡已在工作线程中构造好网格与属性掩码
+        level, grid, flags = self._take_level(full_path)
+        player_found = level.player_start is not None  # 标记是否在文件中找到玩家位置
+        if player_found:
+            x, y = level.player_start
+            self.player_x = float(x)
+            self.player_y = float(y)
+            self.player_start_x = float(x)  # 记录初始位置
+            self.player_start_y = float(y)
+
+        if grid is None:
+            grid = grid_from_cells(level.cells, level.width, level.height, self.grid_backend)
+        self.grid = grid
         self.grid_height = len(self.grid)
         self.grid_width = len(self.grid[0]) if self.grid_height > 0 else 0
+        if flags is not None:
+            self.tile_flags = flags
+        else:
+            self._rebuild_tile_flags()
+        self.dirty_tiles.clear()
+        self._needs_full_redraw = True
+        self._level = level
+        self._modified_tiles = set()
         
         # 如果文件中没有找到玩家位置标记，使用记录的初始位置或默认位置
         if not player_found:
@@ -114,10 +115,96 @@ class GameModel:
         # 每次进新关卡，背包清空
         self.backpack.clear()
         self.message = f"第 {level_index + 1} 关：开始冒险！"
+        self._schedule_preload(level_index + 1)
         return True
+
+    def _take_level(self, full_path):
+        """取得关卡，返回 (Level, 网格或 None, 属性掩码或 None)
+
+        先取后台预加载的结果（连同已构造好的网格），再查解析缓存，最后才同步解析。
+        """
+        future = self._preloads.pop(full_path, None)
+        if future is not None:
+            try:
+                level, grid, flags = future.result()  # 尚未完成时只等待剩余部分
+                # 只在主线程写入缓存，交接是原子的
+                self._level_cache[full_path] = level
+                return level, grid, flags
+            except (OSError, ValueError):
+                pass  # 预加载失败：下面同步重试以得到同样的报错行为
+        level = self._level_cache.get(full_path)
+        if level is None:
+            level = load_level_file(full_path)
+            self._level_cache[full_path] = level
+        return level, None, None
+
+    def _prepare_level(self, full_path):
+        """工作线程：解析关卡，并提前构造网格与属性掩码"""
+        level = load_level_file(full_path)
+        grid = grid_from_cells(level.cells, level.width, level.height, self.grid_backend)
+        return level, grid, grid_flags(grid, TILE_FLAGS)
+
+    def _schedule_preload(self, level_index):
+        """在工作线程中解析第 level_index 关"""
+        if not self.preload_enabled or level_index >= len(self.level_files):
+            return
+        full_path = os.path.join(self.maps_path, self.level_files[level_index])
+        if full_path in self._preloads or full_path in self._level_cache or not os.path.exists(full_path):
+            return  # 已在解析或已解析过
+        if self._preload_executor is None:
+            self._preload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-preload")
+        self._preloads[full_path] = self._preload_executor.submit(self._prepare_level, full_path)
+
+    def shutdown(self):
+        """停止后台预加载线程"""
+        if self._preload_executor is not None:
+            self._preload_executor.shutdown(wait=False, cancel_futures=True)
+            self._preload_executor = None
+        self._preloads.clear()
     
+    def _rebuild_tile_flags(self):
+        """根据 grid 整体重建属性掩码（仅在加载关卡时调用）"""
+        self.tile_flags = grid_flags(self.grid, TILE_FLAGS)
+
+    def set_tile(self, x, y, val):
+        """修改一个格子，并同步更新属性掩码"""
+        self.grid[y][x] = val
+        self.tile_flags[y * self.grid_width + x] = TILE_FLAGS[val + 1]
+        self.dirty_tiles.add((x, y))
+        self._modified_tiles.add((x, y))
+
+    def take_dirty_tiles(self):
+        """取出并清空脏格子集合；加载关卡后第一次调用返回 None，表示需要整图刷新"""
+        if self._needs_full_redraw:
+            self._needs_full_redraw = False
+            self.dirty_tiles.clear()
+            return None
+        dirty = self.dirty_tiles
+        if dirty:
+            self.dirty_tiles = set()
+        return dirty
+
+    def collision_flags(self, px, py):
+        """返回玩家位于 (px, py) 时碰撞箱覆盖的所有格子属性位的并集
+
+        只做几次数组查表，不分配任何对象；越界时返回 OUT_OF_BOUNDS。
+        玩家碰撞箱小于一个格子，最多覆盖 2x2 个格子。
+        """
+        size = self.player_size
+        left = px + (1 - size) / 2
+        top = py + (1 - size) / 2
+        min_x, max_x = int(left), int(left + size)
+        min_y, max_y = int(top), int(top + size)
+        width = self.grid_width
+        if min_x < 0 or min_y < 0 or max_x >= width or max_y >= self.grid_height:
+            return OUT_OF_BOUNDS
+        flags = self.tile_flags
+        row0 = min_y * width
+        row1 = max_y * width
+        return flags[row0 + min_x] | flags[row0 + max_x] | flags[row1 + min_x] | flags[row1 + max_x]
+
     def next_level(self):
-        """切换到下一关的接口"""
+        """切换到下一关的接口，返回 False 表示已通过所有关卡"""
         self.current_level_index += 1
         return self.load_level(self.current_level_index)
 
@@ -127,6 +214,20 @@ class GameModel:
         self.player_y += dy
 
     def reset_current_level(self):
-        """重新加载当前关卡（用于死亡重置）"""
+        """重置当前关卡（用于死亡重置）
+
+        不重新加载：只把加载后改动过的格子按原始快照还原，并标记为脏格子，
+        耗时只与改动数量有关，与地图大小无关。
+        """
         self.backpack.clear() # 死后背包清空
-        self.load_level(self.current_level_index)
\ No newline at end of file
+        if self._level is None or self.current_level_index >= len(self.level_files):
+            self.load_level(self.current_level_index)
+            return
+        modified, self._modified_tiles = self._modified_tiles, set()
+        for x, y in modified:
+            self.set_tile(x, y, self._level.cell(x, y))
+        self._modified_tiles.clear()
+        self.player_x = self.player_start_x
+        self.player_y = self.player_start_y
+        self.is_game_over = False
+        self.message = f"第 {self.current_level_index + 1} 关：开始冒险！"
\ No newline at end of file
@@ -1,7 +1,23 @@
+import math
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QGraphicsView, QGraphicsScene, QGraphicsRectItem, 
                              QLabel,QGraphicsTextItem, QPushButton, QHBoxLayout,QFrame)
-from PyQt6.QtCore import Qt, pyqtSignal, QRectF, QSize
+from PyQt6.QtCore import Qt, pyqtSignal, QRectF, QSize, QEvent
 from PyQt6.QtGui import QBrush, QColor, QKeyEvent, QFont, QPen
+from src.game.grid import copy_grid, changed_rows
+from src.game.tile_renderer import TileAtlas, TileChunkItem
+
+CHUNK_SIZE = 32  # 场景按 32x32 格分块生成
+MATERIALIZE_MARGIN = 1  # 视口外额外生成的区块圈数
+RELEASE_MARGIN = 2      # 超出视口这么多圈才回收（留出余量防止来回抖动）
+
+def chunk_span(lo, hi, span):
+    """场景坐标区间 [lo, hi) 覆盖的区块下标 (first, last)，两端都包含"""
+    first = int(lo // span)
+    return first, max(first, math.ceil(hi / span) - 1)
+
+def chunk_window(first, last, count, margin=MATERIALIZE_MARGIN):
+    """[first, last] 外扩 margin 圈并截到 [0, count) 内的区块下标范围"""
+    return range(max(0, first - margin), min(count, last + margin + 1))
 
 class GameView(QWidget):
     # 定义信号
@@ -43,8 +59,20 @@ class GameView(QWidget):
         }
         self.font = QFont("SimHei", int(self.cell_size * 0.6))
         self.font.setBold(True)
-        self.tile_items = []   # 2D: QGraphicsTextItem or None
-        self.tile_values = []  # 2D: int
+        # 格子字形预渲染为图集，每个区块只用一个图元贴图绘制
+        self.atlas = TileAtlas(self.skin_map, self.font, self.cell_size, self.devicePixelRatioF())
+        self.use_tile_atlas = True  # False 时退回每格一个 QGraphicsTextItem
+        self._screen_signal_connected = False  # 窗口换屏信号只连接一次
+        self.tile_values = []  # 2D: int（上次渲染时网格的副本，与模型网格同一后端）
+        # 分块场景：(cx, cy) -> TileChunkItem（或文字模式下的 {(x, y): QGraphicsTextItem}），
+        # 只有已生成的区块在字典中
+        self.chunks = {}
+        self.lazy_chunks = True        # 大地图时只生成视口附近的区块
+        self._item_pool = []           # 移出场景、待复用的文字图元
+        self._chunk_pool = []          # 移出场景、待复用的区块图元
+        self._chunk_range = None       # 上次生成的区块范围
+        self.grid_rows = 0
+        self.grid_cols = 0
         self.player_item = None
         self.map_pixel_width = 0
         self.map_pixel_height = 0
@@ -157,55 +185,33 @@ class GameView(QWidget):
 
             
     def _build_scene(self, grid):
-        # 首次或关卡变化时重建静态图层
+        # 首次或关卡尺寸变化时重建静态图层
         self.scene.clear()
-        # 清空引用
+        # 清空引用（scene.clear() 已删除场景中的所有图元）
         self.player_item = None
-        self.tile_items = []
-        self.tile_values = []
+        self.chunks = {}
+        self._chunk_range = None
 
         # 背景
         self.scene.setBackgroundBrush(QBrush(QColor("#202020")))
 
         rows = len(grid)
         cols = len(grid[0]) if rows > 0 else 0
-
-        for y in range(rows):
-            row_items = []
-            row_vals = []
-            for x in range(cols):
-                val = grid[y][x]
-                row_vals.append(val)
-                if val == -1:
-                    row_items.append(None)
-                    continue
-                if val in self.skin_map:
-                    char, color_code = self.skin_map[val]
-                    item = QGraphicsTextItem(char)
-                    item.setFont(self.font)
-                    item.setDefaultTextColor(QColor(color_code))
-                    self.scene.addItem(item)
-                    rect = item.boundingRect()
-                    center_x = (x * self.cell_size) + (self.cell_size - rect.width()) / 2
-                    center_y = (y * self.cell_size) + (self.cell_size - rect.height()) / 2
-                    item.setPos(center_x, center_y)
-                    row_items.append(item)
-                else:
-                    row_items.append(None)
-            self.tile_items.append(row_items)
-            self.tile_values.append(row_vals)
+        self.grid_rows, self.grid_cols = rows, cols
+        self.tile_values = copy_grid(grid)
 
         # 场景边界与尺寸缓存
         self.map_pixel_width = cols * self.cell_size
         self.map_pixel_height = rows * self.cell_size
         self.scene.setSceneRect(0, 0, self.map_pixel_width, self.map_pixel_height)
 
-        # 玩家图元
+        # 玩家图元（置于地图图元之上）
         if self.player_item is None:
             char, color_code = self.skin_map[2]
             self.player_item = QGraphicsTextItem(char)
             self.player_item.setFont(self.font)
             self.player_item.setDefaultTextColor(QColor(color_code))
+            self.player_item.setZValue(1)
             self.scene.addItem(self.player_item)
 
         # 大图跟随判断
@@ -213,62 +219,124 @@ class GameView(QWidget):
         view_h = self.view.viewport().height()
         self.large_map = (self.map_pixel_width > view_w or self.map_pixel_height > view_h)
 
-    def render(self, grid, player_pos, msg):
-        """增量渲染：首帧/尺寸变更重建，其余仅更新变化格子与玩家位置"""
+        # 小地图一次生成全部区块；大地图在 render 中按视口生成
+        if not (self.large_map and self.lazy_chunks):
+            for cy in range(self._chunk_count(rows)):
+                for cx in range(self._chunk_count(cols)):
+                    self._materialize_chunk(cx, cy)
+
+    @staticmethod
+    def _chunk_count(tiles):
+        return (tiles + CHUNK_SIZE - 1) // CHUNK_SIZE
+
+    def _materialize_chunk(self, cx, cy):
+        """按 tile_values 生成一个区块的图元"""
+        if self.use_tile_atlas:
+            chunk = self._chunk_pool.pop() if self._chunk_pool else TileChunkItem(self.atlas, CHUNK_SIZE)
+            chunk.assign(cx, cy, self.tile_values, self.grid_rows, self.grid_cols)
+            self.scene.addItem(chunk)
+            self.chunks[(cx, cy)] = chunk
+            return
+        items = {}
+        x0, y0 = cx * CHUNK_SIZE, cy * CHUNK_SIZE
+        for y in range(y0, min(y0 + CHUNK_SIZE, self.grid_rows)):
+            row = self.tile_values[y]
+            for x in range(x0, min(x0 + CHUNK_SIZE, self.grid_cols)):
+                val = int(row[x])
+                if val in self.skin_map:  # 虚空 (-1) 与未定义符号不绘制
+                    items[(x, y)] = self._place_tile_item(x, y, val)
+        self.chunks[(cx, cy)] = items
+
+    def _release_chunk(self, key):
+        """把区块的图元移出场景，放入复用池"""
+        chunk = self.chunks.pop(key)
+        if isinstance(chunk, TileChunkItem):
+            self.scene.removeItem(chunk)
+            self._chunk_pool.append(chunk)
+            return
+        for item in chunk.values():
+            self.scene.removeItem(item)
+            self._item_pool.append(item)
+
+    def _place_tile_item(self, x, y, val):
+        """取一个文字图元（优先复用）放到 (x, y) 格子中央"""
+        char, color_code = self.skin_map[val]
+        if self._item_pool:
+            item = self._item_pool.pop()
+            item.setPlainText(char)
+        else:
+            item = QGraphicsTextItem(char)
+            item.setFont(self.font)
+        item.setDefaultTextColor(QColor(color_code))
+        self.scene.addItem(item)
+        rect = item.boundingRect()
+        center_x = (x * self.cell_size) + (self.cell_size - rect.width()) / 2
+        center_y = (y * self.cell_size) + (self.cell_size - rect.height()) / 2
+        item.setPos(center_x, center_y)
+        return item
+
+    def _update_visible_chunks(self):
+        """生成视口附近的区块，回收远离视口的区块"""
+        rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        span = self.cell_size * CHUNK_SIZE
+        first_cx, last_cx = chunk_span(rect.left(), rect.right(), span)
+        first_cy, last_cy = chunk_span(rect.top(), rect.bottom(), span)
+        self._sync_chunks(first_cx, last_cx, first_cy, last_cy)
+
+    def _sync_chunks(self, first_cx, last_cx, first_cy, last_cy):
+        """让已生成的区块覆盖可见区块范围（含两端）：外扩 MATERIALIZE_MARGIN 圈生成，
+        超出 RELEASE_MARGIN 圈回收"""
+        chunk_range = (first_cx, last_cx, first_cy, last_cy)
+        if chunk_range == self._chunk_range:
+            return
+        self._chunk_range = chunk_range
+
+        keep_x = range(first_cx - RELEASE_MARGIN, last_cx + RELEASE_MARGIN + 1)
+        keep_y = range(first_cy - RELEASE_MARGIN, last_cy + RELEASE_MARGIN + 1)
+        for key in list(self.chunks):
+            cx, cy = key
+            if cx not in keep_x or cy not in keep_y:
+                self._release_chunk(key)
+        for cy in chunk_window(first_cy, last_cy, self._chunk_count(self.grid_rows)):
+            for cx in chunk_window(first_cx, last_cx, self._chunk_count(self.grid_cols)):
+                if (cx, cy) not in self.chunks:
+                    self._materialize_chunk(cx, cy)
+
+    def render(self, grid, player_pos, msg, dirty_tiles=None):
+        """增量渲染：首帧/尺寸变更重建，其余仅更新变化格子与玩家位置
+
+        dirty_tiles 为模型记录的已修改坐标集合 {(x, y), ...}，此时只更新这些格子，
+        每帧开销与地图大小无关；为 None 时（如刚加载关卡）按行比较整张地图。
+        """
         # 首帧或尺寸变化时重建
         need_rebuild = False
         rows = len(grid)
         cols = len(grid[0]) if rows > 0 else 0
-        if not self.tile_items or len(self.tile_items) != rows or (rows > 0 and len(self.tile_items[0]) != cols):
+        if self.player_item is None or (rows, cols) != (self.grid_rows, self.grid_cols):
             need_rebuild = True
         if need_rebuild:
             self._build_scene(grid)
 
-        # 更新信息栏
-        self.info_label.setText(msg)
-        self.info_label.adjustSize()
+        # 更新信息栏（文字不变时跳过重新排版）
+        if msg != self.info_label.text():
+            self.info_label.setText(msg)
+            self.info_label.adjustSize()
         # 动态计算居中位置：(View总宽 - 文字标签宽) / 2
         center_x = (self.view.width() - self.info_label.width()) // 2
         self.info_label.move(center_x, 0) # y=0 紧贴顶部
         
-        # 增量更新改变的格子
-        for y in range(rows):
-            for x in range(cols):
-                val = grid[y][x]
-                
-                cur = self.tile_values[y][x]
-                if cur == val:
-                    continue
-                self.tile_values[y][x] = val
-                item = self.tile_items[y][x]
-
-                if val == -1:
-                    # 如果新位置是虚空，但旧位置有东西，必须把它删掉！
-                    if item is not None:
-                        self.scene.removeItem(item)
-                        self.tile_items[y][x] = None
-                    continue # 处理完虚空后，跳过后续逻辑
-                
-                if val in self.skin_map:
-                    char, color_code = self.skin_map[val]
-                    if item is None:
-                        item = QGraphicsTextItem(char)
-                        item.setFont(self.font)
-                        item.setDefaultTextColor(QColor(color_code))
-                        self.scene.addItem(item)
-                        rect = item.boundingRect()
-                        center_x = (x * self.cell_size) + (self.cell_size - rect.width()) / 2
-                        center_y = (y * self.cell_size) + (self.cell_size - rect.height()) / 2
-                        item.setPos(center_x, center_y)
-                        self.tile_items[y][x] = item
-                    else:
-                        item.setPlainText(char)
-                        item.setDefaultTextColor(QColor(color_code))
-                else:
-                    # 未定义的符号视为移除
-                    if item is not None:
-                        self.scene.removeItem(item)
-                        self.tile_items[y][x] = None
+        # 刚重建时场景已与网格一致，无需再比较
+        if not need_rebuild:
+            if dirty_tiles is not None:
+                # 只更新模型报告的脏格子
+                for x, y in dirty_tiles:
+                    self._update_tile(x, y, int(grid[y][x]))
+            else:
+                # 增量更新改变的格子：先整行比较找出变化的行，只逐格扫描这些行
+                for y in changed_rows(grid, self.tile_values):
+                    row = grid[y]
+                    for x in range(cols):
+                        self._update_tile(x, y, int(row[x]))
 
         # 玩家位置更新
         px, py = player_pos
@@ -278,9 +346,29 @@ class GameView(QWidget):
             (py * self.cell_size) + (self.cell_size - rect.height()) / 2
         )
 
-        # 大图跟随
+        # 大图跟随，并按新的视口生成/回收区块
         if self.large_map:
             self.view.centerOn(self.player_item)
+            if self.lazy_chunks:
+                self._update_visible_chunks()
+
+    def _update_tile(self, x, y, val):
+        """让 (x, y) 处的图元与格子数值一致；所在区块未生成时只记录数值"""
+        if self.tile_values[y][x] == val:
+            return
+        self.tile_values[y][x] = val
+        chunk = self.chunks.get((x // CHUNK_SIZE, y // CHUNK_SIZE))
+        if chunk is None:
+            return
+        if isinstance(chunk, TileChunkItem):
+            chunk.update_tile(x, y)
+            return
+        item = chunk.pop((x, y), None)
+        if item is not None:
+            self.scene.removeItem(item)
+            self._item_pool.append(item)
+        if val in self.skin_map:  # 虚空与未定义的符号视为移除
+            chunk[(x, y)] = self._place_tile_item(x, y, val)
 
     def keyPressEvent(self, event: QKeyEvent):
         """捕获键盘，直接转发给 Controller"""
@@ -304,6 +392,32 @@ class GameView(QWidget):
         """隐藏复活界面"""
         self.game_over_overlay.hide()
 
+    def refresh_atlas(self):
+        """设备像素比变化（换屏、系统缩放调整）后按新的比例重建图集，并让所有区块改用新图集"""
+        dpr = self.devicePixelRatioF()
+        if dpr == self.atlas.device_pixel_ratio:
+            return
+        self.atlas = TileAtlas(self.skin_map, self.font, self.cell_size, dpr)
+        for chunk in list(self.chunks.values()) + self._chunk_pool:
+            if isinstance(chunk, TileChunkItem):
+                chunk.atlas = self.atlas
+                chunk.update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 构造时还没有所属屏幕，显示后再核对一次，并跟踪之后的换屏
+        handle = self.window().windowHandle()
+        if handle is not None and not self._screen_signal_connected:
+            handle.screenChanged.connect(lambda _screen: self.refresh_atlas())
+            self._screen_signal_connected = True
+        self.refresh_atlas()
+
+    def event(self, event):
+        # Qt 6.6 起同一屏幕上缩放比例变化也会单独发送该事件
+        if event.type() == getattr(QEvent.Type, "DevicePixelRatioChange", None):
+            self.refresh_atlas()
+        return super().event(event)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         center_x = (self.view.width() - self.info_label.width()) // 2
@@ -0,0 +1,73 @@
+from array import array
+from src.model.exceptions import StructureValueError
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 为可选依赖
+    np = None
+
+# 地图网格的存储后端，均支持 grid[y][x] 读写与 len(grid) / len(grid[0])
+LIST = "list"      # list[list[int]]：每格一个 Python int 引用（8 字节）
+ARRAY = "array"    # list[array('b')]：每格 1 字节，纯标准库
+NUMPY = "numpy"    # 二维 int8 ndarray：每格 1 字节，支持向量化扫描
+COMPACT = "compact"  # 有 NumPy 时用 NUMPY，否则退回 ARRAY
+
+def numpy_available() -> bool:
+    return np is not None
+
+def resolve_backend(backend: str) -> str:
+    """把 COMPACT 解析为实际可用的后端；请求 NUMPY 但未安装时同样退回 ARRAY"""
+    if backend in (COMPACT, NUMPY):
+        return NUMPY if np is not None else ARRAY
+    if backend in (LIST, ARRAY):
+        return backend
+    raise StructureValueError(f"未知的网格后端: {backend}")
+
+def make_grid(rows, backend: str = LIST):
+    """由 list[list[int]] 构造指定后端的网格（各行须等长）"""
+    backend = resolve_backend(backend)
+    if backend == NUMPY:
+        return np.array(rows, dtype=np.int8).reshape(len(rows), len(rows[0]) if rows else 0)
+    if backend == ARRAY:
+        return [array('b', row) for row in rows]
+    return [list(row) for row in rows]
+
+def grid_from_cells(cells, width: int, height: int, backend: str = LIST):
+    """由按行存放的 int8 字节（如 Level.cells）直接构造网格，不经过 list[list[int]]"""
+    backend = resolve_backend(backend)
+    if backend == NUMPY:
+        return np.frombuffer(cells, dtype=np.int8, count=width * height).reshape(height, width).copy()
+    view = memoryview(cells)
+    if backend == ARRAY:
+        grid = []
+        for y in range(height):
+            row = array('b')
+            row.frombytes(view[y * width:(y + 1) * width])
+            grid.append(row)
+        return grid
+    signed = view.cast('b')
+    return [signed[y * width:(y + 1) * width].tolist() for y in range(height)]
+
+def copy_grid(grid):
+    """复制网格，保持后端不变"""
+    if np is not None and isinstance(grid, np.ndarray):
+        return grid.copy()
+    return [row[:] for row in grid]
+
+def changed_rows(grid, snapshot):
+    """返回 grid 与快照不同的行号；逐行比较在 C 层完成，NumPy 后端整体向量化"""
+    if np is not None and isinstance(grid, np.ndarray):
+        if not isinstance(snapshot, np.ndarray):
+            snapshot = np.array(snapshot, dtype=grid.dtype)
+        return np.flatnonzero((grid != snapshot).any(axis=1)).tolist()
+    return [y for y in range(len(grid)) if grid[y] != snapshot[y]]
+
+def grid_flags(grid, table: bytes) -> bytearray:
+    """按查表 table[值 + 1] 生成扁平的属性掩码"""
+    if np is not None and isinstance(grid, np.ndarray):
+        lookup = np.frombuffer(table, dtype=np.uint8)
+        return bytearray(lookup[grid.astype(np.intp) + 1].tobytes())
+    flags = bytearray()
+    for row in grid:
+        flags += bytes(table[val + 1] for val in row)
+    return flags
@@ -0,0 +1,174 @@
+"""关卡文件格式：文本地图 (.txt) 的解析，以及编译后的二进制格式 (.lvl)
+
+二进制格式（小端）：
+    头部  magic "DSLV" | 版本 u16 | 是否有玩家标记 u16 | 宽 u32 | 高 u32 | 玩家 x i32 | 玩家 y i32
+    网格  宽 x 高 个 int8，按行存放
+
+文本地图按行流式解析（两遍：先求宽高，再直接写入预分配的网格），
+大文件通过 mmap 读取，峰值内存约为网格本身大小，而不是文本的数倍。
+
+命令行预编译：python -m src.game.level_format [地图目录]
+"""
+import io
+import mmap
+import os
+import struct
+import sys
+from typing import Callable, Iterator, List, Optional, Tuple
+from src.model.exceptions import MapLoadError
+
+MAGIC = b"DSLV"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIii")
+COMPILED_SUFFIX = ".lvl"
+MMAP_THRESHOLD = 1 << 20  # 超过 1 MB 的地图文件用 mmap 读取
+
+# 符号 -> 数字 ID 映射表
+# 0=空地, 1=墙, 2=玩家
+# 3=水, 4=剑, 5=钥匙 (道具-入栈)
+# 6=火, 7=怪, 8=门 (障碍-需出栈)
+CHAR_MAP = {
+    '#': 1, '.': 0, 'P': 0, # P也是空地，但记录坐标
+    'K': 5, 'D': 8, 'M': 7, 'F': 6,
+    'S': 4, 'W': 3, ' ': -1
+}
+
+# ASCII 字节 -> 格子字节的转换表（未知字符为虚空 -1，即 0xFF）
+_TRANSLATE = bytearray(b'\xff' * 256)
+for _char, _val in CHAR_MAP.items():
+    _TRANSLATE[ord(_char)] = _val & 0xFF
+_TRANSLATE = bytes(_TRANSLATE)
+
+class Level:
+    """解析后的关卡：紧凑存放的网格与玩家初始位置（只读，可被多次加载共享）"""
+    __slots__ = ('width', 'height', 'cells', 'player_start')
+
+    def __init__(self, width: int, height: int, cells: bytes, player_start: Optional[Tuple[int, int]]):
+        self.width = width
+        self.height = height
+        self.cells = cells                # 宽 x 高 个 int8（bytes 或 bytearray，约定只读）
+        self.player_start = player_start  # 文件中没有 P 时为 None
+
+    def cell(self, x: int, y: int) -> int:
+        val = self.cells[y * self.width + x]
+        return val - 256 if val > 127 else val
+
+    def rows(self) -> List[List[int]]:
+        """展开为 list[list[int]]（每次返回新的副本）"""
+        w = self.width
+        signed = memoryview(self.cells).cast('b')
+        return [signed[y * w:(y + 1) * w].tolist() for y in range(self.height)]
+
+def _strip_newline(raw: bytes) -> bytes:
+    if raw.endswith(b'\n'):
+        raw = raw[:-1]
+        if raw.endswith(b'\r'):
+            raw = raw[:-1]
+    return raw
+
+def _line_width(line: bytes) -> int:
+    """按字符计的行宽（非 ASCII 行按 UTF-8 解码后计数）"""
+    return len(line) if line.isascii() else len(line.decode('utf-8'))
+
+def _parse_lines(open_lines: Callable[[], Iterator[bytes]]) -> Level:
+    """两遍流式解析：open_lines() 每次返回一个新的逐行迭代器（不含换行符）
+
+    短行用空格（虚空）补齐，未知字符视为虚空；有多个 P 时以最后一个为准。
+    """
+    # 第一遍：只统计行数与最大宽度，不保留任何行
+    width = height = 0
+    for line in open_lines():
+        width = max(width, _line_width(line))
+        height += 1
+
+    # 第二遍：逐行转换后直接写入预分配的网格（预填虚空，相当于补齐）
+    cells = bytearray(b'\xff') * (width * height)
+    player_start = None
+    for y, line in enumerate(open_lines()):
+        base = y * width
+        if line.isascii():
+            cells[base:base + len(line)] = line.translate(_TRANSLATE)
+            x = line.rfind(b'P')
+        else:
+            text = line.decode('utf-8')
+            cells[base:base + len(text)] = bytes(CHAR_MAP.get(char, -1) & 0xFF for char in text)
+            x = text.rfind('P')
+        if x >= 0:
+            player_start = (x, y)
+    return Level(width, height, cells, player_start)  # 不再复制成 bytes，峰值约为网格大小
+
+def parse_text(text: str) -> Level:
+    """解析内存中的文本地图"""
+    data = text.encode('utf-8')
+    return _parse_lines(lambda: (_strip_newline(raw) for raw in io.BytesIO(data)))
+
+def parse_file(path: str, use_mmap: Optional[bool] = None) -> Level:
+    """流式解析文本地图文件；use_mmap 为 None 时按文件大小自动选择"""
+    size = os.path.getsize(path)
+    if use_mmap is None:
+        use_mmap = size >= MMAP_THRESHOLD
+    with open(path, 'rb') as f:
+        if use_mmap and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                def mapped_lines():
+                    mm.seek(0)
+                    for raw in iter(mm.readline, b''):
+                        yield _strip_newline(raw)
+                return _parse_lines(mapped_lines)
+
+        def file_lines():
+            f.seek(0)
+            for raw in f:
+                yield _strip_newline(raw)
+        return _parse_lines(file_lines)
+
+def encode(level: Level) -> bytes:
+    has_player = level.player_start is not None
+    px, py = level.player_start if has_player else (0, 0)
+    return HEADER.pack(MAGIC, VERSION, int(has_player), level.width, level.height, px, py) + level.cells
+
+def decode(data: bytes) -> Level:
+    """解析二进制关卡，格式不符时抛出 MapLoadError"""
+    if len(data) < HEADER.size:
+        raise MapLoadError("关卡文件过短")
+    magic, version, has_player, width, height, px, py = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise MapLoadError("不是受支持的关卡文件")
+    cells = bytes(data[HEADER.size:])
+    if len(cells) != width * height:
+        raise MapLoadError("关卡网格大小与头部不符")
+    return Level(width, height, cells, (px, py) if has_player else None)
+
+def compiled_path(text_path: str) -> str:
+    return os.path.splitext(text_path)[0] + COMPILED_SUFFIX
+
+def compile_level(text_path: str) -> Level:
+    """解析文本地图并写出同名的 .lvl 文件；目录不可写时只返回解析结果"""
+    level = parse_file(text_path)
+    try:
+        with open(compiled_path(text_path), 'wb') as f:
+            f.write(encode(level))
+    except OSError:
+        pass  # 例如打包后的只读资源目录
+    return level
+
+def load_level_file(text_path: str) -> Level:
+    """加载关卡：优先读取不比文本旧的 .lvl 编译文件，否则解析文本并顺便编译"""
+    bin_path = compiled_path(text_path)
+    try:
+        if os.path.getmtime(bin_path) >= os.path.getmtime(text_path):
+            with open(bin_path, 'rb') as f:
+                return decode(f.read())
+    except (OSError, MapLoadError):
+        pass  # 编译文件不存在、过期或损坏：回退到文本
+    return compile_level(text_path)
+
+def main():
+    maps_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join('resources', 'maps')
+    for name in sorted(os.listdir(maps_dir)):
+        if name.endswith('.txt'):
+            level = compile_level(os.path.join(maps_dir, name))
+            print(f"{name} -> {os.path.basename(compiled_path(name))}  ({level.width} x {level.height})")
+
+if __name__ == "__main__":
+    main()
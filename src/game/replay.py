@@ -0,0 +1,167 @@
+"""输入录制与快速回放
+
+模拟按固定步长推进（见 game_engine），所以录像只需记录“输入发生变化的那一步”：
+按住一个方向走几百步只占一条 5 字节的记录。步长写在头部；运行中因卡顿被丢弃的
+时间本来就没有被模拟，因此无需逐帧记录 dt。回放时不渲染，按 CPU 能跑多快就跑多快。
+
+文件格式（小端）：
+    头部  magic "DSRP" | 版本 u16 | 起始关卡 u16 | 步长 f64 | 总步数 u32 | 记录数 u32
+    记录  步序号 u32 | 输入 u8（RESET 表示在该步之前复活重置）
+    结尾  最终关卡 u16 | 是否死亡 u8 | 玩家 x f64 | 玩家 y f64
+
+命令行回放：python -m src.game.replay 录像文件 [...]
+"""
+import struct
+import sys
+import time
+from typing import List, NamedTuple, Optional, Tuple
+from src.game.game_model import GameModel
+from src.game.game_engine import GameEngine
+from src.model.exceptions import ReplayFormatError
+
+MAGIC = b"DSRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHdII")
+RECORD = struct.Struct("<IB")
+FOOTER = struct.Struct("<HBdd")
+RESET = 0x80  # 特殊输入：复活重置当前关卡
+
+class FinalState(NamedTuple):
+    """录制结束时的状态，回放后用来校验"""
+    level_index: int
+    is_game_over: bool
+    player_x: float
+    player_y: float
+
+class Recording:
+    """一段录像：起始关卡、步长、输入变化记录与最终状态"""
+    def __init__(self, start_level: int, step_seconds: float, total_steps: int = 0,
+                 records: Optional[List[Tuple[int, int]]] = None, final: Optional[FinalState] = None):
+        self.start_level = start_level
+        self.step_seconds = step_seconds
+        self.total_steps = total_steps
+        self.records = records if records is not None else []  # [(步序号, 输入)]
+        self.final = final
+
+def final_state(model: GameModel) -> FinalState:
+    return FinalState(model.current_level_index, model.is_game_over, model.player_x, model.player_y)
+
+class InputRecorder:
+    """录制器：每次 engine.step 之前调用 record(输入)，复活时调用 record_reset()"""
+    def __init__(self, engine: GameEngine):
+        self.engine = engine
+        self.recording = Recording(engine.model.current_level_index, engine.step_seconds)
+        self._last_inputs = 0
+
+    def record(self, inputs: int) -> None:
+        rec = self.recording
+        if inputs != self._last_inputs:
+            rec.records.append((rec.total_steps, inputs))
+            self._last_inputs = inputs
+        rec.total_steps += 1
+
+    def record_reset(self) -> None:
+        rec = self.recording
+        rec.records.append((rec.total_steps, RESET))
+
+    def finish(self) -> Recording:
+        """结束录制，记下最终状态"""
+        self.recording.final = final_state(self.engine.model)
+        return self.recording
+
+def encode(recording: Recording) -> bytes:
+    parts = [HEADER.pack(MAGIC, VERSION, recording.start_level, recording.step_seconds,
+                         recording.total_steps, len(recording.records))]
+    parts.extend(RECORD.pack(step, inputs) for step, inputs in recording.records)
+    final = recording.final or FinalState(0, False, 0.0, 0.0)
+    parts.append(FOOTER.pack(final.level_index, int(final.is_game_over), final.player_x, final.player_y))
+    return b"".join(parts)
+
+def decode(data: bytes) -> Recording:
+    """解析录像，格式不符时抛出 ReplayFormatError"""
+    if len(data) < HEADER.size + FOOTER.size:
+        raise ReplayFormatError("录像文件过短")
+    magic, version, start_level, step_seconds, total_steps, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ReplayFormatError("不是受支持的录像文件")
+    end = HEADER.size + count * RECORD.size
+    if len(data) != end + FOOTER.size:
+        raise ReplayFormatError("录像记录数与头部不符")
+    records = list(RECORD.iter_unpack(data[HEADER.size:end]))
+    level_index, game_over, px, py = FOOTER.unpack_from(data, end)
+    return Recording(start_level, step_seconds, total_steps, records,
+                     FinalState(level_index, bool(game_over), px, py))
+
+def save_recording(recording: Recording, path: str) -> None:
+    with open(path, 'wb') as f:
+        f.write(encode(recording))
+
+def load_recording(path: str) -> Recording:
+    with open(path, 'rb') as f:
+        return decode(f.read())
+
+def start_engine(model: GameModel, level_index: int, step: float) -> GameEngine:
+    """让模型处于第 level_index 关开头的状态（录制开始与回放开始都经过这里）"""
+    if model.current_level_index != level_index:
+        model.current_level_index = level_index
+        model.load_level(level_index)
+    engine = GameEngine(model, step)
+    engine.reset()
+    return engine
+
+class ReplayResult(NamedTuple):
+    steps: int
+    elapsed: float        # 秒
+    event_count: int
+    final: FinalState
+    matches: Optional[bool]  # 与录像中的最终状态是否一致；录像没有最终状态时为 None
+
+def replay(recording: Recording, model: Optional[GameModel] = None) -> ReplayResult:
+    """不渲染，以最快速度重放录像"""
+    if model is None:
+        model = GameModel(preload=False)
+    engine = start_engine(model, recording.start_level, recording.step_seconds)
+    step = engine.step
+    records = recording.records
+    pending = 0
+    inputs = 0
+    event_count = 0
+
+    start = time.perf_counter()
+    for i in range(recording.total_steps):
+        while pending < len(records) and records[pending][0] == i:
+            value = records[pending][1]
+            if value == RESET:
+                engine.reset()
+            else:
+                inputs = value
+            pending += 1
+        event_count += len(step(inputs))
+    # 录制结束前最后一步之后的复活
+    for _, value in records[pending:]:
+        if value == RESET:
+            engine.reset()
+    elapsed = time.perf_counter() - start
+
+    final = final_state(model)
+    matches = None if recording.final is None else final == recording.final
+    return ReplayResult(recording.total_steps, elapsed, event_count, final, matches)
+
+def main():
+    if len(sys.argv) < 2:
+        print("用法：python -m src.game.replay 录像文件 [...]")
+        sys.exit(2)
+    failed = False
+    for path in sys.argv[1:]:
+        result = replay(load_recording(path))
+        rate = result.steps / result.elapsed if result.elapsed > 0 else float('inf')
+        status = {True: "一致", False: "不一致", None: "未校验"}[result.matches]
+        print(f"{path}: {result.steps} 步，{result.elapsed * 1000:.1f} ms（{rate:.0f} 步/秒），"
+              f"事件 {result.event_count}，第 {result.final.level_index + 1} 关 "
+              f"({result.final.player_x:.2f}, {result.final.player_y:.2f})"
+              f"{'，已死亡' if result.final.is_game_over else ''}  [{status}]")
+        failed = failed or result.matches is False
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""关卡求解器：判断关卡能否通关，并给出最短路线
+
+把玩家的连续移动近似为格子中心间的四方向移动。搜索状态为
+(所在格子, 背包栈内容, 已消耗的交互格位掩码)：
+    - 同一状态只展开一次（记忆化），栈的顺序是状态的一部分；
+    - 空地之间的移动不单独作为状态：从一个状态出发先 BFS 出可走区域，
+      只在进入交互格（道具 / 火 / 怪 / 门）时产生新状态，区域边缘按
+      (起点, 位掩码, 背包是否已满) 缓存；
+    - 以移动格数为代价做 A*（启发值为到最近的门的曼哈顿距离），
+      第一次取出终点即为最短路线；
+    - 交互格很多时状态数会指数增长，超过 max_states 时放弃并标记为未完成。
+规则与 GameEngine 一致：背包未满时踩到道具必定拾取，满时直接走过；
+火需要栈顶是水、怪需要栈顶是剑，否则死亡（不可走）；门需要栈顶是钥匙，开门即通关。
+
+命令行：python -m src.game.solver [地图文件或目录 ...] [--path]
+"""
+import heapq
+import itertools
+import os
+import sys
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from src.game.level_format import Level, load_level_file
+from src.game.game_engine import PICKED_UP, FIRE_EXTINGUISHED, MONSTER_KILLED, DOOR_OPENED
+
+BACKPACK_CAPACITY = 3
+MAX_STATES = 200_000
+ITEMS = (3, 4, 5)        # 水, 剑, 钥匙
+WATER, SWORD, KEY = 3, 4, 5
+FIRE, MONSTER, DOOR = 6, 7, 8
+WALLS = (1, -1)          # 墙与虚空
+
+class Solution(NamedTuple):
+    solvable: bool
+    steps: int                          # 最短路线的移动格数，不可解时为 -1
+    path: List[Tuple[int, int]]         # 依次经过的格子（含起点）
+    actions: List[Tuple[str, int, int]]  # 途中的交互 (事件类型, x, y)，事件类型见 game_engine
+    states: int                         # 展开的搜索状态数
+    complete: bool = True               # False 表示超出状态上限，结论不可信
+
+class LevelSolver:
+    def __init__(self, level: Level, capacity: int = BACKPACK_CAPACITY, max_states: int = MAX_STATES):
+        self.width = level.width
+        self.height = level.height
+        self.capacity = capacity
+        self.max_states = max_states
+        signed = memoryview(level.cells).cast('b')
+        self.cells = signed.tolist()  # 扁平下标 y * width + x
+        self.start = None
+        if level.player_start is not None:
+            x, y = level.player_start
+            self.start = y * self.width + x
+        # 交互格 -> 位掩码中的位
+        self.bits: Dict[int, int] = {}
+        for i, val in enumerate(self.cells):
+            if val in ITEMS or val in (FIRE, MONSTER, DOOR):
+                self.bits[i] = 1 << len(self.bits)
+        self.doors = [(i % self.width, i // self.width) for i, val in enumerate(self.cells) if val == DOOR]
+        self._frontiers = {}
+
+    def _estimate(self, p):
+        """到最近的门的曼哈顿距离（不高估，A* 仍得到最短路线）"""
+        x, y = p % self.width, p // self.width
+        return min(abs(x - dx) + abs(y - dy) for dx, dy in self.doors)
+
+    def _neighbours(self, p):
+        w = self.width
+        x = p % w
+        if x > 0:
+            yield p - 1
+        if x < w - 1:
+            yield p + 1
+        if p >= w:
+            yield p - w
+        if p + w < len(self.cells):
+            yield p + w
+
+    def _region(self, start, mask, full):
+        """从 start 出发只经过空地（含已消耗的交互格）可达的区域
+
+        返回 (距离表, 前驱表, 区域边缘可进入的交互格列表)。
+        """
+        cells, bits = self.cells, self.bits
+        dist = {start: 0}
+        parent = {start: -1}
+        frontier = []
+        queue = deque([start])
+        while queue:
+            p = queue.popleft()
+            d = dist[p] + 1
+            for q in self._neighbours(p):
+                if q in dist:
+                    continue
+                val = cells[q]
+                if val in WALLS:
+                    continue
+                dist[q] = d
+                parent[q] = p
+                bit = bits.get(q)
+                if bit is None or mask & bit or (full and val in ITEMS):
+                    queue.append(q)  # 空地、已消耗的格子，或背包满时直接走过的道具
+                else:
+                    frontier.append(q)  # 进入会触发交互，由搜索决定
+        return dist, parent, frontier
+
+    def _frontier(self, start, mask, full):
+        """区域边缘的交互格及其距离 [(格子, 距离)]，按 (起点, 位掩码, 是否已满) 缓存"""
+        key = (start, mask, full)
+        cached = self._frontiers.get(key)
+        if cached is None:
+            dist, _, frontier = self._region(start, mask, full)
+            cached = [(t, dist[t]) for t in frontier]
+            self._frontiers[key] = cached
+        return cached
+
+    def solve(self) -> Solution:
+        self._frontiers = {}
+        if self.start is None or not self.doors:
+            return Solution(False, -1, [], [], 0)
+        cells, bits, capacity = self.cells, self.bits, self.capacity
+        start_state = (self.start, (), 0)
+        best = {start_state: 0}
+        came: Dict[tuple, Optional[Tuple[tuple, int, str]]] = {start_state: None}
+        order = itertools.count()  # 代价相同时按入队顺序出队，结果可复现
+        heap = [(self._estimate(self.start), next(order), 0, start_state)]
+        expanded = 0
+        while heap:
+            _, _, cost, state = heapq.heappop(heap)
+            if cost > best[state]:
+                continue
+            pos, stack, mask = state
+            if mask < 0:  # 终点：开门
+                return self._build_solution(state, cost, came, expanded)
+            expanded += 1
+            if expanded > self.max_states:
+                return Solution(False, -1, [], [], expanded, complete=False)
+            full = len(stack) >= capacity
+            top = stack[-1] if stack else None
+            for t, d in self._frontier(pos, mask, full):
+                val = cells[t]
+                if val in ITEMS:
+                    new, action = (t, stack + (val,), mask | bits[t]), PICKED_UP
+                elif val == FIRE and top == WATER:
+                    new, action = (t, stack[:-1], mask | bits[t]), FIRE_EXTINGUISHED
+                elif val == MONSTER and top == SWORD:
+                    new, action = (t, stack[:-1], mask | bits[t]), MONSTER_KILLED
+                elif val == DOOR and top == KEY:
+                    new, action = (t, (), -1), DOOR_OPENED
+                else:
+                    continue  # 门锁着，或会死亡
+                new_cost = cost + d
+                if new_cost < best.get(new, new_cost + 1):
+                    best[new] = new_cost
+                    came[new] = (state, t, action)
+                    estimate = 0 if new[2] < 0 else self._estimate(t)
+                    heapq.heappush(heap, (new_cost + estimate, next(order), new_cost, new))
+        return Solution(False, -1, [], [], expanded)
+
+    def _build_solution(self, goal, cost, came, expanded):
+        w = self.width
+        segments = []
+        actions = []
+        state = goal
+        while came[state] is not None:
+            prev, target, action = came[state]
+            pos, stack, mask = prev
+            _, parent, _ = self._region(pos, mask, len(stack) >= self.capacity)
+            segment = []
+            p = target
+            while p != pos:
+                segment.append(p)
+                p = parent[p]
+            segments.append(segment[::-1])
+            actions.append((action, target % w, target // w))
+            state = prev
+        path = [self.start]
+        for segment in reversed(segments):
+            path.extend(segment)
+        return Solution(True, cost, [(p % w, p // w) for p in path], actions[::-1], expanded)
+
+def solve_level(level: Level, capacity: int = BACKPACK_CAPACITY, max_states: int = MAX_STATES) -> Solution:
+    return LevelSolver(level, capacity, max_states).solve()
+
+def path_to_moves(path: List[Tuple[int, int]]) -> str:
+    """把格子路线转换为方向串（U/D/L/R）"""
+    moves = []
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        moves.append('R' if x1 > x0 else 'L' if x1 < x0 else 'D' if y1 > y0 else 'U')
+    return ''.join(moves)
+
+def _map_files(args):
+    paths = args or [os.path.join('resources', 'maps')]
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path), key=lambda n: (len(n), n)):
+                if name.endswith('.txt'):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    show_path = '--path' in sys.argv[1:]
+    total_start = time.perf_counter()
+    count = unsolvable = 0
+    for path in _map_files(args):
+        start = time.perf_counter()
+        solution = solve_level(load_level_file(path))
+        elapsed = (time.perf_counter() - start) * 1000
+        count += 1
+        if solution.solvable:
+            print(f"{path}: 可通关，最短 {solution.steps} 步，交互 {len(solution.actions)} 次"
+                  f"（搜索 {solution.states} 个状态，{elapsed:.1f} ms）")
+            if show_path:
+                print(f"    {path_to_moves(solution.path)}")
+        elif not solution.complete:
+            unsolvable += 1
+            print(f"{path}: 超出搜索上限 {solution.states} 个状态，未能判定（{elapsed:.1f} ms）")
+        else:
+            unsolvable += 1
+            print(f"{path}: 无法通关（搜索 {solution.states} 个状态，{elapsed:.1f} ms）")
+    print(f"共 {count} 关，{unsolvable} 关无法通关，总耗时 {(time.perf_counter() - total_start) * 1000:.1f} ms")
+    sys.exit(1 if unsolvable else 0)
+
+if __name__ == "__main__":
+    main()
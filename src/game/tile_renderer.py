@@ -0,0 +1,81 @@
+from PyQt6.QtWidgets import QGraphicsItem
+from PyQt6.QtGui import QPixmap, QPainter, QColor
+from PyQt6.QtCore import Qt, QRectF
+
+class TileAtlas:
+    """地图格子的预渲染图集：每种格子的字形只排版、光栅化一次"""
+    def __init__(self, skin_map, font, cell_size, device_pixel_ratio=1.0):
+        self.cell_size = cell_size
+        self.device_pixel_ratio = device_pixel_ratio  # 光栅化时的设备像素比，变化后需重建图集
+        self.pixmaps = {}  # 格子数值 -> QPixmap
+        for val, (char, color_code) in skin_map.items():
+            self.pixmaps[val] = self._rasterize(char, color_code, font, device_pixel_ratio)
+
+    def _rasterize(self, char, color_code, font, dpr):
+        size = int(self.cell_size * dpr)
+        pixmap = QPixmap(size, size)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setFont(font)
+        painter.setPen(QColor(color_code))
+        painter.drawText(QRectF(0, 0, self.cell_size, self.cell_size), Qt.AlignmentFlag.AlignCenter, char)
+        painter.end()
+        return pixmap
+
+class TileChunkItem(QGraphicsItem):
+    """一个区块对应的单个图元：paint 时只把暴露区域内的格子从图集贴出来
+
+    数据直接读取 GameView 的 tile_values，不为每个格子保存图元。
+    区块移出视口后可以 assign 到别的位置复用。
+    """
+    def __init__(self, atlas: TileAtlas, chunk_size: int):
+        super().__init__()
+        self.atlas = atlas
+        self.chunk_size = chunk_size
+        self.tile_values = []
+        self.x0 = self.y0 = 0
+        self.cols = self.rows = 0
+        # 需要 option.exposedRect 才能只重绘变化的部分
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+    def assign(self, cx, cy, tile_values, grid_rows, grid_cols):
+        """把图元绑定到第 (cx, cy) 个区块"""
+        self.prepareGeometryChange()
+        self.tile_values = tile_values
+        self.x0, self.y0 = cx * self.chunk_size, cy * self.chunk_size
+        self.cols = min(self.chunk_size, grid_cols - self.x0)
+        self.rows = min(self.chunk_size, grid_rows - self.y0)
+        cell = self.atlas.cell_size
+        self.setPos(self.x0 * cell, self.y0 * cell)
+        self.update()
+
+    def update_tile(self, x, y):
+        """格子数值变化后只重绘这一格"""
+        cell = self.atlas.cell_size
+        self.update(QRectF((x - self.x0) * cell, (y - self.y0) * cell, cell, cell))
+
+    def boundingRect(self):
+        cell = self.atlas.cell_size
+        return QRectF(0, 0, self.cols * cell, self.rows * cell)
+
+    def paint(self, painter, option, widget=None):
+        cell = self.atlas.cell_size
+        exposed = option.exposedRect
+        if painter.hasClipping():
+            # QGraphicsView.render 等场景下 exposedRect 为整个区块，再用裁剪区收窄
+            exposed = exposed.intersected(painter.clipBoundingRect())
+        first_x = max(0, int(exposed.left() // cell))
+        last_x = min(self.cols, int(exposed.right() // cell) + 1)
+        first_y = max(0, int(exposed.top() // cell))
+        last_y = min(self.rows, int(exposed.bottom() // cell) + 1)
+        pixmaps = self.atlas.pixmaps
+        values = self.tile_values
+        for ly in range(first_y, last_y):
+            row = values[self.y0 + ly]
+            py = ly * cell
+            for lx in range(first_x, last_x):
+                pixmap = pixmaps.get(int(row[self.x0 + lx]))
+                if pixmap is not None:  # 虚空与未定义的符号不绘制
+                    painter.drawPixmap(lx * cell, py, pixmap)
@@ -0,0 +1,44 @@
+from typing import Any, Callable, List, NamedTuple, Tuple
+
+# 事件类型
+INSERTED = "inserted"                  # 从 index 开始插入了 items
+REMOVED = "removed"                    # 从 index 开始删除了 items
+CAPACITY_CHANGED = "capacity_changed"  # 容量变为 capacity
+CLEARED = "cleared"                    # 全部清空
+
+class ChangeEvent(NamedTuple):
+    """模型变更事件：只描述变化的部分，而不是整个容器"""
+    kind: str
+    index: int = -1
+    items: Tuple[Any, ...] = ()
+    capacity: int = -1
+
+class Observable:
+    """可订阅的数据结构基类，负责向订阅者分发 ChangeEvent"""
+    def __init__(self):
+        self._listeners: List[Callable[[ChangeEvent], None]] = []
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, kind: str, index: int = -1, items: Tuple[Any, ...] = (), capacity: int = -1) -> None:
+        # 没有订阅者时不构造事件对象
+        if not self._listeners:
+            return
+        event = ChangeEvent(kind, index, tuple(items), capacity)
+        for callback in list(self._listeners):
+            callback(event)
+
+def apply_to_list(items: List[Any], event: ChangeEvent) -> None:
+    """把变更事件应用到一个镜像列表上（原地修改）"""
+    if event.kind == INSERTED:
+        items[event.index:event.index] = event.items
+    elif event.kind == REMOVED:
+        del items[event.index:event.index + len(event.items)]
+    elif event.kind == CLEARED:
+        items.clear()
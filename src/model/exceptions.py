@@ -27,3 +27,7 @@ class MapLoadError(GameError):
 class InventoryFullError(GameError):
     """当背包满时抛出"""
     pass
+
+class ReplayFormatError(GameError):
+    """当录像文件损坏或版本不受支持时抛出"""
+    pass
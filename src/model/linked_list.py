@@ -1,134 +1,360 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from src.model.exceptions import StructureEmptyError, StructureValueError
+from src.model.events import Observable, INSERTED, REMOVED, CLEARED
+from src.model.pooled_linked_list import PooledLinkedList
 
 class Node:
-    """链表节点"""
+    """链表节点（使用 __slots__，不为每个节点创建 __dict__）"""
+    __slots__ = ('data', 'next', 'prev')
+
     def __init__(self, data: Any):
         self.data = data
         self.next: Optional['Node'] = None
+        self.prev: Optional['Node'] = None  # 仅双向模式下维护
+
+class LinkedList(Observable):
+    """单向链表实现（可选双向模式，每次变更发送 ChangeEvent）
 
-class LinkedList:
-    """单向链表实现"""
-    def __init__(self):
+    始终维护尾指针 tail，尾插为 O(1)；
+    doubly=True 时额外维护 prev 指针，尾删与反向遍历也为 O(1)/步；
+    indexed=True 时维护 值(str) -> 节点集合 的哈希索引：
+        - contains 与查找失败为 O(1)，值唯一时 find 直接返回节点也为 O(1)；
+        - 需要位置时（index_of / delete_value / 有订阅者时的事件）仍要 O(位置) 的遍历，
+          但只做节点身份比较，不再逐个转字符串；
+        - 同时 doubly=True 且值唯一时，delete 直接摘除节点，无订阅者为 O(1)，
+          有订阅者时再沿 prev 指针回数出位置。
+    """
+    def __init__(self, doubly: bool = False, indexed: bool = False):
+        super().__init__()
         self.head: Optional[Node] = None
+        self.tail: Optional[Node] = None
+        self._doubly = doubly
+        self._index: Optional[Dict[str, Set[Node]]] = {} if indexed else None
         self._size = 0
 
+    def is_doubly(self) -> bool:
+        return self._doubly
+
+    def is_indexed(self) -> bool:
+        return self._index is not None
+
+    def _index_add(self, node: Node) -> None:
+        if self._index is not None:
+            self._index.setdefault(str(node.data), set()).add(node)
+
+    def _index_remove(self, node: Node) -> None:
+        if self._index is not None:
+            key = str(node.data)
+            nodes = self._index[key]
+            nodes.discard(node)
+            if not nodes:
+                del self._index[key]
+
     def append(self, data: Any) -> None:
         """在尾部添加 (Append)"""
         new_node = Node(data)
+        self._index_add(new_node)
         if not self.head:
             self.head = new_node
         else:
-            current = self.head
-            while current.next:
-                current = current.next
-            current.next = new_node
+            self.tail.next = new_node
+            if self._doubly:
+                new_node.prev = self.tail
+        self.tail = new_node
         self._size += 1
+        self._emit(INSERTED, self._size - 1, (data,))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """批量尾插：先在本地串好节点链，再一次性挂到尾指针后面"""
+        items = list(items)
+        first = last = None
+        for data in items:
+            node = Node(data)
+            self._index_add(node)
+            if first is None:
+                first = node
+            else:
+                last.next = node
+                if self._doubly:
+                    node.prev = last
+            last = node
+        if first is None:
+            return
+        if not self.head:
+            self.head = first
+        else:
+            self.tail.next = first
+            if self._doubly:
+                first.prev = self.tail
+        self.tail = last
+        self._size += len(items)
+        self._emit(INSERTED, self._size - len(items), items)
+
+    def drain(self, n: Optional[int] = None) -> List[Any]:
+        """从头部删除至多 n 个节点（默认全部），按原顺序返回其值"""
+        if n is None or n > self._size:
+            n = self._size
+        items = []
+        for _ in range(max(n, 0)):
+            items.append(self.head.data)
+            self._index_remove(self.head)
+            self.head = self.head.next
+        if self.head is None:
+            self.tail = None
+        elif self._doubly:
+            self.head.prev = None
+        self._size -= len(items)
+        if items:
+            self._emit(REMOVED, 0, items)
+        return items
 
     def prepend(self, data: Any) -> None:
         """在头部添加 (Prepend)"""
         new_node = Node(data)
+        self._index_add(new_node)
         new_node.next = self.head
+        if self.head and self._doubly:
+            self.head.prev = new_node
         self.head = new_node
+        if self.tail is None:
+            self.tail = new_node
         self._size += 1
+        self._emit(INSERTED, 0, (data,))
 
     def insert_at(self, position: int, data: Any) -> None:
         """在指定位置插入节点 (0-based index)"""
         if position < 0:
             raise StructureValueError("位置不能为负数")
-        
+
         if position > self._size:
             raise StructureValueError(f"位置超出范围 (0-{self._size})")
-        
+
         # 在头部插入
         if position == 0:
             self.prepend(data)
             return
-        
-        # 在中间或尾部插入
+
+        # 在尾部插入：直接走尾指针
+        if position == self._size:
+            self.append(data)
+            return
+
+        # 在中间插入
         new_node = Node(data)
-        current = self.head
-        for i in range(position - 1):
-            current = current.next
-        
+        self._index_add(new_node)
+        current = self._node_at(position - 1)
+
         new_node.next = current.next
         current.next = new_node
+        if self._doubly:
+            new_node.prev = current
+            new_node.next.prev = new_node
         self._size += 1
+        self._emit(INSERTED, position, (data,))
 
     def delete(self, value: Any) -> bool:
         """删除指定值的第一个节点"""
         if not self.head:
             raise StructureEmptyError("List is empty")
 
-        # Case 1: 如果头节点就是要删的
-        if str(self.head.data) == str(value):
-            self.head = self.head.next
-            self._size -= 1
+        # 双向 + 索引且该值唯一时，直接通过 prev 指针摘除（位置只在有订阅者时才计算）
+        node = self._unique_node(value)
+        if node is not None and self._doubly:
+            self._unlink(node)
             return True
 
-        # Case 2: 遍历查找后续节点
+        return self.delete_value(value) >= 0
+
+    def delete_value(self, value: Any) -> int:
+        """删除指定值的第一个节点，返回它被删除前的位置；未找到返回 -1"""
+        if not self.head:
+            raise StructureEmptyError("List is empty")
+
+        node = self._unique_node(value)
+        if node is not None and self._doubly:
+            position = self._position_of(node)
+            self._unlink(node, position)
+            return position
+
+        position, prev_node = self._locate(value)
+        if position < 0:
+            return -1
+        if prev_node is None:
+            self.delete_head()
+        else:
+            self._unlink_after(prev_node, position)
+        return position
+
+    def find(self, value: Any) -> Optional[Node]:
+        """返回指定值的第一个节点，未找到返回 None"""
+        node = self._unique_node(value)
+        if node is not None:
+            return node
+        position, prev_node = self._locate(value)
+        if position < 0:
+            return None
+        return self.head if prev_node is None else prev_node.next
+
+    def index_of(self, value: Any) -> int:
+        """返回指定值第一次出现的位置，未找到返回 -1"""
+        node = self._unique_node(value)
+        if node is not None and self._doubly:
+            return self._position_of(node)
+        return self._locate(value)[0]
+
+    def contains(self, value: Any) -> bool:
+        if self._index is not None:
+            return str(value) in self._index
+        return self._locate(value)[0] >= 0
+
+    def __contains__(self, value: Any) -> bool:
+        return self.contains(value)
+
+    def _unique_node(self, value: Any) -> Optional[Node]:
+        """有索引且该值只出现一次时返回对应节点，否则返回 None"""
+        if self._index is None:
+            return None
+        nodes = self._index.get(str(value))
+        if nodes is None or len(nodes) != 1:
+            return None
+        return next(iter(nodes))
+
+    def _position_of(self, node: Node) -> int:
+        """双向模式下沿 prev 指针回数到头节点，得到 node 的位置"""
+        position = 0
+        node = node.prev
+        while node is not None:
+            position += 1
+            node = node.prev
+        return position
+
+    def _locate(self, value: Any) -> Tuple[int, Optional[Node]]:
+        """查找指定值的第一个节点，返回 (位置, 前驱节点)；未找到返回 (-1, None)"""
+        key = str(value)
+        prev_node = None
         current = self.head
-        while current.next:
-            if str(current.next.data) == str(value):
-                current.next = current.next.next
-                self._size -= 1
-                return True
-            current = current.next
-        return False
+        position = 0
+        if self._index is not None:
+            # 有索引：值不存在直接返回；存在则只做节点身份比较，不再逐个转字符串
+            candidates = self._index.get(key)
+            if not candidates:
+                return -1, None
+            while current is not None and current not in candidates:
+                prev_node = current
+                current = current.next
+                position += 1
+        else:
+            while current is not None and str(current.data) != key:
+                prev_node = current
+                current = current.next
+                position += 1
+        if current is None:
+            return -1, None
+        return position, prev_node
 
     def delete_head(self) -> Any:
         """删除头节点并返回其值"""
         if not self.head:
             raise StructureEmptyError("链表为空，无法删除")
-        
+
         data = self.head.data
+        self._index_remove(self.head)
         self.head = self.head.next
+        if self.head is None:
+            self.tail = None
+        elif self._doubly:
+            self.head.prev = None
         self._size -= 1
+        self._emit(REMOVED, 0, (data,))
         return data
 
     def delete_tail(self) -> Any:
-        """删除尾节点并返回其值"""
+        """删除尾节点并返回其值（双向模式 O(1)，单向模式需找前驱）"""
         if not self.head:
             raise StructureEmptyError("链表为空，无法删除")
-        
+
         # 只有一个节点的情况
-        if not self.head.next:
-            data = self.head.data
-            self.head = None
-            self._size -= 1
-            return data
-        
-        # 多个节点：找到倒数第二个节点
-        current = self.head
-        while current.next.next:
-            current = current.next
-        
-        data = current.next.data
-        current.next = None
+        if self.head is self.tail:
+            return self.delete_head()
+
+        data = self.tail.data
+        self._index_remove(self.tail)
+        if self._doubly:
+            new_tail = self.tail.prev
+        else:
+            # 单向链表：找到倒数第二个节点
+            new_tail = self.head
+            while new_tail.next is not self.tail:
+                new_tail = new_tail.next
+        new_tail.next = None
+        self.tail = new_tail
         self._size -= 1
+        self._emit(REMOVED, self._size, (data,))
         return data
 
     def delete_at(self, position: int) -> Any:
         """删除指定位置的节点并返回其值 (0-based index)"""
         if position < 0:
             raise StructureValueError("位置不能为负数")
-        
+
         if position >= self._size:
             raise StructureValueError(f"位置超出范围 (0-{self._size - 1})")
-        
+
         # 删除头节点
         if position == 0:
             return self.delete_head()
-        
-        # 删除中间或尾部节点
+
+        # 删除尾节点
+        if position == self._size - 1:
+            return self.delete_tail()
+
+        # 删除中间节点
+        current = self._node_at(position - 1)
+        return self._unlink_after(current, position)
+
+    def _node_at(self, position: int) -> Node:
+        """定位第 position 个节点；双向模式下从较近的一端出发"""
+        if self._doubly and position > self._size // 2:
+            current = self.tail
+            for _ in range(self._size - 1 - position):
+                current = current.prev
+            return current
+
         current = self.head
-        for i in range(position - 1):
+        for _ in range(position):
             current = current.next
-        
-        data = current.next.data
-        current.next = current.next.next
+        return current
+
+    def _unlink(self, node: Node, position: int = -1) -> Any:
+        """双向模式下直接摘除给定节点（O(1)）
+
+        position 未知（-1）且有订阅者时，沿 prev 指针回数出位置再发送事件。
+        """
+        if node is self.head:
+            return self.delete_head()
+        if node is self.tail:
+            return self.delete_tail()
+        if position < 0 and self._listeners:
+            position = self._position_of(node)
+        self._index_remove(node)
+        node.prev.next = node.next
+        node.next.prev = node.prev
         self._size -= 1
-        return data
+        self._emit(REMOVED, position, (node.data,))
+        return node.data
+
+    def _unlink_after(self, prev_node: Node, position: int) -> Any:
+        """摘除 prev_node 的后继节点（位于 position）并返回其值，同时维护 tail/prev"""
+        target = prev_node.next
+        self._index_remove(target)
+        prev_node.next = target.next
+        if target.next is None:
+            self.tail = prev_node
+        elif self._doubly:
+            target.next.prev = prev_node
+        self._size -= 1
+        self._emit(REMOVED, position, (target.data,))
+        return target.data
 
     def get_items(self) -> List[Any]:
         """获取所有数据用于绘图 (转换成列表)"""
@@ -139,6 +365,17 @@ class LinkedList:
             current = current.next
         return items
 
+    def get_items_reversed(self) -> List[Any]:
+        """从尾到头获取所有数据（双向模式沿 prev 指针直接回溯）"""
+        if not self._doubly:
+            return self.get_items()[::-1]
+        items = []
+        current = self.tail
+        while current:
+            items.append(current.data)
+            current = current.prev
+        return items
+
     def is_empty(self) -> bool:
         return self._size == 0
 
@@ -147,4 +384,22 @@ class LinkedList:
 
     def clear(self) -> None:
         self.head = None
-        self._size = 0
\ No newline at end of file
+        self.tail = None
+        if self._index is not None:
+            self._index.clear()
+        self._size = 0
+        self._emit(CLEARED)
+
+def create_linked_list(storage: str = "node", doubly: bool = False, indexed: bool = False):
+    """按存储方式创建链表
+
+    storage="node": 每个节点是一个 Node 对象（默认，可选值索引）
+    storage="pool": 节点存放在并行数组中，next/prev 为整数下标，内存占用更小（不支持值索引）
+    """
+    if storage == "node":
+        return LinkedList(doubly=doubly, indexed=indexed)
+    if storage == "pool":
+        if indexed:
+            raise StructureValueError("pool 存储方式不支持值索引 (indexed)")
+        return PooledLinkedList(doubly=doubly)
+    raise StructureValueError(f"未知的链表存储方式: {storage}")
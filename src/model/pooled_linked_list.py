@@ -0,0 +1,342 @@
+from array import array
+from typing import Any, Iterable, List, Optional, Tuple
+from src.model.exceptions import StructureEmptyError, StructureValueError
+from src.model.events import Observable, INSERTED, REMOVED, CLEARED
+
+NIL = -1  # 空指针下标
+
+class PooledNode:
+    """槽位的只读视图：find 的返回值，按 Node 的方式读取 data / next / prev"""
+    __slots__ = ('_list', '_idx')
+
+    def __init__(self, pooled: 'PooledLinkedList', idx: int):
+        self._list = pooled
+        self._idx = idx
+
+    def _at(self, idx: int) -> Optional['PooledNode']:
+        return None if idx == NIL else PooledNode(self._list, idx)
+
+    @property
+    def data(self) -> Any:
+        return self._list._data[self._idx]
+
+    @property
+    def next(self) -> Optional['PooledNode']:
+        return self._at(self._list._next[self._idx])
+
+    @property
+    def prev(self) -> Optional['PooledNode']:
+        if self._list._prev is None:
+            return None
+        return self._at(self._list._prev[self._idx])
+
+class PooledLinkedList(Observable):
+    """基于数组池的链表实现（与 LinkedList 接口一致，同样发送 ChangeEvent）
+
+    节点不再是独立的 Python 对象：第 i 个槽位的数据存于 _data[i]，
+    后继/前驱是 _next/_prev 中的整数下标，每个节点只占两三个机器字。
+    被删除的槽位串成空闲链表，供后续插入复用。
+    不支持值索引（is_indexed 恒为 False），find 返回槽位的只读视图 PooledNode，
+    视图在该节点被删除后失效。
+    """
+    def __init__(self, doubly: bool = False):
+        super().__init__()
+        self._data: List[Any] = []
+        self._next = array('q')
+        self._prev = array('q') if doubly else None
+        self._doubly = doubly
+        self._free = NIL  # 空闲槽位链表头（借用 _next 串联）
+        self._head = NIL
+        self._tail = NIL
+        self._size = 0
+
+    def is_doubly(self) -> bool:
+        return self._doubly
+
+    def is_indexed(self) -> bool:
+        return False
+
+    def _alloc(self, data: Any) -> int:
+        """分配一个槽位，优先复用空闲槽"""
+        if self._free != NIL:
+            idx = self._free
+            self._free = self._next[idx]
+            self._data[idx] = data
+            self._next[idx] = NIL
+            if self._doubly:
+                self._prev[idx] = NIL
+            return idx
+        self._data.append(data)
+        self._next.append(NIL)
+        if self._doubly:
+            self._prev.append(NIL)
+        return len(self._data) - 1
+
+    def _release(self, idx: int) -> Any:
+        """回收槽位并返回其中的数据"""
+        data = self._data[idx]
+        self._data[idx] = None
+        self._next[idx] = self._free
+        self._free = idx
+        return data
+
+    def append(self, data: Any) -> None:
+        """在尾部添加 (Append)"""
+        idx = self._alloc(data)
+        if self._head == NIL:
+            self._head = idx
+        else:
+            self._next[self._tail] = idx
+            if self._doubly:
+                self._prev[idx] = self._tail
+        self._tail = idx
+        self._size += 1
+        self._emit(INSERTED, self._size - 1, (data,))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """批量尾插：先一次性扩展三个并行数组，再串接下标"""
+        items = list(items)
+        if not items:
+            return
+        start = len(self._data)
+        count = len(items)
+        # 新槽位直接追加在池尾（不复用空闲槽），数组只扩展一次
+        self._data.extend(items)
+        self._next.extend(range(start + 1, start + count + 1))
+        self._next[-1] = NIL
+        if self._doubly:
+            self._prev.extend(range(start - 1, start + count - 1))
+            self._prev[start] = self._tail
+        if self._head == NIL:
+            self._head = start
+        else:
+            self._next[self._tail] = start
+        self._tail = start + count - 1
+        self._size += count
+        self._emit(INSERTED, self._size - count, items)
+
+    def drain(self, n: Optional[int] = None) -> List[Any]:
+        """从头部删除至多 n 个节点（默认全部），按原顺序返回其值"""
+        if n is None or n > self._size:
+            n = self._size
+        items = []
+        for _ in range(max(n, 0)):
+            idx = self._head
+            self._head = self._next[idx]
+            items.append(self._release(idx))
+        if self._head == NIL:
+            self._tail = NIL
+        elif self._doubly:
+            self._prev[self._head] = NIL
+        self._size -= len(items)
+        if items:
+            self._emit(REMOVED, 0, items)
+        return items
+
+    def prepend(self, data: Any) -> None:
+        """在头部添加 (Prepend)"""
+        idx = self._alloc(data)
+        self._next[idx] = self._head
+        if self._head != NIL and self._doubly:
+            self._prev[self._head] = idx
+        self._head = idx
+        if self._tail == NIL:
+            self._tail = idx
+        self._size += 1
+        self._emit(INSERTED, 0, (data,))
+
+    def insert_at(self, position: int, data: Any) -> None:
+        """在指定位置插入节点 (0-based index)"""
+        if position < 0:
+            raise StructureValueError("位置不能为负数")
+
+        if position > self._size:
+            raise StructureValueError(f"位置超出范围 (0-{self._size})")
+
+        if position == 0:
+            self.prepend(data)
+            return
+
+        if position == self._size:
+            self.append(data)
+            return
+
+        current = self._slot_at(position - 1)
+        idx = self._alloc(data)
+        nxt = self._next[current]
+        self._next[idx] = nxt
+        self._next[current] = idx
+        if self._doubly:
+            self._prev[idx] = current
+            self._prev[nxt] = idx
+        self._size += 1
+        self._emit(INSERTED, position, (data,))
+
+    def delete(self, value: Any) -> bool:
+        """删除指定值的第一个节点"""
+        return self.delete_value(value) >= 0
+
+    def delete_value(self, value: Any) -> int:
+        """删除指定值的第一个节点，返回它被删除前的位置；未找到返回 -1"""
+        if self._head == NIL:
+            raise StructureEmptyError("List is empty")
+
+        position, prev_idx = self._locate(value)
+        if position < 0:
+            return -1
+        if prev_idx == NIL:
+            self.delete_head()
+        else:
+            self._unlink_after(prev_idx, position)
+        return position
+
+    def find(self, value: Any) -> Optional[PooledNode]:
+        """返回指定值的第一个节点（槽位视图），未找到返回 None"""
+        position, prev_idx = self._locate(value)
+        if position < 0:
+            return None
+        return PooledNode(self, self._head if prev_idx == NIL else self._next[prev_idx])
+
+    def index_of(self, value: Any) -> int:
+        """返回指定值第一次出现的位置，未找到返回 -1"""
+        return self._locate(value)[0]
+
+    def contains(self, value: Any) -> bool:
+        return self._locate(value)[0] >= 0
+
+    def __contains__(self, value: Any) -> bool:
+        return self.contains(value)
+
+    def _locate(self, value: Any) -> Tuple[int, int]:
+        """查找指定值的第一个节点，返回 (位置, 前驱槽位)；未找到返回 (-1, NIL)"""
+        key = str(value)
+        data, nxt = self._data, self._next
+        prev_idx = NIL
+        current = self._head
+        position = 0
+        while current != NIL and str(data[current]) != key:
+            prev_idx = current
+            current = nxt[current]
+            position += 1
+        if current == NIL:
+            return -1, NIL
+        return position, prev_idx
+
+    def delete_head(self) -> Any:
+        """删除头节点并返回其值"""
+        if self._head == NIL:
+            raise StructureEmptyError("链表为空，无法删除")
+
+        idx = self._head
+        self._head = self._next[idx]
+        if self._head == NIL:
+            self._tail = NIL
+        elif self._doubly:
+            self._prev[self._head] = NIL
+        self._size -= 1
+        data = self._release(idx)
+        self._emit(REMOVED, 0, (data,))
+        return data
+
+    def delete_tail(self) -> Any:
+        """删除尾节点并返回其值（双向模式 O(1)，单向模式需找前驱）"""
+        if self._head == NIL:
+            raise StructureEmptyError("链表为空，无法删除")
+
+        if self._head == self._tail:
+            return self.delete_head()
+
+        idx = self._tail
+        if self._doubly:
+            new_tail = self._prev[idx]
+        else:
+            new_tail = self._head
+            while self._next[new_tail] != idx:
+                new_tail = self._next[new_tail]
+        self._next[new_tail] = NIL
+        self._tail = new_tail
+        self._size -= 1
+        data = self._release(idx)
+        self._emit(REMOVED, self._size, (data,))
+        return data
+
+    def delete_at(self, position: int) -> Any:
+        """删除指定位置的节点并返回其值 (0-based index)"""
+        if position < 0:
+            raise StructureValueError("位置不能为负数")
+
+        if position >= self._size:
+            raise StructureValueError(f"位置超出范围 (0-{self._size - 1})")
+
+        if position == 0:
+            return self.delete_head()
+
+        if position == self._size - 1:
+            return self.delete_tail()
+
+        return self._unlink_after(self._slot_at(position - 1), position)
+
+    def _slot_at(self, position: int) -> int:
+        """定位第 position 个节点的槽位下标"""
+        if self._doubly and position > self._size // 2:
+            current = self._tail
+            for _ in range(self._size - 1 - position):
+                current = self._prev[current]
+            return current
+
+        current = self._head
+        for _ in range(position):
+            current = self._next[current]
+        return current
+
+    def _unlink_after(self, prev_idx: int, position: int) -> Any:
+        """摘除 prev_idx 的后继节点（位于 position）并返回其值"""
+        target = self._next[prev_idx]
+        nxt = self._next[target]
+        self._next[prev_idx] = nxt
+        if nxt == NIL:
+            self._tail = prev_idx
+        elif self._doubly:
+            self._prev[nxt] = prev_idx
+        self._size -= 1
+        data = self._release(target)
+        self._emit(REMOVED, position, (data,))
+        return data
+
+    def get_items(self) -> List[Any]:
+        """获取所有数据用于绘图 (转换成列表)"""
+        items = []
+        data, nxt = self._data, self._next
+        current = self._head
+        while current != NIL:
+            items.append(data[current])
+            current = nxt[current]
+        return items
+
+    def get_items_reversed(self) -> List[Any]:
+        """从尾到头获取所有数据"""
+        if not self._doubly:
+            return self.get_items()[::-1]
+        items = []
+        data, prev = self._data, self._prev
+        current = self._tail
+        while current != NIL:
+            items.append(data[current])
+            current = prev[current]
+        return items
+
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    def size(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        self._data = []
+        self._next = array('q')
+        self._prev = array('q') if self._doubly else None
+        self._free = NIL
+        self._head = NIL
+        self._tail = NIL
+        self._size = 0
+        self._emit(CLEARED)
@@ -1,47 +1,150 @@
-from typing import Any, List
+from collections.abc import Sequence
+from typing import Any, Iterable, List, Optional
 from src.model.exceptions import StructureEmptyError, StructureFullError, StructureValueError
+from src.model.events import Observable, INSERTED, REMOVED, CAPACITY_CHANGED
 
-class Queue:
-    """队列的实现类"""
+class QueueView(Sequence):
+    """队列的只读有序视图：不拷贝数据，按队头到队尾的顺序实时读取环形缓冲区"""
+    def __init__(self, queue: 'Queue'):
+        self._queue = queue
+
+    def __len__(self) -> int:
+        return self._queue._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        size = self._queue._size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("queue index out of range")
+        buffer = self._queue._buffer
+        return buffer[(self._queue._head + index) % len(buffer)]
+
+    def __iter__(self):
+        buffer = self._queue._buffer
+        head = self._queue._head
+        for i in range(self._queue._size):
+            yield buffer[(head + i) % len(buffer)]
+
+class Queue(Observable):
+    """队列的实现类（基于定长环形缓冲区，出队 O(1)；每次变更发送 ChangeEvent）"""
     def __init__(self, capacity: int = 10):
-        self._items: List[Any] = []
+        super().__init__()
+        # 预分配的环形数组，_head 指向队头，队尾位置为 (_head + _size) % 容量
+        self._buffer: List[Any] = [None] * capacity
+        self._head = 0
+        self._size = 0
         self._capacity = capacity
+        self._view = QueueView(self)
 
     def enqueue(self, item: Any) -> None:
         """入队"""
         if self.is_full():
             raise StructureFullError("Queue is full")
-        self._items.append(item)
+        self._buffer[(self._head + self._size) % self._capacity] = item
+        self._size += 1
+        self._emit(INSERTED, self._size - 1, (item,))
 
     def dequeue(self) -> Any:
         """出队"""
         if self.is_empty():
             raise StructureEmptyError("Queue is empty")
-        return self._items.pop(0)  # 移除列表第一个元素
+        item = self._buffer[self._head]
+        self._buffer[self._head] = None  # 释放引用
+        self._head = (self._head + 1) % self._capacity
+        self._size -= 1
+        self._emit(REMOVED, 0, (item,))
+        return item
+
+    def enqueue_many(self, items: Iterable[Any]) -> None:
+        """批量入队：一次性校验剩余容量，最多分两段切片写入环形缓冲区"""
+        items = list(items)
+        if self._size + len(items) > self._capacity:
+            raise StructureFullError("Queue is full")
+        if not items:
+            return
+        start = (self._head + self._size) % self._capacity
+        first = min(len(items), self._capacity - start)
+        self._buffer[start:start + first] = items[:first]
+        self._buffer[:len(items) - first] = items[first:]
+        self._size += len(items)
+        self._emit(INSERTED, self._size - len(items), items)
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """同 enqueue_many"""
+        self.enqueue_many(items)
+
+    def dequeue_many(self, n: int) -> List[Any]:
+        """批量出队 n 个元素（队头在前）；数量不足时不出队任何元素"""
+        if n < 0:
+            raise StructureValueError("数量不能为负数")
+        if n > self._size:
+            raise StructureEmptyError("Queue is empty")
+        return self.drain(n)
+
+    def drain(self, n: Optional[int] = None) -> List[Any]:
+        """出队至多 n 个元素（默认全部），队头在前"""
+        if n is None or n > self._size:
+            n = self._size
+        if n <= 0:
+            return []
+        start = self._head
+        first = min(n, self._capacity - start)
+        items = self._buffer[start:start + first] + self._buffer[:n - first]
+        self._buffer[start:start + first] = [None] * first
+        self._buffer[:n - first] = [None] * (n - first)
+        self._head = (self._head + n) % self._capacity
+        self._size -= n
+        self._emit(REMOVED, 0, items)
+        return items
 
     def peek(self) -> Any:
         """查看队头元素"""
         if self.is_empty():
             raise StructureEmptyError("Queue is empty")
-        return self._items[0]
+        return self._buffer[self._head]
 
     def is_empty(self) -> bool:
-        return len(self._items) == 0
+        return self._size == 0
 
     def is_full(self) -> bool:
-        return len(self._items) >= self._capacity
+        return self._size >= self._capacity
 
     def size(self) -> int:
-        return len(self._items)
+        return self._size
 
     def get_items(self) -> List[Any]:
-        return self._items.copy()
-    
+        """获取所有元素的副本（队头在前）"""
+        return list(self._view)
+
+    def view(self) -> QueueView:
+        """获取零拷贝的有序视图（用于前端绘图，随队列实时变化）"""
+        return self._view
+
     def capacity(self) -> int:
         return self._capacity
-    
+
     #修改容量
     def set_capacity(self, new_capacity: int) -> None:
-        if new_capacity < len(self._items):
+        if new_capacity < self._size:
             raise StructureValueError("New capacity cannot be less than current size")
-        self._capacity = new_capacity
\ No newline at end of file
+
+        end = self._head + self._size
+        if end <= self._capacity and end <= new_capacity:
+            # 数据没有回绕且落在新容量内：直接在原数组尾部扩展/截断
+            if new_capacity > self._capacity:
+                self._buffer.extend([None] * (new_capacity - self._capacity))
+            else:
+                del self._buffer[new_capacity:]
+            if self._size == 0:
+                # 空队列的 _head 可能恰好等于新容量，截断后会越界，归零
+                self._head = 0
+        else:
+            # 数据回绕或越过新边界：原地重排为从下标 0 开始
+            ordered = list(self._view)
+            self._buffer[:] = ordered + [None] * (new_capacity - self._size)
+            self._head = 0
+        self._capacity = new_capacity
+        self._emit(CAPACITY_CHANGED, capacity=new_capacity)
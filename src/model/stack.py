@@ -1,9 +1,11 @@
-from typing import Any, List
+from typing import Any, Iterable, List, Optional
 from src.model.exceptions import StructureEmptyError, StructureFullError, StructureValueError
+from src.model.events import Observable, INSERTED, REMOVED, CAPACITY_CHANGED, CLEARED
 
-class Stack:
-    """栈的实现类"""
+class Stack(Observable):
+    """栈的实现类（每次变更向订阅者发送 ChangeEvent）"""
     def __init__(self, capacity: int = 10):
+        super().__init__()
         # 使用列表作为底层存储，_items 表示这是一个私有属性（封装）
         self._items: List[Any] = []
         self._capacity = capacity
@@ -13,12 +15,49 @@ class Stack:
         if self.is_full():
             raise StructureFullError("Stack is full")
         self._items.append(item)
+        self._emit(INSERTED, len(self._items) - 1, (item,))
 
     def pop(self) -> Any:
         """出栈"""
         if self.is_empty():
             raise StructureEmptyError("Stack is empty")
-        return self._items.pop()
+        item = self._items.pop()
+        self._emit(REMOVED, len(self._items), (item,))
+        return item
+
+    def push_many(self, items: Iterable[Any]) -> None:
+        """批量入栈：一次性校验剩余容量，整体写入（容量不足时不写入任何元素）"""
+        items = list(items)
+        if len(self._items) + len(items) > self._capacity:
+            raise StructureFullError("Stack is full")
+        start = len(self._items)
+        self._items.extend(items)
+        if items:
+            self._emit(INSERTED, start, items)
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """同 push_many"""
+        self.push_many(items)
+
+    def pop_many(self, n: int) -> List[Any]:
+        """批量出栈 n 个元素，按出栈顺序（栈顶在前）返回；数量不足时不弹出任何元素"""
+        if n < 0:
+            raise StructureValueError("数量不能为负数")
+        if n > len(self._items):
+            raise StructureEmptyError("Stack is empty")
+        return self.drain(n)
+
+    def drain(self, n: Optional[int] = None) -> List[Any]:
+        """弹出至多 n 个元素（默认全部），按出栈顺序返回"""
+        if n is None or n > len(self._items):
+            n = len(self._items)
+        if n <= 0:
+            return []
+        popped = self._items[-n:]
+        del self._items[-n:]
+        self._emit(REMOVED, len(self._items), popped)
+        popped.reverse()
+        return popped
 
     def peek(self) -> Any:
         """查看栈顶元素"""
@@ -47,7 +86,9 @@ class Stack:
         if new_capacity < len(self._items):
             raise StructureValueError("New capacity cannot be less than current size")
         self._capacity = new_capacity
+        self._emit(CAPACITY_CHANGED, capacity=new_capacity)
 
     def clear(self) -> None:
         """清空栈"""
-        self._items.clear()
\ No newline at end of file
+        self._items.clear()
+        self._emit(CLEARED)
\ No newline at end of file
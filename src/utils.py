@@ -1,5 +1,6 @@
 import sys
 import os
+import re
 
 def get_base_path():
     """
@@ -14,4 +15,8 @@ def get_base_path():
     else:
         # 开发环境：回退两级找到项目根目录
         # 假设此文件在 src/utils.py，回退两级就是 DS_Visualizer/
-        return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
\ No newline at end of file
+        return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def split_batch_input(text):
+    """把批量输入框的内容按中英文逗号拆分成元素列表（忽略空白项）"""
+    return [part.strip() for part in re.split(r'[,，]', text) if part.strip()]
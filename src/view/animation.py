@@ -0,0 +1,95 @@
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+from PyQt6.QtCore import QTimer
+
+def linear(t: float) -> float:
+    return t
+
+def ease_in_out(t: float) -> float:
+    """三次缓入缓出"""
+    if t < 0.5:
+        return 4 * t * t * t
+    f = 2 * t - 2
+    return 0.5 * f * f * f + 1
+
+class Timeline:
+    """按真实经过时间推进的分阶段动画（不依赖 Qt）
+
+    phases 为 [(阶段编号, 时长 ms), ...]，按顺序播放。进度只由经过的时间
+    决定，与帧率无关：卡顿时会跳帧而不是变慢。speed 可加速播放（快进）。
+    """
+    def __init__(self, phases: Sequence[Tuple[int, float]], speed: float = 1.0):
+        self.phases = list(phases)
+        self.speed = speed
+        self.elapsed = 0.0  # 已播放的毫秒数（已乘以 speed）
+        self.total = sum(duration for _, duration in self.phases)
+
+    def advance(self, dt_ms: float) -> None:
+        self.elapsed = min(self.total, self.elapsed + dt_ms * self.speed)
+
+    def finish(self) -> None:
+        """直接跳到结尾"""
+        self.elapsed = self.total
+
+    def reset(self) -> None:
+        """回到开头重新播放"""
+        self.elapsed = 0.0
+
+    def is_finished(self) -> bool:
+        return self.elapsed >= self.total
+
+    def current(self) -> Tuple[int, float]:
+        """返回 (当前阶段编号, 阶段内线性进度 0->1)"""
+        remaining = self.elapsed
+        for phase, duration in self.phases:
+            if remaining < duration:
+                return phase, remaining / duration
+            remaining -= duration
+        return (self.phases[-1][0], 1.0) if self.phases else (0, 1.0)
+
+class AnimationClock:
+    """所有画布共用的动画时钟
+
+    只有在有动画订阅时才启动定时器，空闲时自动停止；每次 tick 把距上一帧的
+    真实毫秒数传给回调。回调返回 False 表示动画结束，随即取消订阅。
+    """
+    def __init__(self, interval_ms: int = 16):
+        self._timer = QTimer()
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+        self._callbacks: List[Callable[[float], bool]] = []
+        self._last = 0.0
+
+    def add(self, callback: Callable[[float], bool]) -> None:
+        if callback in self._callbacks:
+            return
+        self._callbacks.append(callback)
+        if not self._timer.isActive():
+            self._last = time.perf_counter()
+            self._timer.start()
+
+    def remove(self, callback: Callable[[float], bool]) -> None:
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+        if not self._callbacks:
+            self._timer.stop()
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        dt_ms = (now - self._last) * 1000
+        self._last = now
+        for callback in list(self._callbacks):
+            if not callback(dt_ms):
+                self.remove(callback)
+
+_shared_clock: Optional[AnimationClock] = None
+
+def shared_animation_clock() -> AnimationClock:
+    """所有画布共用的时钟实例"""
+    global _shared_clock
+    if _shared_clock is None:
+        _shared_clock = AnimationClock()
+    return _shared_clock
@@ -1,10 +1,25 @@
-import math
-from PyQt6.QtWidgets import QWidget
-from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush
-from PyQt6.QtCore import Qt, QTimer
+from collections import deque
+from PyQt6.QtWidgets import QWidget, QScrollBar
+from PyQt6.QtGui import QPainter, QColor, QPainterPath
+from PyQt6.QtCore import Qt
+from src.model.events import ChangeEvent, INSERTED, REMOVED, apply_to_list
+from src.view.render_cache import shared_render_cache, arrow_head_offsets, INVALIDATING_EVENTS
+from src.view.animation import Timeline, shared_animation_clock, ease_in_out, linear
 
 class LinkedListCanvas(QWidget):
     """单向链表专用画布"""
+    # 各动画阶段时长 (ms)
+    INSERT_HOLD_MS = 300
+    INSERT_ARROW_MS = 390
+    INSERT_SLIDE_MS = 390
+    DELETE_LIFT_MS = 510
+    DELETE_SLIDE_MS = 600
+    DELETE_ARROW_MS = 510
+    DELETE_FADE_MS = 390
+    BATCH_MS = 250
+    # 等待中的操作超过该数量时，合并为一次批量过渡
+    BATCH_THRESHOLD = 8
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.data_items = []
@@ -13,14 +28,34 @@ class LinkedListCanvas(QWidget):
         p = self.palette()
         p.setColor(self.backgroundRole(), QColor(240, 248, 255)) 
         self.setPalette(p)
+
+        # 布局参数（绘制与滚动范围计算共用）
+        self.node_width = 60
+        self.node_height = 40
+        self.spacing = 50   # 箭头长度
+        self.margin_x = 40  # 第一个节点的起始 X 坐标
+        # 共享的字体/画笔/文字排版缓存
+        self.render_cache = shared_render_cache()
+
+        # 横向滚动：只绘制视口内的节点和箭头
+        self.scroll_x = 0
+        self.h_scrollbar = QScrollBar(Qt.Orientation.Horizontal, self)
+        self.h_scrollbar.valueChanged.connect(self._on_scroll)
+        self.h_scrollbar.hide()
         
         # 动画相关属性
         self.new_node_index = -1   # 新插入节点的索引
         self.delete_node_index = -1  # 删除节点的索引
         self.animation_alpha = 255  # 透明度（删除动画遗留，不再用于插入）
-        self.animation_timer = QTimer()
-        self.animation_timer.timeout.connect(self._animate)
-        self.animation_step = 0
+        # 按真实时间推进的时间轴，由共享时钟驱动（空闲时时钟自动停止）
+        self.clock = shared_animation_clock()
+        self.timeline = None
+        # 操作队列：模型事件先入队，轮到它的动画开始时才应用到 data_items，
+        # 保证每一帧画面都对应某个真实的中间状态
+        self.pending_events = deque()
+        # 批量过渡（整体淡入）
+        self.batch_active = False
+        self.batch_progress = 0.0
         
         # 指针动画状态
         self.pointer_animation_active = False  # 是否正在播放指针动画
@@ -58,16 +93,119 @@ class LinkedListCanvas(QWidget):
         self.delete_slide_progress = 1.0  # 1.0 -> 0.0，向左合拢
 
     def update_data(self, items: list):
+        """整体替换显示数据，丢弃尚未播放的操作"""
+        self.pending_events.clear()
+        self._stop_timeline()
         self.data_items = items
+        self._update_scroll_range()
+        self.update()
+
+    def apply_change(self, event: ChangeEvent):
+        """订阅 LinkedList 的变更事件：入队，按顺序播放对应的动画"""
+        self.pending_events.append(event)
+        if self.timeline is None:
+            self._play_next()
+
+    def backlog_depth(self) -> int:
+        """尚未开始播放的操作数"""
+        return len(self.pending_events)
+
+    def _play_next(self):
+        """取出下一个操作：单节点插入/删除播放动画，其余（批量、清空）直接应用"""
+        if len(self.pending_events) > self.BATCH_THRESHOLD:
+            self._play_batch()
+            return
+        while self.pending_events:
+            event = self.pending_events.popleft()
+            apply_to_list(self.data_items, event)
+            self._update_scroll_range()
+            if len(event.items) == 1:
+                if event.kind == INSERTED:
+                    self.animate_insert_slide(event.index)
+                    return
+                if event.kind == REMOVED:
+                    self.animate_delete(event.index, event.items[0])
+                    return
+        self.update()
+
+    def _play_batch(self):
+        """积压过多时一次性应用全部等待的操作，只播放一次整体淡入"""
+        while self.pending_events:
+            apply_to_list(self.data_items, self.pending_events.popleft())
+        self._update_scroll_range()
+        self.batch_active = True
+        self.batch_progress = 0.0
+        self._start_timeline([(0, self.BATCH_MS)])
+
+    def flush_animations(self):
+        """结束当前动画并立即应用所有等待的操作"""
+        self._stop_timeline()
+        while self.pending_events:
+            apply_to_list(self.data_items, self.pending_events.popleft())
+        self._update_scroll_range()
         self.update()
+
+    def scroll_maximum(self) -> int:
+        """最大横向滚动量：内容宽度超出画布宽度的部分（不超出时为 0）"""
+        pitch = self.node_width + self.spacing
+        content_width = self.margin_x + len(self.data_items) * pitch + 80  # 末尾留出 None 文字
+        return max(0, content_width - self.width())
+
+    def visible_node_range(self):
+        """当前滚动位置下需要绘制的节点下标 [first, last)，两侧各多留两个节点给滑动动画的偏移"""
+        pitch = self.node_width + self.spacing
+        first = max(0, (self.scroll_x - self.margin_x) // pitch - 2)
+        last = min(len(self.data_items), (self.scroll_x + self.width()) // pitch + 2)
+        return first, max(first, last)
+
+    def _update_scroll_range(self):
+        """根据节点总数更新滚动条范围（内容不超过宽度时隐藏滚动条）"""
+        pitch = self.node_width + self.spacing
+        maximum = self.scroll_maximum()
+        self.h_scrollbar.setRange(0, maximum)
+        self.h_scrollbar.setPageStep(max(1, self.width()))
+        self.h_scrollbar.setSingleStep(pitch)
+        self.h_scrollbar.setVisible(maximum > 0)
+
+    def _on_scroll(self, value: int):
+        self.scroll_x = value
+        self.update()
+
+    def _ensure_visible(self, index: int):
+        """动画开始前把目标节点滚动到视口内，保证动画可见"""
+        pitch = self.node_width + self.spacing
+        x = self.margin_x + index * pitch - self.scroll_x
+        if x < 0 or x + pitch > self.width():
+            self.h_scrollbar.setValue(self.margin_x + index * pitch - self.width() // 2)
+
+    def wheelEvent(self, event):
+        """滚轮横向滚动"""
+        delta = event.angleDelta().y() or event.angleDelta().x()
+        if delta == 0:
+            return
+        steps = delta / 120
+        self.h_scrollbar.setValue(self.h_scrollbar.value() - int(steps * self.h_scrollbar.singleStep()))
+
+    def changeEvent(self, event):
+        """字体或 DPI 变化时让已缓存的排版结果失效"""
+        if event.type() in INVALIDATING_EVENTS:
+            self.render_cache.invalidate()
+        super().changeEvent(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        bar_height = self.h_scrollbar.sizeHint().height()
+        self.h_scrollbar.setGeometry(0, self.height() - bar_height, self.width(), bar_height)
+        self._update_scroll_range()
     
     def animate_insert_slide(self, index: int):
         """滑动插入动画：新节点出现与指针转向 → 前驱转向 → 节点右移 + 新节点下落"""
+        self._stop_timeline()
+        self._ensure_visible(index)
         self.new_node_index = index
         self.slide_active = True
         self.slide_index = index
         self.slide_progress = 0.0
-        self.animation_step = 0
         # 重构阶段：0 新节点上方出现并指向 None（后继不动）
         # 1 新节点箭头从 None 转向下一个
         # 2 前驱箭头从原指向（后继）转向斜上方的新节点
@@ -88,10 +226,20 @@ class LinkedListCanvas(QWidget):
 
         self.pointer_animation_active = True
         self.pointer_alpha = 0
-        self.animation_timer.start(30)
+
+        # 无后继时跳过阶段 1，头插时跳过阶段 2
+        phases = [(0, self.INSERT_HOLD_MS)]
+        if self.new_pointer_to >= 0:
+            phases.append((1, self.INSERT_ARROW_MS))
+        if index > 0:
+            phases.append((2, self.INSERT_ARROW_MS))
+        phases.append((3, self.INSERT_SLIDE_MS))
+        self._start_timeline(phases)
     
     def animate_delete(self, index: int, value=None):
         """删除节点动画：节点上提 + 右侧合拢 → 前驱箭头转向后继/None"""
+        self._stop_timeline()
+        self._ensure_visible(index)
         self.delete_node_index = index
         self.delete_ghost_value = value
         self.delete_prev_index = index - 1 if index > 0 else -1
@@ -101,95 +249,77 @@ class LinkedListCanvas(QWidget):
         self.delete_lift_progress = 0.0
         self.delete_fade_progress = 0.0
         self.animation_phase = 0
-        self.animation_step = 0
         # 右侧节点初始保持在旧位置，随后向左合拢
         self.slide_delete_active = True
         self.delete_slide_index = index
         self.delete_slide_progress = 1.0
         self.pointer_animation_active = False
-        self.animation_timer.start(30)
-    
-    def _animate(self):
-        """动画帧更新"""
-        self.animation_step += 1
-        
-        if self.slide_active and self.new_node_index >= 0:
-            # 新插入五步几何动画
-            if self.animation_phase == 0:
-                # 新节点上方出现，箭头指向 None
-                if self.animation_step >= 10:
-                    if self.new_pointer_to < 0:
-                        # 无后继：直接转前驱阶段或下落
-                        if self.slide_index > 0:
-                            self.animation_phase = 2
-                            self.animation_step = 0
-                            self.prev_arrow_progress = 0.0
-                        else:
-                            self.animation_phase = 3
-                            self.animation_step = 0
-                    else:
-                        self.animation_phase = 1
-                        self.animation_step = 0
-            elif self.animation_phase == 1:
-                # 新节点箭头从 None 转向后继
-                self.new_arrow_progress = min(1.0, self.new_arrow_progress + 0.08)
-                if self.new_arrow_progress >= 1.0:
-                    if self.slide_index > 0:
-                        self.animation_phase = 2
-                        self.animation_step = 0
-                        self.prev_arrow_progress = 0.0
-                    else:
-                        self.animation_phase = 3
-                        self.animation_step = 0
-            elif self.animation_phase == 2:
-                # 前驱箭头转向新节点（旧指向为后继）
-                self.prev_arrow_progress = min(1.0, self.prev_arrow_progress + 0.08)
-                if self.prev_arrow_progress >= 1.0:
-                    self.animation_phase = 3
-                    self.animation_step = 0
-                    self.slide_progress = 0.0
-                    self.drop_progress = 0.0
-            elif self.animation_phase == 3:
-                # 后续节点右移 + 新节点下落，箭头随动
-                self.slide_progress = min(1.0, self.slide_progress + 0.08)
-                self.drop_progress = self.slide_progress
-                if self.slide_progress >= 1.0:
-                    self.animation_timer.stop()
-                    self.slide_active = False
-                    self._reset_animation_state()
-
-        # 删除动画阶段
-        if self.delete_active and self.delete_node_index >= 0:
-            if self.animation_phase == 0:
-                # 节点上提淡出，同时右侧节点向左合拢，箭头随动
-                self.delete_lift_progress = min(1.0, self.delete_lift_progress + 0.06)
-                if self.slide_delete_active:
-                    self.delete_slide_progress = max(0.0, self.delete_slide_progress - 0.05)
-                    if self.delete_slide_progress <= 0.0:
-                        self.slide_delete_active = False
-                if self.delete_lift_progress >= 1.0 and not self.slide_delete_active:
-                    if self.delete_prev_index >= 0:
-                        self.animation_phase = 1
-                        self.animation_step = 0
-                        self.delete_arrow_progress = 0.0
-                    else:
-                        self.animation_timer.stop()
-                        self._reset_animation_state()
-            elif self.animation_phase == 1:
-                # 前驱箭头缓缓转向后继/None
-                self.delete_arrow_progress = min(1.0, self.delete_arrow_progress + 0.06)
-                if self.delete_arrow_progress >= 1.0:
-                    self.animation_phase = 2
-                    self.animation_step = 0
-                    self.delete_fade_progress = 0.0
-            elif self.animation_phase == 2:
-                # 指针到位后才开始淡出
-                self.delete_fade_progress = min(1.0, self.delete_fade_progress + 0.08)
-                if self.delete_fade_progress >= 1.0:
-                    self.animation_timer.stop()
-                    self._reset_animation_state()
 
+        # 删除头节点时没有前驱箭头需要转向，合拢后直接结束
+        phases = [(0, max(self.DELETE_LIFT_MS, self.DELETE_SLIDE_MS))]
+        if self.delete_prev_index >= 0:
+            phases += [(1, self.DELETE_ARROW_MS), (2, self.DELETE_FADE_MS)]
+        self._start_timeline(phases)
+
+    def _stop_timeline(self):
+        if self.timeline is None:
+            return
+        self.clock.remove(self._on_frame)
+        self.timeline = None
+        self._reset_animation_state()
+        self.update()
+
+    def _start_timeline(self, phases):
+        self.timeline = Timeline(phases)
+        self._apply_timeline()
+        self.clock.add(self._on_frame)
         self.update()
+
+    def _on_frame(self, dt_ms: float) -> bool:
+        """时钟回调：按经过的真实时间推进动画，返回 False 表示结束"""
+        if self.timeline is None:
+            return False
+        self.timeline.advance(dt_ms)
+        if self.timeline.is_finished():
+            self.timeline = None
+            self._reset_animation_state()
+            self._play_next()
+            self.update()
+            # 队列中的下一个动画会复用本回调
+            return self.timeline is not None
+        self._apply_timeline()
+        self.update()
+        return True
+
+    def _apply_timeline(self):
+        """把时间轴的当前进度换算成绘制用的各项进度"""
+        phase, t = self.timeline.current()
+        self.animation_phase = phase
+
+        if self.batch_active:
+            self.batch_progress = ease_in_out(t)
+            return
+
+        if self.slide_active and self.new_node_index >= 0:
+            # 插入：前面阶段的进度已完成，当前阶段按缓动曲线插值
+            self.new_arrow_progress = 1.0 if phase > 1 else (ease_in_out(t) if phase == 1 else 0.0)
+            self.prev_arrow_progress = 1.0 if phase > 2 else (ease_in_out(t) if phase == 2 else 0.0)
+            self.slide_progress = ease_in_out(t) if phase == 3 else 0.0
+            self.drop_progress = self.slide_progress
+
+        if self.delete_active and self.delete_node_index >= 0:
+            if phase == 0:
+                # 上提与合拢同时开始，各自按自己的时长完成
+                ms = t * max(self.DELETE_LIFT_MS, self.DELETE_SLIDE_MS)
+                self.delete_lift_progress = ease_in_out(min(1.0, ms / self.DELETE_LIFT_MS))
+                self.delete_slide_progress = 1.0 - ease_in_out(min(1.0, ms / self.DELETE_SLIDE_MS))
+                self.slide_delete_active = self.delete_slide_progress > 0.0
+            else:
+                self.delete_lift_progress = 1.0
+                self.delete_slide_progress = 0.0
+                self.slide_delete_active = False
+                self.delete_arrow_progress = 1.0 if phase > 1 else ease_in_out(t)
+                self.delete_fade_progress = linear(t) if phase == 2 else 0.0
     
     def _reset_animation_state(self):
         """重置动画状态"""
@@ -202,6 +332,8 @@ class LinkedListCanvas(QWidget):
         self.new_pointer_to = -1
         self.pointer_alpha = 0
         self.animation_phase = 0
+        self.slide_active = False
+        self.slide_index = -1
         self.slide_progress = 0.0
         self.drop_progress = 0.0
         self.new_arrow_progress = 0.0
@@ -216,32 +348,44 @@ class LinkedListCanvas(QWidget):
         self.delete_slide_index = -1
         self.delete_slide_progress = 1.0
         self.delete_fade_progress = 0.0
+        self.batch_active = False
+        self.batch_progress = 0.0
     
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if self.batch_active:
+            painter.setOpacity(0.3 + 0.7 * self.batch_progress)
 
         # 绘制参数
-        node_width = 60
-        node_height = 40
-        spacing = 50   # 箭头长度
-        start_x = 40   # 起始 X 坐标
+        node_width = self.node_width
+        node_height = self.node_height
+        spacing = self.spacing   # 箭头长度
+        start_x = self.margin_x - self.scroll_x   # 起始 X 坐标（减去横向滚动量）
         start_y = (self.height() - node_height) // 2 # 垂直居中
 
+        cache = self.render_cache
+        none_font = cache.font("Arial", 10)
+        item_font = cache.font("Arial", 12, bold=True)
+
         # 根据当前参数更新 shift 距离
         self.shift_distance = node_width + spacing
 
         # 空链表显示特殊文字
         if not self.data_items:
-            painter.setFont(QFont("Arial", 14))
+            painter.setFont(cache.font("Arial", 14))
             painter.setPen(Qt.GlobalColor.gray)
             painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Head -> None")
             return
 
-        painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        painter.setFont(item_font)
+
+        # 视口裁剪：只遍历可见范围内的节点
+        first, last = self.visible_node_range()
 
-        # 先绘制所有箭头和节点（考虑滑动偏移）
-        for i, item in enumerate(self.data_items):
+        # 先绘制可见的箭头和节点（考虑滑动偏移）
+        for i in range(first, last):
+            item = self.data_items[i]
             x = start_x + i * (node_width + spacing)
             y = start_y
             
@@ -289,7 +433,7 @@ class LinkedListCanvas(QWidget):
                         self._draw_curved_arrow(painter, x + node_width, start_y + node_height // 2,
                                               start_x + self.new_pointer_to * (node_width + spacing), 
                                               start_y + node_height // 2,
-                                              QColor(128, 128, 128, 255), 3)
+                                              (128, 128, 128, 255), 3)
                     should_draw_arrow = False
             
             # 插入动画定制箭头
@@ -307,27 +451,27 @@ class LinkedListCanvas(QWidget):
                 if self.animation_phase == 0:
                     ex = sx + spacing
                     ey = sy
-                    self._draw_arrow_line(painter, sx, sy, ex, ey, QColor(128, 128, 128, 255), 2)
-                    painter.setFont(QFont("Arial", 10))
+                    self._draw_arrow_line(painter, sx, sy, ex, ey, (128, 128, 128, 255), 2)
+                    painter.setFont(none_font)
                     painter.setPen(Qt.GlobalColor.gray)
                     painter.drawText(ex + 5, ey + 5, "None")
-                    painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+                    painter.setFont(item_font)
                 elif self.animation_phase == 1 and next_exists:
                     ex0, ey0 = sx + spacing, sy
                     ex1, ey1 = next_x, next_y
                     ex = int(ex0 + (ex1 - ex0) * self.new_arrow_progress)
                     ey = int(ey0 + (ey1 - ey0) * self.new_arrow_progress)
-                    self._draw_arrow_line(painter, sx, sy, ex, ey, QColor(128, 128, 128, 255), 2)
+                    self._draw_arrow_line(painter, sx, sy, ex, ey, (128, 128, 128, 255), 2)
                 elif self.animation_phase in (2, 3) and next_exists:
-                    self._draw_arrow_line(painter, sx, sy, next_x, next_y, QColor(128, 128, 128, 255), 2)
+                    self._draw_arrow_line(painter, sx, sy, next_x, next_y, (128, 128, 128, 255), 2)
                 else:
                     ex = sx + spacing
                     ey = sy
-                    self._draw_arrow_line(painter, sx, sy, ex, ey, QColor(128, 128, 128, 255), 2)
-                    painter.setFont(QFont("Arial", 10))
+                    self._draw_arrow_line(painter, sx, sy, ex, ey, (128, 128, 128, 255), 2)
+                    painter.setFont(none_font)
                     painter.setPen(Qt.GlobalColor.gray)
                     painter.drawText(ex + 5, ey + 5, "None")
-                    painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+                    painter.setFont(item_font)
 
             # 前驱箭头
             prev_idx = self.slide_index - 1
@@ -353,11 +497,11 @@ class LinkedListCanvas(QWidget):
                 if self.animation_phase == 2:
                     ex = int(old_ex + (new_ex - old_ex) * self.prev_arrow_progress)
                     ey = int(old_ey + (new_ey - old_ey) * self.prev_arrow_progress)
-                    self._draw_arrow_line(painter, psx, psy, ex, ey, QColor(128, 128, 128, 255), 2)
+                    self._draw_arrow_line(painter, psx, psy, ex, ey, (128, 128, 128, 255), 2)
                 elif self.animation_phase == 3:
-                    self._draw_arrow_line(painter, psx, psy, new_ex, new_ey, QColor(128, 128, 128, 255), 2)
+                    self._draw_arrow_line(painter, psx, psy, new_ex, new_ey, (128, 128, 128, 255), 2)
                 else:
-                    self._draw_arrow_line(painter, psx, psy, old_ex, old_ey, QColor(128, 128, 128, 255), 2)
+                    self._draw_arrow_line(painter, psx, psy, old_ex, old_ey, (128, 128, 128, 255), 2)
             
             # 删除动画定制箭头（前驱 -> 删除节点/后继）
             if self.delete_active and i == self.delete_prev_index:
@@ -378,33 +522,33 @@ class LinkedListCanvas(QWidget):
                     new_ey = psy
 
                 if self.animation_phase == 0:
-                    self._draw_arrow_line(painter, psx, psy, ghost_x, ghost_ey, QColor(128, 128, 128, 255), 2)
+                    self._draw_arrow_line(painter, psx, psy, ghost_x, ghost_ey, (128, 128, 128, 255), 2)
                 elif self.animation_phase == 1:
                     ex = int(ghost_x + (new_ex - ghost_x) * self.delete_arrow_progress)
                     ey = int(ghost_ey + (new_ey - ghost_ey) * self.delete_arrow_progress)
-                    self._draw_arrow_line(painter, psx, psy, ex, ey, QColor(128, 128, 128, 255), 2)
+                    self._draw_arrow_line(painter, psx, psy, ex, ey, (128, 128, 128, 255), 2)
                 else:
-                    self._draw_arrow_line(painter, psx, psy, new_ex, new_ey, QColor(128, 128, 128, 255), 2)
+                    self._draw_arrow_line(painter, psx, psy, new_ex, new_ey, (128, 128, 128, 255), 2)
 
             # 绘制普通箭头
             if should_draw_arrow:
                 if i < len(self.data_items) - 1:
                     # 指向下一个节点
                     self._draw_arrow_line(painter, arrow_start_x, center_y, arrow_end_x, center_y,
-                                          QColor(128, 128, 128, arrow_alpha), arrow_width)
+                                          (128, 128, 128, arrow_alpha), arrow_width)
                 else:
                     # 最后一个节点指向 None（统一箭头规格）
                     self._draw_arrow_line(painter, arrow_start_x, center_y, arrow_end_x, center_y,
-                                          QColor(128, 128, 128, arrow_alpha), arrow_width)
-                    painter.setFont(QFont("Arial", 10))
+                                          (128, 128, 128, arrow_alpha), arrow_width)
+                    painter.setFont(none_font)
                     painter.setPen(Qt.GlobalColor.gray)
                     painter.drawText(arrow_end_x + 5, center_y + 5, "None")
-                    painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+                    painter.setFont(item_font)
 
             # 2. 绘制节点方块
             # 固定颜色：浅蓝色节点，不再使用颜色变化
-            painter.setBrush(QBrush(QColor(173, 216, 230)))
-            painter.setPen(QPen(QColor(152, 180, 212), 2))
+            painter.setBrush(cache.brush((173, 216, 230)))
+            painter.setPen(cache.pen((152, 180, 212), 2))
             
             # 跳过新节点的绘制（插入阶段0），只在阶段1开始下滑时出现
             if not skip_new_node_draw:
@@ -412,9 +556,8 @@ class LinkedListCanvas(QWidget):
             
             # 3. 绘制节点文字
             if not skip_new_node_draw:
-                painter.setPen(Qt.GlobalColor.white)
-                painter.drawText(x, y, node_width, node_height, 
-                               Qt.AlignmentFlag.AlignCenter, str(item))
+                painter.setPen(cache.pen(Qt.GlobalColor.white))
+                cache.draw_label(painter, x, y, node_width, node_height, str(item), item_font)
 
         # 删除动画中的“幽灵”节点：箭头与节点同步淡出
         if self.delete_active and self.delete_node_index >= 0:
@@ -438,28 +581,26 @@ class LinkedListCanvas(QWidget):
                 else:
                     target_x = arrow_sx + spacing
                     target_y = arrow_sy
-                self._draw_arrow_line(painter, arrow_sx, arrow_sy, target_x, target_y, QColor(128, 128, 128, alpha), 2)
+                self._draw_arrow_line(painter, arrow_sx, arrow_sy, target_x, target_y, (128, 128, 128, alpha), 2)
 
-                painter.setBrush(QBrush(QColor(173, 216, 230, alpha)))
-                painter.setPen(QPen(QColor(152, 180, 212, alpha), 2))
+                painter.setBrush(cache.brush((173, 216, 230, alpha)))
+                painter.setPen(cache.pen((152, 180, 212, alpha), 2))
                 painter.drawRect(ghost_x, ghost_y, node_width, node_height)
-                painter.setPen(QColor(255, 255, 255, alpha))
+                painter.setPen(cache.pen((255, 255, 255, alpha)))
                 text_value = str(self.delete_ghost_value) if self.delete_ghost_value is not None else ""
-                painter.drawText(ghost_x, ghost_y, node_width, node_height,
-                                 Qt.AlignmentFlag.AlignCenter, text_value)
+                cache.draw_label(painter, ghost_x, ghost_y, node_width, node_height, text_value, item_font)
 
         # 已移除插入阶段的颜色淡入箭头，改为几何插值绘制（见上方阶段2与阶段3）
     
     def _draw_curved_arrow(self, painter, x1, y1, x2, y2, color, width):
         """绘制弧形箭头（用于显示指针跳过）"""
-        painter.setPen(QPen(color, width))
+        painter.setPen(self.render_cache.pen(color, width))
         
         # 计算控制点，使线条弯曲
         mid_x = (x1 + x2) / 2
         control_y = y1 - 30  # 向上弯曲
         
         # 绘制二次贝塞尔曲线（简化为直线近似）
-        from PyQt6.QtGui import QPainterPath
         path = QPainterPath()
         path.moveTo(x1, y1)
         path.quadTo(mid_x, control_y, x2, y2)
@@ -470,14 +611,9 @@ class LinkedListCanvas(QWidget):
         painter.drawLine(x2 - 10, y2 + 5, x2, y2)
 
     def _draw_arrow_line(self, painter, x1, y1, x2, y2, color, width):
-        """绘制带角度箭头的直线"""
-        painter.setPen(QPen(color, width))
+        """绘制带角度箭头的直线（color 为 RGBA 元组，箭头偏移按方向缓存）"""
+        painter.setPen(self.render_cache.pen(color, width))
         painter.drawLine(x1, y1, x2, y2)
-        angle = math.atan2(y2 - y1, x2 - x1)
-        size = 10
-        ax1 = x2 - size * math.cos(angle - math.pi / 6)
-        ay1 = y2 - size * math.sin(angle - math.pi / 6)
-        ax2 = x2 - size * math.cos(angle + math.pi / 6)
-        ay2 = y2 - size * math.sin(angle + math.pi / 6)
-        painter.drawLine(x2, y2, int(ax1), int(ay1))
-        painter.drawLine(x2, y2, int(ax2), int(ay2))
\ No newline at end of file
+        dx1, dy1, dx2, dy2 = arrow_head_offsets(int(x2 - x1), int(y2 - y1))
+        painter.drawLine(x2, y2, int(x2 + dx1), int(y2 + dy1))
+        painter.drawLine(x2, y2, int(x2 + dx2), int(y2 + dy2))
\ No newline at end of file
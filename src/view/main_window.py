@@ -29,7 +29,7 @@ class MainWindow(QMainWindow):
         # 初始化 Queue 后端
         self.queue = Queue(capacity=10) # 容量设为10
         # 初始化 LinkedList 后端
-        self.linked_list = LinkedList() # 无容量限制
+        self.linked_list = LinkedList(doubly=True, indexed=True) # 无容量限制；双向 + 值索引，唯一值可直接摘除
         
         # 初始化界面
         self.setWindowTitle("数据结构可视化系统")
@@ -82,13 +82,16 @@ class MainWindow(QMainWindow):
 
         # 按钮组
         self.btn_push = QPushButton("入栈 (Push)")
+        self.btn_push_many = QPushButton("批量入栈 (逗号分隔)")
         self.btn_pop = QPushButton("出栈 (Pop)")
         
         # 设置样式
         self.btn_push.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px;")
+        self.btn_push_many.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px;")
         self.btn_pop.setStyleSheet("background-color: #F44336; color: white; padding: 8px;")
 
         control_layout.addWidget(self.btn_push)
+        control_layout.addWidget(self.btn_push_many)
         control_layout.addWidget(self.btn_pop)
 
         # 容量调整输入框和按钮
@@ -124,6 +127,7 @@ class MainWindow(QMainWindow):
         self.stack_controller = StackController(self.stack, self.canvas,
                                                 self.stack_input_field, self.stack_status_message, self.stack_capacity_input)
         self.btn_push.clicked.connect(self.stack_controller.on_push_click)
+        self.btn_push_many.clicked.connect(self.stack_controller.on_push_many_click)
         self.btn_pop.clicked.connect(self.stack_controller.on_pop_click)
         self.btn_set_capacity.clicked.connect(self.stack_controller.on_set_capacity_click)
         self.btn_increase_capacity.clicked.connect(self.stack_controller.on_increase_capacity_click)
@@ -152,12 +156,15 @@ class MainWindow(QMainWindow):
 
         # 按钮组
         self.btn_enqueue = QPushButton("入队 (Enqueue)")
+        self.btn_enqueue_many = QPushButton("批量入队 (逗号分隔)")
         self.btn_dequeue = QPushButton("出队 (Dequeue)")
         # 设置样式
         self.btn_enqueue.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px;")
+        self.btn_enqueue_many.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px;")
         self.btn_dequeue.setStyleSheet("background-color: #F44336; color: white; padding: 8px;")
 
         control_layout.addWidget(self.btn_enqueue)
+        control_layout.addWidget(self.btn_enqueue_many)
         control_layout.addWidget(self.btn_dequeue)
 
         # 容量调整输入框和按钮
@@ -192,6 +199,7 @@ class MainWindow(QMainWindow):
         self.queue_controller = QueueController(self.queue, self.queue_canvas,self.queue_input_field, 
                                                 self.queue_status_message, self.queue_capacity_input)
         self.btn_enqueue.clicked.connect(self.queue_controller.on_enqueue_click)
+        self.btn_enqueue_many.clicked.connect(self.queue_controller.on_enqueue_many_click)
         self.btn_dequeue.clicked.connect(self.queue_controller.on_dequeue_click)
         self.btn_set_capacity.clicked.connect(self.queue_controller.on_set_capacity_click)
         self.btn_increase_capacity.clicked.connect(self.queue_controller.on_increase_capacity_click)
@@ -227,29 +235,35 @@ class MainWindow(QMainWindow):
 
         # 按钮组
         self.btn_ll_append = QPushButton("尾部添加 (Append)")
+        self.btn_ll_extend = QPushButton("尾部批量添加 (逗号分隔)")
         self.btn_ll_prepend = QPushButton("头部添加 (Prepend)")
         self.btn_ll_insert_at = QPushButton("指定位置插入 (Insert At)")
         self.btn_ll_delete = QPushButton("按值删除 (Delete)")
         self.btn_ll_delete_head = QPushButton("头部删除 (Delete Head)")
         self.btn_ll_delete_tail = QPushButton("尾部删除 (Delete Tail)")
         self.btn_ll_delete_at = QPushButton("指定位置删除 (Delete At)")
+        self.btn_ll_skip_animation = QPushButton("跳过动画 (Skip)")
         
         # 按钮样式 (与Stack/Queue一致的蓝色配色)
         self.btn_ll_append.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px;")
+        self.btn_ll_extend.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px;")
         self.btn_ll_prepend.setStyleSheet("background-color: #4CAF50; color: white; padding: 8px;")
         self.btn_ll_insert_at.setStyleSheet("background-color: #2196F3; color: white; padding: 8px;")
         self.btn_ll_delete.setStyleSheet("background-color: #F44336; color: white; padding: 8px;")
         self.btn_ll_delete_head.setStyleSheet("background-color: #FF5722; color: white; padding: 8px;")
         self.btn_ll_delete_tail.setStyleSheet("background-color: #FF5722; color: white; padding: 8px;")
         self.btn_ll_delete_at.setStyleSheet("background-color: #E91E63; color: white; padding: 8px;")
+        self.btn_ll_skip_animation.setStyleSheet("background-color: #9E9E9E; color: white; padding: 8px;")
 
         control_layout.addWidget(self.btn_ll_append)
+        control_layout.addWidget(self.btn_ll_extend)
         control_layout.addWidget(self.btn_ll_prepend)
         control_layout.addWidget(self.btn_ll_insert_at)
         control_layout.addWidget(self.btn_ll_delete)
         control_layout.addWidget(self.btn_ll_delete_head)
         control_layout.addWidget(self.btn_ll_delete_tail)
         control_layout.addWidget(self.btn_ll_delete_at)
+        control_layout.addWidget(self.btn_ll_skip_animation)
 
         # 状态栏
         self.ll_status = QLabel("准备就绪")
@@ -264,12 +278,14 @@ class MainWindow(QMainWindow):
             self.linked_list, self.ll_canvas, self.ll_input_field, self.ll_status, self.ll_position_input
         )
         self.btn_ll_append.clicked.connect(self.ll_controller.on_append_click)
+        self.btn_ll_extend.clicked.connect(self.ll_controller.on_extend_click)
         self.btn_ll_prepend.clicked.connect(self.ll_controller.on_prepend_click)
         self.btn_ll_insert_at.clicked.connect(self.ll_controller.on_insert_at_click)
         self.btn_ll_delete.clicked.connect(self.ll_controller.on_delete_click)
         self.btn_ll_delete_head.clicked.connect(self.ll_controller.on_delete_head_click)
         self.btn_ll_delete_tail.clicked.connect(self.ll_controller.on_delete_tail_click)
         self.btn_ll_delete_at.clicked.connect(self.ll_controller.on_delete_at_click)
+        self.btn_ll_skip_animation.clicked.connect(self.ll_controller.on_skip_animation_click)
 
         return page
     
@@ -282,4 +298,9 @@ class MainWindow(QMainWindow):
         self.game_controller = GameController(view)
 
         return view
+
+    def closeEvent(self, event):
+        """关闭窗口时停止游戏的后台预加载线程"""
+        self.game_controller.shutdown()
+        super().closeEvent(event)
     
\ No newline at end of file
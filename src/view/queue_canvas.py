@@ -1,12 +1,19 @@
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush
+from PyQt6.QtGui import QPainter, QColor
 from PyQt6.QtCore import Qt
+from src.view.viewport import SlotViewport
+from src.view.render_cache import shared_render_cache, INVALIDATING_EVENTS
+from src.model.events import ChangeEvent, CAPACITY_CHANGED, apply_to_list
 
 class QueueCanvas(QWidget):
     def __init__(self, parent=None, capacity=10):
         super().__init__(parent)
         self.data_items = []
         self.capacity = capacity
+        # 视口：只绘制屏幕内的槽位，支持滚动与缩放
+        self.slot_view = SlotViewport()
+        # 共享的字体/画笔/文字排版缓存
+        self.render_cache = shared_render_cache()
         # 背景色
         self.setAutoFillBackground(True)
         p = self.palette()
@@ -14,25 +21,61 @@ class QueueCanvas(QWidget):
         self.setPalette(p)
 
     #修改容量
-    def set_capacity(self, new_capacity: int):
-        self.capacity = new_capacity
-        self.update()  # 触发重绘
-
-    def update_data(self, items: list):
+    def update_data(self, items):
+        """更新数据并触发重绘（items 可以是列表或队列的只读视图）"""
         self.data_items = items
         self.update()
 
+    def apply_change(self, event: ChangeEvent):
+        """订阅 Queue 的变更事件（持有的是实时视图时无需再同步数据，只需重绘）"""
+        if event.kind == CAPACITY_CHANGED:
+            self.capacity = event.capacity
+        elif isinstance(self.data_items, list):
+            apply_to_list(self.data_items, event)
+        self.update()
+
+    def wheelEvent(self, event):
+        """滚轮左右滚动槽位，Ctrl + 滚轮缩放"""
+        delta = event.angleDelta().y()
+        if delta == 0:
+            return
+        if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.slot_view.zoom_by(1.25 if delta > 0 else 0.8)
+        else:
+            # 向上滚动查看更靠近队头的槽位
+            self.slot_view.scroll(-3 if delta > 0 else 3)
+        self.update()
+
+    def mouseDoubleClickEvent(self, event):
+        """双击恢复默认缩放并重新跟随队尾"""
+        self.slot_view.reset()
+        self.update()
+
+    def changeEvent(self, event):
+        """字体或 DPI 变化时让已缓存的排版结果失效"""
+        if event.type() in INVALIDATING_EVENTS:
+            self.render_cache.invalidate()
+        super().changeEvent(event)
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         # === 1. 参数设置 ===
-        box_width = 60  # 队列方块通常画小一点，防止太长
-        box_height = 60
+        zoom = self.slot_view.zoom
+        box_width = max(int(60 * zoom), 12)  # 队列方块通常画小一点，防止太长
+        box_height = max(int(60 * zoom), 12)
         spacing = 0
+        margin = 80  # 左右留给省略提示的空白
+        count = len(self.data_items)
+
+        # 计算可见槽位范围，只绘制屏幕内的部分
+        visible = (self.width() - 2 * margin) // (box_width + spacing)
+        anchor = min(count, self.capacity - 1)  # 跟随队尾后的第一个空位
+        first, last = self.slot_view.visible_range(self.capacity, visible, anchor)
         
-        # 计算整个队列通道的总长度
-        total_width = self.capacity * (box_width + spacing)
+        # 计算可见通道的总长度
+        total_width = (last - first) * (box_width + spacing)
         
         # 居中计算：起点的 X 坐标
         start_x = (self.width() - total_width) // 2
@@ -40,7 +83,8 @@ class QueueCanvas(QWidget):
         base_y = (self.height() - box_height) // 2
 
         # === 2. 画上下两条轨道 (平行线) ===
-        painter.setPen(QPen(Qt.GlobalColor.gray, 2))
+        cache = self.render_cache
+        painter.setPen(cache.pen(Qt.GlobalColor.gray, 2))
         # 上轨道
         painter.drawLine(start_x -1, base_y - 2, 
                          start_x + total_width +1, base_y - 2)
@@ -48,35 +92,51 @@ class QueueCanvas(QWidget):
         painter.drawLine(start_x -1, base_y + box_height + 2, 
                          start_x + total_width +1, base_y + box_height + 2)
         
-        # 画“队头”和“队尾”的文字标记
-        painter.setFont(QFont("Arial", 10))
-        painter.drawText(start_x , base_y -20, "队头\n(Head)")
-        painter.drawText(start_x + total_width - 40, base_y -20, "队尾\n(Tail)")
+        # 画“队头”和“队尾”的文字标记（对应端在可见范围内时）
+        painter.setFont(cache.font("Arial", 10))
+        if first == 0:
+            painter.drawText(start_x , base_y -20, "队头\n(Head)")
+        if last == self.capacity:
+            painter.drawText(start_x + total_width - 40, base_y -20, "队尾\n(Tail)")
 
         # === 3. 画虚线空位 (占位符) ===
-        painter.setPen(QPen(QColor(200, 200, 200), 1, Qt.PenStyle.DashLine))
+        painter.setPen(cache.pen((200, 200, 200), 1, Qt.PenStyle.DashLine))
         painter.setBrush(Qt.BrushStyle.NoBrush)
-        for i in range(self.capacity):
+        for i in range(max(first, count), last):
             # 公式：x 随着 i 变大，向右移动
-            slot_x = start_x + i * (box_width + spacing)
+            slot_x = start_x + (i - first) * (box_width + spacing)
             painter.drawRect(slot_x, base_y, box_width, box_height)
 
-        # === 4.画真实数据 ===
-        painter.setBrush(QBrush(QColor(173, 216, 230))) # 浅蓝色
-        painter.setPen(QPen(QColor(152, 180, 212), 1))
-        painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        # === 4.画可见范围内的真实数据 ===
+        item_font = cache.font("Arial", max(int(12 * zoom), 6), bold=True)
+        draw_text = box_width >= 20  # 方块太小就不画文字
+        box_brush = cache.brush((173, 216, 230))  # 浅蓝色
+        box_pen = cache.pen((152, 180, 212), 1)
+        text_pen = cache.pen(Qt.GlobalColor.white)
 
-        for i, item in enumerate(self.data_items):
+        for i in range(first, min(count, last)):
+            item = self.data_items[i]
             # 同样是从左往右画
-            x = start_x + i * (box_width + spacing)
+            x = start_x + (i - first) * (box_width + spacing)
             
+            painter.setBrush(box_brush)
+            painter.setPen(box_pen)
             painter.drawRect(x, base_y, box_width, box_height)
-            painter.setPen(Qt.GlobalColor.white)
-            painter.drawText(x, base_y, box_width, box_height, 
-                           Qt.AlignmentFlag.AlignCenter, str(item))
+            if draw_text:
+                painter.setPen(text_pen)
+                cache.draw_label(painter, x, base_y, box_width, box_height, str(item), item_font)
+
+        # === 5. 画省略提示：可见范围两侧还有多少元素 ===
+        painter.setPen(cache.pen(Qt.GlobalColor.darkGray))
+        painter.setFont(cache.font("Arial", 10))
+        if first > 0:
+            painter.drawText(start_x - margin, base_y, margin - 4, box_height,
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                             f"... {min(first, count)} 个")
+        if last < self.capacity:
+            painter.drawText(start_x + total_width + 4, base_y, margin - 4, box_height,
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                             f"{max(0, count - last)} 个 ...")
 
         # === 紧挨队列下方居中显示容量 ===
-        painter.setPen(QPen(Qt.GlobalColor.darkGray))
-        painter.setFont(QFont("Arial", 10))
-        painter.drawText(self.width() // 2 - 50, base_y + box_height + 30, f"队列容量: {self.capacity} \n当前数量: {len(self.data_items)}")
-        
\ No newline at end of file
+        painter.drawText(self.width() // 2 - 50, base_y + box_height + 30, f"队列容量: {self.capacity} \n当前数量: {count}")
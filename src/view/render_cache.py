@@ -0,0 +1,103 @@
+import math
+from collections import OrderedDict
+from functools import lru_cache
+from PyQt6.QtGui import QColor, QFont, QPen, QBrush, QStaticText, QTransform
+from PyQt6.QtCore import Qt, QEvent
+
+# 会让已排版文字失效的事件（字体变化、DPI 变化）
+INVALIDATING_EVENTS = {QEvent.Type.FontChange}
+if hasattr(QEvent.Type, 'DevicePixelRatioChange'):  # Qt 6.6+
+    INVALIDATING_EVENTS.add(QEvent.Type.DevicePixelRatioChange)
+
+class RenderCache:
+    """画布共享的绘制资源缓存
+
+    QFont / QPen / QBrush 按参数缓存，文字标签按 (文字, 字体) 缓存为
+    预排版的 QStaticText，避免每帧为每个元素重新创建对象、重新排版。
+    enabled=False 时每次都新建对象（仅用于基准对照）。
+    """
+    def __init__(self, max_labels: int = 4096, enabled: bool = True):
+        self.enabled = enabled
+        self.max_labels = max_labels
+        self._fonts = {}
+        self._pens = {}
+        self._brushes = {}
+        self._labels = OrderedDict()  # LRU：(text, font_key) -> QStaticText
+
+    def font(self, family: str, size: int, bold: bool = False) -> QFont:
+        key = (family, size, bold)
+        font = self._fonts.get(key) if self.enabled else None
+        if font is None:
+            font = QFont(family, size, QFont.Weight.Bold if bold else QFont.Weight.Normal)
+            if self.enabled:
+                self._fonts[key] = font
+        return font
+
+    def pen(self, color, width: int = 1, style=Qt.PenStyle.SolidLine) -> QPen:
+        """color 为 (r, g, b[, a]) 元组或 Qt.GlobalColor"""
+        key = (color, width, style)
+        pen = self._pens.get(key) if self.enabled else None
+        if pen is None:
+            pen = QPen(_to_color(color), width, style)
+            if self.enabled:
+                self._pens[key] = pen
+        return pen
+
+    def brush(self, color) -> QBrush:
+        brush = self._brushes.get(color) if self.enabled else None
+        if brush is None:
+            brush = QBrush(_to_color(color))
+            if self.enabled:
+                self._brushes[color] = brush
+        return brush
+
+    def label(self, text: str, font: QFont) -> QStaticText:
+        """获取按字体预排版好的静态文字"""
+        key = (text, font.key())
+        static = self._labels.get(key) if self.enabled else None
+        if static is not None:
+            self._labels.move_to_end(key)
+            return static
+        static = QStaticText(text)
+        static.setTextFormat(Qt.TextFormat.PlainText)
+        static.prepare(QTransform(), font)
+        if self.enabled:
+            self._labels[key] = static
+            if len(self._labels) > self.max_labels:
+                self._labels.popitem(last=False)
+        return static
+
+    def draw_label(self, painter, x, y, w, h, text: str, font: QFont) -> None:
+        """在矩形内居中绘制文字（效果同 drawText + AlignCenter）"""
+        painter.setFont(font)
+        static = self.label(text, font)
+        size = static.size()
+        painter.drawStaticText(int(x + (w - size.width()) / 2), int(y + (h - size.height()) / 2), static)
+
+    def invalidate(self) -> None:
+        """字体或 DPI 变化后清空缓存"""
+        self._fonts.clear()
+        self._pens.clear()
+        self._brushes.clear()
+        self._labels.clear()
+
+def _to_color(color) -> QColor:
+    if isinstance(color, tuple):
+        return QColor(*color)
+    return QColor(color)
+
+@lru_cache(maxsize=1024)
+def arrow_head_offsets(dx: int, dy: int, size: int = 10):
+    """计算箭头两翼相对箭尖的偏移（按方向缓存三角函数结果）"""
+    angle = math.atan2(dy, dx)
+    return (-size * math.cos(angle - math.pi / 6), -size * math.sin(angle - math.pi / 6),
+            -size * math.cos(angle + math.pi / 6), -size * math.sin(angle + math.pi / 6))
+
+_shared_cache = None
+
+def shared_render_cache() -> RenderCache:
+    """所有画布共用的缓存实例"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = RenderCache()
+    return _shared_cache
@@ -1,6 +1,9 @@
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush
+from PyQt6.QtGui import QPainter, QColor
 from PyQt6.QtCore import Qt
+from src.view.viewport import SlotViewport
+from src.view.render_cache import shared_render_cache, INVALIDATING_EVENTS
+from src.model.events import ChangeEvent, CAPACITY_CHANGED, apply_to_list
 
 class StackCanvas(QWidget):
     """数据结构专用画布：负责把数据画成方块"""
@@ -8,6 +11,10 @@ class StackCanvas(QWidget):
         super().__init__(parent)
         self.data_items = []  # 存放要画的数据
         self.capacity = capacity
+        # 视口：只绘制屏幕内的槽位，支持滚动与缩放
+        self.slot_view = SlotViewport()
+        # 共享的字体/画笔/文字排版缓存
+        self.render_cache = shared_render_cache()
         
         # 设置浅浅浅蓝色背景
         self.setAutoFillBackground(True)
@@ -16,68 +23,118 @@ class StackCanvas(QWidget):
         self.setPalette(p)
 
     #修改容量
-    def set_capacity(self, new_capacity: int):
-        self.capacity = new_capacity
-        self.update()  # 触发重绘
-
     def update_data(self, items: list):
         """更新数据并触发重绘"""
         self.data_items = items
         self.update()  # 这一步会触发 paintEvent
 
+    def apply_change(self, event: ChangeEvent):
+        """订阅 Stack 的变更事件：只把变化部分应用到本地数据，不再整体复制"""
+        if event.kind == CAPACITY_CHANGED:
+            self.capacity = event.capacity
+        else:
+            apply_to_list(self.data_items, event)
+        self.update()
+
+    def wheelEvent(self, event):
+        """滚轮滚动槽位，Ctrl + 滚轮缩放"""
+        delta = event.angleDelta().y()
+        if delta == 0:
+            return
+        if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            self.slot_view.zoom_by(1.25 if delta > 0 else 0.8)
+        else:
+            # 向上滚动查看更靠近栈顶的槽位
+            self.slot_view.scroll(3 if delta > 0 else -3)
+        self.update()
+
+    def mouseDoubleClickEvent(self, event):
+        """双击恢复默认缩放并重新跟随栈顶"""
+        self.slot_view.reset()
+        self.update()
+
+    def changeEvent(self, event):
+        """字体或 DPI 变化时让已缓存的排版结果失效"""
+        if event.type() in INVALIDATING_EVENTS:
+            self.render_cache.invalidate()
+        super().changeEvent(event)
+
     def paintEvent(self, event):
-        """绘制画布内容"""
+        """绘制画布内容（只绘制可见范围内的槽位）"""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing) # 图形抗锯齿
 
-        # 定义方块参数
-        box_width = 80
-        box_height = 40
+        # 定义方块参数（随缩放变化）
+        zoom = self.slot_view.zoom
+        box_width = max(int(80 * zoom), 20)
+        box_height = max(int(40 * zoom), 4)
         start_x = (self.width() - box_width) // 2
         # 从窗口底部往上画（模拟栈的物理堆叠）
         base_y = self.height() - 50 
+        count = len(self.data_items)
+
+        # 计算可见槽位范围：顶部留出一行写“还有 N 个”
+        visible = (base_y - 30) // box_height + 1
+        anchor = min(count, self.capacity - 1)  # 跟随栈顶上方的第一个空位
+        first, last = self.slot_view.visible_range(self.capacity, visible, anchor)
 
         #画虚线空位 (占位符)
-        painter.setPen(QPen(QColor(200, 200, 200), 1, Qt.PenStyle.DashLine))
+        cache = self.render_cache
+        painter.setPen(cache.pen((200, 200, 200), 1, Qt.PenStyle.DashLine))
         painter.setBrush(Qt.BrushStyle.NoBrush)
-        for i in range(self.capacity - len(self.data_items)):
-            x = start_x
-            y = base_y - ((len(self.data_items) + i) * box_height)
-            painter.drawRect(x, y, box_width, box_height)
+        for i in range(max(first, count), last):
+            y = base_y - ((i - first) * box_height)
+            painter.drawRect(start_x, y, box_width, box_height)
 
-        # 遍历数据画图
-        for i, item in enumerate(self.data_items):
+        # 遍历可见数据画图
+        item_font = cache.font("Arial", max(int(12 * zoom), 6), bold=True)
+        draw_text = box_height >= 12  # 方块太小就不画文字
+        box_brush = cache.brush((173, 216, 230))  # 浅蓝色
+        box_pen = cache.pen((152, 180, 212), 1)   # 边框颜色
+        text_pen = cache.pen(Qt.GlobalColor.white)
+        for i in range(first, min(count, last)):
+            item = self.data_items[i]
             # 计算坐标：栈底在下，新元素往上摞
             x = start_x
-            y = base_y - (i * (box_height)) 
+            y = base_y - ((i - first) * box_height)
 
             # 1. 画方块背景
-            painter.setBrush(QBrush(QColor(173, 216, 230)))  # 浅蓝色
-            painter.setPen(QPen(QColor(152, 180, 212), 1))  # 边框颜色
+            painter.setBrush(box_brush)
+            painter.setPen(box_pen)
             painter.drawRect(x, y, box_width, box_height)
 
-            # 2. 画文字
-            painter.setPen(Qt.GlobalColor.white)
-            painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-            painter.drawText(x, y, box_width, box_height, Qt.AlignmentFlag.AlignCenter, str(item))
+            # 2. 画文字（使用缓存的预排版文字）
+            if draw_text:
+                painter.setPen(text_pen)
+                cache.draw_label(painter, x, y, box_width, box_height, str(item), item_font)
             
         # 3. 画一个底座
         painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.setPen(QPen(Qt.GlobalColor.gray, 2))
+        painter.setPen(cache.pen(Qt.GlobalColor.gray, 2))
         # 画个 U 型开口
-        container_width = box_width + 4
-        container_height = (self.capacity * box_height+4)
+        container_height = ((last - first) * box_height + 4)
         # 左竖线
         painter.drawLine(start_x - 2, base_y + box_height, start_x - 2, base_y+ box_height - container_height)
         # 右竖线
         painter.drawLine(start_x + box_width + 2, base_y + box_height, start_x + box_width + 2, base_y+ box_height - container_height)
-        # 底横线
-        painter.drawLine(start_x - 2, base_y + box_height, start_x + box_width + 2, base_y + box_height)
+        # 底横线（栈底不在可见范围内时不画）
+        if first == 0:
+            painter.drawLine(start_x - 2, base_y + box_height, start_x + box_width + 2, base_y + box_height)
+
+        # 4. 画省略提示：可见范围之外还有多少元素/槽位
+        painter.setPen(cache.pen(Qt.GlobalColor.darkGray))
+        painter.setFont(cache.font("Arial", 10))
+        if last < self.capacity:
+            hidden_items = max(0, count - last)
+            top_y = base_y - (last - first - 1) * box_height - 24
+            painter.drawText(start_x - 60, top_y, box_width + 120, 20, Qt.AlignmentFlag.AlignCenter,
+                             f"... 上方还有 {hidden_items} 个元素 / {self.capacity - last} 个槽位")
+        if first > 0:
+            painter.drawText(start_x - 60, base_y + box_height + 4, box_width + 120, 20, Qt.AlignmentFlag.AlignCenter,
+                             f"... 下方还有 {first} 个槽位")
 
         #画容量显示
-        painter.setPen(QPen(Qt.GlobalColor.darkGray))
-        painter.setFont(QFont("Arial", 10))
         text_x = start_x - 110
         text_width = 100
         text_y=base_y
-        painter.drawText(text_x, text_y, text_width, 40, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop, f"容量: {self.capacity}\n当前数量: {len(self.data_items)}")
+        painter.drawText(text_x, text_y, text_width, 40, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop, f"容量: {self.capacity}\n当前数量: {count}")
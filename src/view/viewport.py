@@ -0,0 +1,42 @@
+class SlotViewport:
+    """一维槽位视口（不依赖 Qt）
+
+    负责缩放比例、滚动偏移以及“跟随”模式，并根据屏幕能容纳的槽位数
+    算出真正需要绘制的下标范围，使重绘开销只与屏幕大小有关。
+    """
+    MIN_ZOOM = 0.25
+    MAX_ZOOM = 3.0
+
+    def __init__(self):
+        self.zoom = 1.0
+        self.offset = 0      # 第一个可见槽位的下标
+        self.follow = True   # 跟随模式：自动保持插入端可见
+
+    def scroll(self, steps: int) -> None:
+        """手动滚动若干个槽位，并退出跟随模式"""
+        self.offset += steps
+        self.follow = False
+
+    def zoom_by(self, factor: float) -> None:
+        self.zoom = min(self.MAX_ZOOM, max(self.MIN_ZOOM, self.zoom * factor))
+
+    def reset(self) -> None:
+        self.zoom = 1.0
+        self.offset = 0
+        self.follow = True
+
+    def visible_range(self, total: int, visible: int, anchor: int = 0):
+        """返回可见的 [first, last) 下标范围
+
+        total: 槽位总数；visible: 屏幕能容纳的槽位数；
+        anchor: 跟随模式下需要保持可见的下标（如栈顶/队尾的下一个空位）
+        """
+        visible = max(1, visible)
+        if total <= visible:
+            self.offset = 0
+            return 0, total
+        max_first = total - visible
+        first = anchor - visible + 1 if self.follow else self.offset
+        first = min(max_first, max(0, first))
+        self.offset = first
+        return first, first + visible
@@ -7,7 +7,20 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.model.stack import Stack
 from src.model.queue import Queue
-from src.model.exceptions import StructureFullError, StructureEmptyError, StructureValueError
+from src.model.linked_list import LinkedList, Node, create_linked_list
+from src.model.exceptions import StructureFullError, StructureEmptyError, StructureValueError, MapLoadError, ReplayFormatError
+from src.model.events import apply_to_list, CAPACITY_CHANGED, INSERTED, REMOVED
+from src.view.animation import Timeline, AnimationClock, ease_in_out
+from src.view.viewport import SlotViewport
+from src.game.game_model import GameModel, BLOCKED, DOOR, INTERACTIVE, OUT_OF_BOUNDS
+from src.game.grid import LIST, ARRAY, COMPACT, changed_rows, copy_grid, grid_from_cells
+from src.game.level_format import parse_text, parse_file, encode, decode, load_level_file, compiled_path
+from src.game.game_loop import FixedTimestep, RateCounter, interpolate
+from src.game import game_engine
+from src.game.game_engine import GameEngine, UP, DOWN, LEFT, RIGHT
+from src.game.replay import InputRecorder, start_engine, save_recording, load_recording, replay
+from src.game.solver import solve_level, path_to_moves
+from src.game.map_generator import MapSpec, generate_text, write_map
 
 # 栈 (Stack) 的测试 
 
@@ -90,6 +103,24 @@ def test_stack_resize_fail():
     assert s.capacity() == 5
     assert s.size() == 5
 
+def test_stack_bulk_operations(empty_stack):
+    """测试批量入栈/出栈"""
+    empty_stack.push_many([1, 2])
+    assert empty_stack.get_items() == [1, 2]
+
+    # 剩余容量不足：整体失败，不写入任何元素
+    with pytest.raises(StructureFullError):
+        empty_stack.push_many([3, 4])
+    assert empty_stack.get_items() == [1, 2]
+
+    empty_stack.extend([3])
+    assert empty_stack.pop_many(2) == [3, 2]  # 栈顶在前
+    with pytest.raises(StructureEmptyError):
+        empty_stack.pop_many(2)
+    assert empty_stack.pop_many(0) == []
+    assert empty_stack.drain() == [1]
+    assert empty_stack.drain(5) == []
+
 #  队列 (Queue) 的测试 
 
 @pytest.fixture
@@ -109,4 +140,823 @@ def test_queue_full_error(empty_queue):
     empty_queue.enqueue(3)
     
     with pytest.raises(StructureFullError):
-        empty_queue.enqueue(4)
\ No newline at end of file
+        empty_queue.enqueue(4)
+
+def test_queue_wraparound(empty_queue):
+    """测试环形缓冲区回绕后顺序依然正确"""
+    for round_ in range(5):
+        empty_queue.enqueue(round_)
+        empty_queue.enqueue(round_ + 100)
+        assert empty_queue.dequeue() == round_
+        assert empty_queue.dequeue() == round_ + 100
+    assert empty_queue.is_empty() is True
+
+    with pytest.raises(StructureEmptyError):
+        empty_queue.peek()
+
+def test_queue_view_is_live(empty_queue):
+    """测试有序视图不拷贝数据，并随出入队实时变化"""
+    view = empty_queue.view()
+    empty_queue.enqueue("A")
+    empty_queue.enqueue("B")
+    empty_queue.dequeue()
+    empty_queue.enqueue("C")
+    empty_queue.enqueue("D")  # 此时已回绕
+    assert len(view) == 3
+    assert list(view) == ["B", "C", "D"]
+    assert view[0] == "B" and view[-1] == "D"
+    assert empty_queue.get_items() == ["B", "C", "D"]
+
+def test_queue_resize_after_wraparound(empty_queue):
+    """测试回绕状态下扩容/缩容保持顺序"""
+    for item in "ABC":
+        empty_queue.enqueue(item)
+    empty_queue.dequeue()
+    empty_queue.enqueue("D")  # 缓冲区内为 D B C，队头在 B
+
+    empty_queue.set_capacity(5)
+    assert empty_queue.get_items() == ["B", "C", "D"]
+    empty_queue.enqueue("E")
+    empty_queue.enqueue("F")
+    assert empty_queue.is_full() is True
+
+    for _ in range(2):
+        empty_queue.dequeue()
+    empty_queue.set_capacity(3)
+    assert empty_queue.capacity() == 3
+    assert empty_queue.get_items() == ["D", "E", "F"]
+
+    with pytest.raises(StructureValueError):
+        empty_queue.set_capacity(2)
+    assert empty_queue.get_items() == ["D", "E", "F"]
+
+def test_queue_shrink_after_drain():
+    """测试出队清空后缩容：队头恰好等于新容量时不能越界"""
+    q = Queue(10)
+    for i in range(5):
+        q.enqueue(i)
+    for _ in range(5):
+        q.dequeue()
+    q.set_capacity(5)
+    q.enqueue("x")
+    assert q.peek() == "x"
+    assert q.dequeue() == "x"
+    for item in "abcde":  # 写满后回绕
+        q.enqueue(item)
+    assert q.is_full() and q.get_items() == list("abcde")
+    assert q.dequeue() == "a"
+    q.enqueue("f")
+    assert q.peek() == "b" and q.get_items() == list("bcdef")
+
+def test_queue_bulk_operations_wraparound():
+    """测试批量入队/出队跨越缓冲区末尾"""
+    q = Queue(capacity=5)
+    q.enqueue_many("ABC")
+    assert q.dequeue_many(2) == ["A", "B"]
+    q.enqueue_many("DEFG")  # 写入分成两段
+    assert q.get_items() == ["C", "D", "E", "F", "G"]
+
+    with pytest.raises(StructureFullError):
+        q.enqueue_many("H")
+    with pytest.raises(StructureEmptyError):
+        q.dequeue_many(6)
+
+    assert q.drain(4) == ["C", "D", "E", "F"]  # 读取也跨越末尾
+    q.extend("XY")
+    assert q.drain() == ["G", "X", "Y"]
+    assert q.is_empty() is True
+    assert q._buffer == [None] * 5  # 出队后不保留引用
+
+#  链表 (LinkedList) 的测试 
+
+def assert_list_consistent(ll):
+    """校验 head/tail/prev 指针与 size 一致"""
+    items = ll.get_items()
+    assert ll.size() == len(items)
+    assert ll.get_items_reversed() == items[::-1]
+    if not isinstance(ll, LinkedList):
+        return
+    if not items:
+        assert ll.head is None and ll.tail is None
+        return
+    assert ll.tail.data == items[-1]
+    assert ll.tail.next is None
+    if ll.is_doubly():
+        assert ll.head.prev is None
+
+@pytest.fixture(params=[("node", False), ("node", True), ("pool", False), ("pool", True)],
+                ids=["singly", "doubly", "pool", "pool-doubly"])
+def linked_list(request):
+    storage, doubly = request.param
+    return create_linked_list(storage, doubly=doubly)
+
+def test_linked_list_append_keeps_tail(linked_list):
+    for i in range(5):
+        linked_list.append(i)
+        assert linked_list.get_items_reversed()[0] == i
+    assert linked_list.get_items() == [0, 1, 2, 3, 4]
+    assert_list_consistent(linked_list)
+
+def test_linked_list_prepend_and_insert_at(linked_list):
+    linked_list.prepend("B")
+    linked_list.prepend("A")
+    linked_list.insert_at(2, "D")  # 尾部位置插入
+    linked_list.insert_at(2, "C")
+    assert linked_list.get_items() == ["A", "B", "C", "D"]
+    assert_list_consistent(linked_list)
+
+    with pytest.raises(StructureValueError):
+        linked_list.insert_at(10, "X")
+
+def test_linked_list_delete_tail(linked_list):
+    for i in range(3):
+        linked_list.append(i)
+    assert linked_list.delete_tail() == 2
+    assert_list_consistent(linked_list)
+    assert linked_list.delete_tail() == 1
+    assert linked_list.delete_tail() == 0
+    assert_list_consistent(linked_list)
+
+    with pytest.raises(StructureEmptyError):
+        linked_list.delete_tail()
+
+def test_linked_list_delete_at_and_by_value(linked_list):
+    for ch in "abcde":
+        linked_list.append(ch)
+    assert linked_list.delete_at(4) == "e"  # 删除尾节点后 tail 前移
+    assert_list_consistent(linked_list)
+    assert linked_list.delete_at(1) == "b"
+    assert linked_list.delete("d") is True  # 按值删除当前尾节点
+    assert linked_list.delete("z") is False
+    assert linked_list.get_items() == ["a", "c"]
+    assert_list_consistent(linked_list)
+
+    linked_list.append("f")  # 删除后继续尾插仍然正确
+    assert linked_list.get_items() == ["a", "c", "f"]
+    assert_list_consistent(linked_list)
+
+def test_linked_list_extend_and_drain(linked_list):
+    linked_list.extend([])
+    linked_list.append(0)
+    linked_list.extend(range(1, 5))
+    assert linked_list.get_items() == [0, 1, 2, 3, 4]
+    assert_list_consistent(linked_list)
+
+    assert linked_list.drain(2) == [0, 1]
+    linked_list.extend("ab")
+    linked_list.insert_at(3, "x")
+    assert linked_list.get_items() == [2, 3, 4, "x", "a", "b"]
+    assert_list_consistent(linked_list)
+    assert linked_list.drain() == [2, 3, 4, "x", "a", "b"]
+    assert_list_consistent(linked_list)
+
+def test_linked_list_clear(linked_list):
+    linked_list.append(1)
+    linked_list.clear()
+    assert linked_list.is_empty() is True
+    assert_list_consistent(linked_list)
+    linked_list.append(2)
+    assert linked_list.get_items() == [2]
+
+def test_linked_list_search_and_delete_value(linked_list):
+    for ch in "abcb":
+        linked_list.append(ch)
+    assert linked_list.is_indexed() is False
+    node = linked_list.find("b")
+    assert node.data == "b" and node.next.data == "c" and node.next.next.next is None
+    assert linked_list.find("z") is None
+    assert linked_list.contains("b") is True
+    assert "z" not in linked_list
+    assert linked_list.index_of("b") == 1
+    assert linked_list.index_of("z") == -1
+
+    # 返回被删除节点原来的位置，重复值删除第一个
+    assert linked_list.delete_value("b") == 1
+    assert linked_list.get_items() == ["a", "c", "b"]
+    assert linked_list.index_of("b") == 2
+    assert linked_list.delete_value("z") == -1
+    assert_list_consistent(linked_list)
+
+@pytest.mark.parametrize("doubly", [False, True], ids=["singly", "doubly"])
+def test_linked_list_value_index_stays_in_sync(doubly):
+    """测试值索引在各种插入/删除后与链表内容一致"""
+    ll = LinkedList(doubly=doubly, indexed=True)
+    for v in [1, 2, 3, 2, 4]:
+        ll.append(v)
+    ll.prepend(5)
+    ll.insert_at(3, 2)             # [5, 1, 2, 2, 3, 2, 4]
+    assert ll.index_of("2") == 2   # 与原实现一致：按 str 比较
+    assert ll.find(3).data == 3
+    assert ll.find(9) is None
+
+    assert ll.delete(3) is True    # 唯一值（双向模式走 O(1) 摘除）
+    assert ll.delete_value(2) == 2
+    ll.delete_head()
+    ll.delete_tail()
+    ll.delete_at(1)                # [1, 2]
+    assert ll.get_items() == [1, 2]
+    assert_list_consistent(ll)
+
+    expected = {}
+    for item in ll.get_items():
+        expected[str(item)] = expected.get(str(item), 0) + 1
+    assert {k: len(v) for k, v in ll._index.items()} == expected
+    assert ll.contains(4) is False and ll.contains(5) is False
+
+    ll.clear()
+    assert ll.contains(1) is False
+
+def test_linked_list_indexed_delete_with_listener():
+    """有订阅者时双向 + 索引的直接摘除也要发出带正确位置的事件"""
+    ll = LinkedList(doubly=True, indexed=True)
+    mirror, events = subscribe_mirror(ll)
+    ll.extend("abcde")
+    assert ll.index_of("d") == 3
+    assert ll.delete("c") is True
+    assert events[-1].kind == REMOVED and events[-1].index == 2
+    assert ll.delete_value("d") == 2
+    assert mirror == ll.get_items() == ["a", "b", "e"]
+    assert ll.find("e") is ll.tail
+    assert_list_consistent(ll)
+
+def test_create_linked_list_rejects_indexed_pool():
+    with pytest.raises(StructureValueError):
+        create_linked_list("pool", indexed=True)
+
+def test_linked_list_pool_reuses_slots():
+    """测试数组池后端删除后复用空闲槽位"""
+    ll = create_linked_list("pool")
+    for i in range(4):
+        ll.append(i)
+    ll.delete_at(1)
+    ll.delete_head()
+    ll.insert_at(1, "x")
+    ll.prepend("y")
+    assert ll.get_items() == ["y", 2, "x", 3]
+    assert len(ll._data) == 4  # 没有新增槽位
+    assert_list_consistent(ll)
+
+def test_node_has_no_dict():
+    assert not hasattr(Node(1), "__dict__")
+
+#  变更事件 (ChangeEvent) 的测试 
+
+def subscribe_mirror(structure):
+    """订阅结构的变更事件，返回一个只靠增量事件维护的镜像列表和事件记录"""
+    mirror, events = [], []
+    def on_change(event):
+        events.append(event)
+        apply_to_list(mirror, event)
+    structure.subscribe(on_change)
+    return mirror, events
+
+def test_stack_events_mirror_items():
+    s = Stack(capacity=10)
+    mirror, events = subscribe_mirror(s)
+    s.push(1)
+    s.push_many([2, 3, 4])
+    s.pop()
+    s.drain(2)
+    s.push(5)
+    assert mirror == s.get_items() == [1, 5]
+    assert [e.kind for e in events[:3]] == [INSERTED, INSERTED, REMOVED]
+    assert events[1].index == 1 and events[1].items == (2, 3, 4)
+    assert events[3].index == 1 and events[3].items == (2, 3)  # 按位置顺序
+
+    s.set_capacity(4)
+    assert events[-1].kind == CAPACITY_CHANGED and events[-1].capacity == 4
+    s.clear()
+    assert mirror == []
+
+def test_queue_events_mirror_items():
+    q = Queue(capacity=4)
+    mirror, events = subscribe_mirror(q)
+    q.enqueue_many("ABC")
+    q.dequeue()
+    q.enqueue("D")
+    q.enqueue("E")  # 回绕
+    q.drain(2)
+    assert mirror == q.get_items() == ["D", "E"]
+    assert events[1].kind == REMOVED and events[1].index == 0
+
+def test_linked_list_events_mirror_items(linked_list):
+    mirror, events = subscribe_mirror(linked_list)
+    linked_list.extend("abc")
+    linked_list.prepend("x")
+    linked_list.insert_at(2, "y")
+    linked_list.delete_at(3)
+    linked_list.delete_tail()
+    assert linked_list.delete_value("y") == 2
+    linked_list.append("z")
+    linked_list.drain(1)
+    assert mirror == linked_list.get_items() == ["a", "z"]
+    assert len(events) == 8  # 每个操作一个事件，批量操作也只发一次
+
+    linked_list.clear()
+    assert mirror == []
+
+def test_unsubscribe_stops_events():
+    s = Stack()
+    mirror, events = subscribe_mirror(s)
+    s.unsubscribe(s._listeners[0])
+    s.push(1)
+    assert events == [] and mirror == []
+
+# 游戏模型 (GameModel) 的测试
+
+@pytest.fixture(params=[LIST, ARRAY, COMPACT])
+def game_model(request):
+    """加载第一关（地图见 resources/maps/1.txt），覆盖各网格后端"""
+    model = GameModel(grid_backend=request.param)
+    yield model
+    model.shutdown()  # 停止后台预加载线程
+
+def test_tile_flags_follow_grid(game_model):
+    w = game_model.grid_width
+    assert len(game_model.tile_flags) == w * game_model.grid_height
+    assert game_model.tile_flags[1 * w + 27] == INTERACTIVE  # 钥匙
+    assert game_model.tile_flags[1 * w + 28] == DOOR
+    assert game_model.tile_flags[7 * w + 27] == BLOCKED      # 墙
+
+    game_model.set_tile(27, 1, 0)
+    assert game_model.grid[1][27] == 0
+    assert game_model.tile_flags[1 * w + 27] == 0
+
+def test_collision_flags(game_model):
+    assert game_model.collision_flags(game_model.player_x, game_model.player_y) == 0
+    assert game_model.collision_flags(27, 1) == INTERACTIVE
+    assert game_model.collision_flags(27.5, 1) == INTERACTIVE | DOOR  # 跨两个格子
+    assert game_model.collision_flags(27.5, 6.5) == BLOCKED
+    assert game_model.collision_flags(-1.5, 0) == OUT_OF_BOUNDS
+    assert game_model.collision_flags(game_model.grid_width - 0.5, 0) == OUT_OF_BOUNDS
+
+def test_grid_backends_share_semantics(game_model):
+    grid = game_model.grid
+    assert len(grid) == game_model.grid_height and len(grid[0]) == game_model.grid_width
+    assert grid[1][27] == 5 and grid[7][27] == 1
+
+    snapshot = copy_grid(grid)
+    game_model.set_tile(3, 2, 7)
+    assert grid[2][3] == 7 and snapshot[2][3] == 0
+    assert changed_rows(grid, snapshot) == [2]
+
+def test_dirty_tiles_tracking(game_model):
+    assert game_model.take_dirty_tiles() is None  # 刚加载关卡：整图刷新
+    assert game_model.take_dirty_tiles() == set()
+
+    game_model.set_tile(27, 1, 0)
+    game_model.set_tile(28, 1, 0)
+    assert game_model.take_dirty_tiles() == {(27, 1), (28, 1)}
+    assert game_model.take_dirty_tiles() == set()
+
+    game_model.set_tile(27, 3, 0)
+    game_model.next_level()
+    assert game_model.take_dirty_tiles() is None  # 换关：整图刷新
+
+@pytest.mark.parametrize("backend", [LIST, ARRAY, COMPACT])
+def test_grid_from_cells_matches_rows(backend):
+    level = parse_text("#P#\nK?D\n")
+    grid = grid_from_cells(level.cells, level.width, level.height, backend)
+    assert [list(row) for row in grid] == level.rows() == [[1, 0, 1], [5, -1, 8]]
+
+# 关卡格式 (level_format) 的测试
+
+def test_parse_text_pads_rows_and_finds_player():
+    level = parse_text("#P#\nK?\n")
+    assert (level.width, level.height) == (3, 2)
+    assert level.rows() == [[1, 0, 1], [5, -1, -1]]  # 未知字符与补齐部分为虚空
+    assert level.player_start == (1, 0)
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_parse_file_streams_same_level_as_text(tmp_path, use_mmap):
+    text = "#.P\r\nK\nWé#P\n\n"
+    path = tmp_path / "m.txt"
+    path.write_bytes(text.encode("utf-8"))
+    level = parse_file(str(path), use_mmap=use_mmap)
+    expected = parse_text(text.replace("\r\n", "\n"))
+    assert (level.width, level.height) == (expected.width, expected.height) == (4, 4)
+    assert level.rows() == expected.rows()
+    assert level.player_start == (3, 2)  # 多个 P 时以最后一个为准
+
+def test_binary_level_round_trip(tmp_path):
+    text_path = tmp_path / "m.txt"
+    text_path.write_text("..D\nW#P\n", encoding="utf-8")
+    level = load_level_file(str(text_path))  # 首次加载时顺便编译
+    assert os.path.exists(compiled_path(str(text_path)))
+
+    compiled = load_level_file(str(text_path))
+    assert compiled.rows() == level.rows() == [[0, 0, 8], [3, 1, 0]]
+    assert compiled.player_start == (2, 1)
+    assert decode(encode(parse_text("  "))).player_start is None
+
+    with pytest.raises(MapLoadError):
+        decode(b"XXXX" + encode(level)[4:])
+
+def test_reset_restores_pristine_grid(game_model):
+    original = [list(row) for row in game_model.grid]
+    start = (game_model.player_x, game_model.player_y)
+    game_model.take_dirty_tiles()
+    game_model.set_tile(27, 1, 0)
+    game_model.set_tile(28, 1, 0)
+    game_model.player_x += 3
+    game_model.backpack.push(5)
+    game_model.take_dirty_tiles()
+
+    game_model.reset_current_level()
+    assert [list(row) for row in game_model.grid] == original
+    assert game_model.tile_flags[1 * game_model.grid_width + 28] == DOOR
+    assert (game_model.player_x, game_model.player_y) == start
+    assert game_model.backpack.is_empty()
+    # 只还原改动过的格子，视图按脏格子增量更新
+    assert game_model.take_dirty_tiles() == {(27, 1), (28, 1)}
+
+    game_model.reset_current_level()
+    assert game_model.take_dirty_tiles() == set()
+
+def test_next_level_returns_false_past_last_level(game_model):
+    game_model.current_level_index = len(game_model.level_files) - 1
+    assert game_model.load_level(game_model.current_level_index) is True
+    assert game_model.next_level() is False
+    game_model.shutdown()
+
+def test_next_level_uses_preloaded_level():
+    preloaded = GameModel()
+    synced = GameModel(preload=False)
+    assert len(preloaded._preloads) == 1 and not synced._preloads  # 第二关已在后台解析
+
+    preloaded.next_level()
+    synced.next_level()
+    assert [list(row) for row in preloaded.grid] == [list(row) for row in synced.grid]
+    assert preloaded.tile_flags == synced.tile_flags
+    assert (preloaded.player_x, preloaded.player_y) == (synced.player_x, synced.player_y)
+    assert len(preloaded._preloads) == 1  # 交接后开始预加载第三关
+
+    preloaded.shutdown()
+    preloaded.preload_enabled = True
+    preloaded.load_level(0)
+    assert not preloaded._preloads  # 第二关已在解析缓存中，不再重复提交
+    preloaded.shutdown()
+
+# 固定步长游戏循环 (game_loop) 的测试
+
+def test_fixed_timestep_accumulates_and_caps_steps():
+    loop = FixedTimestep(step=0.01, max_steps=4)
+    assert loop.advance(0.005) == 0
+    assert loop.alpha() == pytest.approx(0.5)
+    assert loop.advance(0.02) == 2  # 0.025 秒：两步，剩半步
+    assert loop.alpha() == pytest.approx(0.5)
+    # 长时间卡顿只补算 max_steps 步，其余时间丢弃
+    assert loop.advance(1.0) == 4
+    assert loop.dropped == pytest.approx(0.96)
+    assert 0.0 <= loop.alpha() < 1.0
+    assert interpolate((0.0, 2.0), (1.0, 4.0), 0.25) == (0.25, 2.5)
+
+def test_rate_counter_reports_per_window():
+    counter = RateCounter(window=1.0)
+    assert not counter.tick(10.0, 0)
+    assert not counter.tick(10.5, 30)
+    assert counter.tick(11.0, 30)
+    assert counter.rate == pytest.approx(60.0)
+
+# 无界面模拟引擎 (GameEngine) 的测试
+
+def _kinds(events):
+    return [e.kind for e in events if e.kind != game_engine.STEPPED]
+
+def test_engine_walks_until_blocked(game_model):
+    engine = GameEngine(game_model)
+    events = engine.run(RIGHT, 1000)
+    assert _kinds(events) == []
+    assert game_model.player_x == pytest.approx(game_model.grid_width - 1, abs=0.25)  # 停在地图边缘
+    assert game_model.player_y == 4.0
+    assert engine.direction(UP | RIGHT) == pytest.approx((0.7071, -0.7071), abs=1e-4)
+    assert engine.direction(LEFT | RIGHT) == (0.0, 0.0)
+
+def test_engine_item_and_monster_rules(game_model):
+    engine = GameEngine(game_model)
+    game_model.player_x, game_model.player_y = 25.0, 5.0
+    events = engine.run(RIGHT, 40)
+    assert _kinds(events) == [game_engine.PICKED_UP, game_engine.MONSTER_KILLED]
+    picked = [e for e in events if e.kind == game_engine.PICKED_UP][0]
+    assert (picked.x, picked.y, picked.value) == (27, 5, 4)  # 剑
+    assert game_model.grid[5][27] == 0 and game_model.grid[5][28] == 0
+    assert game_model.backpack.is_empty()
+
+    game_model.player_x, game_model.player_y = 25.0, 3.0
+    events = engine.run(RIGHT, 40)
+    assert _kinds(events) == [game_engine.PICKED_UP, game_engine.FIRE_EXTINGUISHED]
+
+def test_engine_death_and_reset(game_model):
+    engine = GameEngine(game_model)
+    game_model.player_x, game_model.player_y = 26.0, 3.0
+    game_model.set_tile(27, 3, 0)  # 拿走水，直接撞火
+    events = engine.run(RIGHT, 40)
+    assert _kinds(events) == [game_engine.DIED]
+    assert game_model.is_game_over and events[-1].value == game_model.message
+    assert engine.step(RIGHT) == []  # 死亡后不再推进
+
+    engine.reset()
+    assert not game_model.is_game_over
+    assert game_model.grid[3][27] == 3
+
+def test_engine_door_changes_level(game_model):
+    engine = GameEngine(game_model)
+    game_model.player_x, game_model.player_y = 26.0, 1.0
+    events = engine.run(RIGHT, 40)
+    assert _kinds(events) == [game_engine.PICKED_UP, game_engine.DOOR_OPENED, game_engine.LEVEL_CHANGED]
+    assert game_model.current_level_index == 1
+    assert game_model.message == "第 2 关：开始冒险！"
+    game_model.shutdown()
+
+# 录制与回放 (replay) 的测试
+
+def test_recording_replays_to_same_state(tmp_path):
+    model = GameModel(preload=False)
+    engine = start_engine(model, 0, 0.016)
+    recorder = InputRecorder(engine)
+    script = [(RIGHT, 60), (RIGHT | DOWN, 15), (0, 5), (UP, 30), (RIGHT, 80)]
+    for inputs, steps in script:
+        for _ in range(steps):
+            recorder.record(inputs)
+            engine.step(inputs)
+    if model.is_game_over:  # 撞到火或怪时复活，录下重置
+        recorder.record_reset()
+        engine.reset()
+    recorder.record(LEFT)
+    engine.step(LEFT)
+    path = tmp_path / "run.dsr"
+    save_recording(recorder.finish(), str(path))
+
+    recording = load_recording(str(path))
+    assert recording.total_steps == 191
+    assert len(recording.records) <= 7  # 只记录输入变化
+    result = replay(recording)
+    assert result.matches
+    assert (result.final.player_x, result.final.player_y) == (model.player_x, model.player_y)
+
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(ReplayFormatError):
+        load_recording(str(path))
+
+# 关卡求解器 (solver) 的测试
+
+def test_solver_respects_stack_order():
+    assert solve_level(parse_text("PSKD")).steps == 3
+    assert not solve_level(parse_text("PKSD")).solvable  # 栈顶是剑，开不了门
+    # 火挡在路上：先用水灭火，再取钥匙开门
+    solution = solve_level(parse_text("P.W.F.K.D"))
+    assert solution.solvable and solution.steps == 8
+    assert [a[0] for a in solution.actions] == [
+        game_engine.PICKED_UP, game_engine.FIRE_EXTINGUISHED, game_engine.PICKED_UP, game_engine.DOOR_OPENED]
+
+def test_solver_gives_up_past_state_budget():
+    # 门被墙隔开，搜索只能穷举房间里拾取道具的各种顺序
+    level = parse_text("#########\n#P.W.S.K#\n#.S.K.W.#\n#W.K.S..#\n#########\n#D#")
+    solution = solve_level(level, max_states=50)
+    assert not solution.solvable and not solution.complete
+    solution = solve_level(level)
+    assert not solution.solvable and solution.complete
+
+def test_solver_paths_clear_shipped_levels():
+    """求解出的路线在连续移动的引擎中同样能通关"""
+    moves = {'U': UP, 'D': DOWN, 'L': LEFT, 'R': RIGHT}
+    model = GameModel(preload=False)
+    for index, name in enumerate(model.level_files):
+        engine = start_engine(model, index, 0.016)
+        solution = solve_level(load_level_file(os.path.join(model.maps_path, name)))
+        assert solution.solvable, name
+        kinds = []
+        for move in path_to_moves(solution.path):
+            for _ in range(10):  # 每格 10 步（move_speed 为 0.1）
+                if model.current_level_index == index:
+                    kinds.extend(e.kind for e in engine.step(moves[move]))
+        assert not model.is_game_over, name
+        if index == len(model.level_files) - 1:
+            assert game_engine.GAME_COMPLETED in kinds and game_engine.LEVEL_CHANGED not in kinds
+            assert model.message == "恭喜通关！"
+        else:
+            assert game_engine.LEVEL_CHANGED in kinds and game_engine.GAME_COMPLETED not in kinds, name
+
+# 地图生成 (map_generator) 的测试
+
+def test_generated_maps_are_valid_and_solvable(tmp_path):
+    assert generate_text(MapSpec(30, 12, seed=7)) == generate_text(MapSpec(30, 12, seed=7))
+    for seed in range(20):
+        level = parse_text(generate_text(MapSpec(24, 10, seed=seed, wall_density=0.35)))
+        assert (level.width, level.height) == (24, 10)
+        assert level.player_start is not None
+        assert set(level.rows()[0]) == {1}  # 四周是墙
+        assert solve_level(level).solvable, seed
+
+    path = tmp_path / "big.txt"
+    write_map(MapSpec(300, 200, seed=1), str(path))
+    level = parse_file(str(path))
+    assert (level.width, level.height) == (300, 200)
+
+    with pytest.raises(StructureValueError):
+        MapSpec(3, 3)
+
+# 动画时间线 (animation) 的测试
+
+def test_timeline_phases_follow_elapsed_time():
+    timeline = Timeline([(1, 100), (2, 300)])
+    assert timeline.current() == (1, 0.0)  # 开始
+    timeline.advance(50)
+    assert timeline.current() == (1, 0.5)
+    timeline.advance(200)  # 跨过第一阶段：第二阶段的 150 / 300
+    assert timeline.current() == (2, 0.5)
+    assert not timeline.is_finished()
+    timeline.advance(1000)  # 超出总时长时停在结尾
+    assert timeline.is_finished() and timeline.current() == (2, 1.0)
+
+    timeline.reset()
+    assert timeline.current() == (1, 0.0) and not timeline.is_finished()
+    timeline.finish()
+    assert timeline.current() == (2, 1.0)
+
+def test_timeline_speed_and_easing():
+    fast = Timeline([(0, 400)], speed=4.0)
+    fast.advance(50)
+    assert fast.current() == (0, 0.5)
+    assert Timeline([]).current() == (0, 1.0)
+    assert (ease_in_out(0.0), ease_in_out(0.5), ease_in_out(1.0)) == (0.0, 0.5, 1.0)
+
+def test_animation_clock_unsubscribes_finished_callbacks():
+    from PyQt6.QtCore import QCoreApplication
+    app = QCoreApplication.instance() or QCoreApplication([])
+    clock = AnimationClock()
+    ticks = []
+    def callback(dt):
+        ticks.append(dt)
+        return len(ticks) < 2  # 第二帧后结束
+    clock.add(callback)
+    clock.add(callback)  # 重复订阅无效
+    assert clock.is_running()
+    clock._tick()
+    clock._tick()
+    assert len(ticks) == 2 and all(dt >= 0 for dt in ticks)
+    assert not clock.is_running()  # 没有订阅者时定时器停止
+
+# 槽位视口 (SlotViewport) 的测试
+
+def test_viewport_empty_and_fully_visible():
+    vp = SlotViewport()
+    assert vp.visible_range(0, 10) == (0, 0)
+    assert vp.visible_range(10, 10) == (0, 10)
+    assert vp.visible_range(4, 0) == (0, 1)  # 至少绘制一个槽位
+    vp.scroll(5)
+    assert vp.visible_range(6, 20) == (0, 6) and vp.offset == 0  # 全部可见时忽略滚动
+
+def test_viewport_follow_and_scrolled_window():
+    vp = SlotViewport()
+    assert vp.visible_range(100, 10, anchor=0) == (0, 10)
+    assert vp.visible_range(100, 10, anchor=57) == (48, 58)   # 跟随锚点
+    assert vp.visible_range(100, 10, anchor=120) == (90, 100)  # 不超过末尾
+    vp.scroll(-5)
+    assert not vp.follow
+    assert vp.visible_range(100, 10, anchor=99) == (85, 95)
+    vp.scroll(-200)
+    assert vp.visible_range(100, 10) == (0, 10)  # 不小于 0
+    vp.scroll(500)
+    assert vp.visible_range(100, 10) == (90, 100)
+    vp.reset()
+    assert vp.follow and vp.visible_range(100, 10, anchor=30) == (21, 31)
+
+def test_viewport_zoom_changes_visible_count():
+    vp = SlotViewport()
+    for _ in range(20):
+        vp.zoom_by(1.25)
+    assert vp.zoom == SlotViewport.MAX_ZOOM
+    for _ in range(20):
+        vp.zoom_by(0.8)
+    assert vp.zoom == SlotViewport.MIN_ZOOM
+    vp.scroll(40)
+    # 画布按缩放换算可容纳的槽位数：放大后窗口变窄，起点保持不变
+    width, slot = 800, 80
+    wide = vp.visible_range(100, int(width / (slot * vp.zoom)))
+    vp.zoom = 2.0
+    narrow = vp.visible_range(100, int(width / (slot * vp.zoom)))
+    assert wide == (40, 80) and narrow == (40, 45)
+
+# 链表画布操作队列 (LinkedListCanvas) 的测试
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """无显示环境下的 QApplication（整个测试会话共用，保证共享动画时钟的定时器存活）"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def ll_canvas(qt_app):
+    from src.view.linked_list_canvas import LinkedListCanvas
+    canvas = LinkedListCanvas()
+    yield canvas
+    canvas.flush_animations()
+
+def test_canvas_queues_events_behind_running_animation(ll_canvas):
+    ll = LinkedList()
+    ll.subscribe(ll_canvas.apply_change)
+    ll.append("a")
+    ll.append("b")
+    # 第一个插入立即开始播放，第二个在队列中等待
+    assert ll_canvas.data_items == ["a"] and ll_canvas.backlog_depth() == 1
+    assert ll_canvas.timeline is not None and not ll_canvas.batch_active
+
+def test_canvas_merges_burst_into_one_batch(ll_canvas):
+    ll = LinkedList()
+    ll.subscribe(ll_canvas.apply_change)
+    ll.append(0)  # 占住时间轴，后续操作进入队列
+    for i in range(1, ll_canvas.BATCH_THRESHOLD + 2):
+        ll.append(i)
+    assert ll_canvas.backlog_depth() == ll_canvas.BATCH_THRESHOLD + 1
+    ll_canvas.timeline.finish()
+    ll_canvas._on_frame(0)
+    # 积压超过阈值：一次应用全部操作，只播放一次整体淡入
+    assert ll_canvas.batch_active and ll_canvas.backlog_depth() == 0
+    assert ll_canvas.data_items == ll.get_items()
+
+def test_canvas_skip_empties_queue(ll_canvas):
+    ll = LinkedList()
+    ll.subscribe(ll_canvas.apply_change)
+    ll.extend("abc")
+    ll.delete_head()
+    ll.prepend("x")
+    assert ll_canvas.backlog_depth() > 0
+    ll_canvas.flush_animations()
+    assert ll_canvas.backlog_depth() == 0 and ll_canvas.timeline is None
+    assert ll_canvas.data_items == ll.get_items() == ["x", "b", "c"]
+
+def test_canvas_scroll_range_boundaries(ll_canvas):
+    ll_canvas.resize(400, 200)  # 节点间距 pitch = 110，起始边距 40，末尾留 80
+    ll_canvas.update_data([])
+    assert ll_canvas.scroll_maximum() == 0 and ll_canvas.h_scrollbar.isHidden()
+    assert ll_canvas.visible_node_range() == (0, 0)
+
+    ll_canvas.update_data(list(range(3)))  # 内容 40 + 330 + 80 = 450，超出 50
+    assert ll_canvas.scroll_maximum() == 50 and not ll_canvas.h_scrollbar.isHidden()
+
+    ll_canvas.update_data(list(range(10)))  # 内容 1220，最多滚动 820
+    assert ll_canvas.h_scrollbar.maximum() == ll_canvas.scroll_maximum() == 820
+    assert ll_canvas.visible_node_range() == (0, 5)  # 第一个节点；第 3 个节点部分可见
+    ll_canvas.h_scrollbar.setValue(420)  # 第 3 个节点只有右侧 10px 在画布内
+    first, last = ll_canvas.visible_node_range()
+    assert first <= 3 and last >= 7
+    ll_canvas.h_scrollbar.setValue(10_000)  # 滚过末尾时停在最大值
+    assert ll_canvas.scroll_x == 820
+    assert ll_canvas.visible_node_range() == (5, 10)  # 包含最后一个节点，不越界
+
+# 游戏视图图集 (GameView / TileAtlas) 的测试
+
+def test_game_view_rebuilds_atlas_on_dpr_change(qt_app):
+    from PyQt6.QtCore import QEvent
+    from src.game.game_view import GameView
+    view = GameView()
+    view.render([[1, 0, 8], [0, 3, 1]], (1, 1), "")
+    old = view.atlas
+    assert old.device_pixel_ratio == view.devicePixelRatioF()
+    view.refresh_atlas()
+    assert view.atlas is old  # 比例未变时不重建
+
+    old.device_pixel_ratio = 3.0  # 模拟图集按旧屏幕的比例生成
+    qt_app.sendEvent(view, QEvent(QEvent.Type.DevicePixelRatioChange))
+    assert view.atlas is not old and view.atlas.device_pixel_ratio == view.devicePixelRatioF()
+    assert view.chunks and all(chunk.atlas is view.atlas for chunk in view.chunks.values())
+
+def test_chunk_span_and_window_boundaries():
+    from src.game.game_view import chunk_span, chunk_window
+    span = 1280  # 40px * 32 格
+    assert chunk_span(0, 1280, span) == (0, 0)        # 恰好一个区块宽，不多算右侧区块
+    assert chunk_span(0, 1281, span) == (0, 1)        # 右侧区块露出 1px
+    assert chunk_span(1279, 1280, span) == (0, 0)
+    assert chunk_span(1000, 3000, span) == (0, 2)     # 两端部分可见
+    assert chunk_span(0, 0, span) == (0, 0)           # 空视口
+    # 外扩一圈并截到地图内：第一个、最后一个、滚过末尾
+    assert list(chunk_window(0, 0, 4)) == [0, 1]
+    assert list(chunk_window(3, 3, 4)) == [2, 3]
+    assert list(chunk_window(1, 2, 4)) == [0, 1, 2, 3]
+    assert list(chunk_window(6, 7, 4)) == []
+    assert list(chunk_window(0, 0, 1)) == [0]
+
+def test_game_view_recycles_chunks(qt_app):
+    from src.game.game_view import GameView, CHUNK_SIZE
+    view = GameView()
+    size = CHUNK_SIZE * 6  # 6x6 个区块
+    grid = [[0] * size for _ in range(size)]
+    view._build_scene(grid)
+    view.chunks.clear()
+    view._chunk_pool.clear()
+    view.scene.clear()
+
+    view._sync_chunks(0, 0, 0, 0)  # 左上角：外扩一圈只到 (1, 1)
+    assert set(view.chunks) == {(x, y) for x in range(2) for y in range(2)}
+
+    view._sync_chunks(5, 5, 5, 5)  # 右下角：旧区块全部回收，新区块复用回收的图元
+    assert set(view.chunks) == {(x, y) for x in range(4, 6) for y in range(4, 6)}
+    assert not view._chunk_pool  # 4 个回收的图元刚好被复用
+
+    view._sync_chunks(3, 3, 3, 3)  # 离旧视口两圈以内的区块保留
+    kept = {(x, y) for x in range(4, 6) for y in range(4, 6)}
+    assert set(view.chunks) == kept | {(x, y) for x in range(2, 5) for y in range(2, 5)}
+    view._sync_chunks(9, 9, 9, 9)  # 滚过地图末尾：不生成越界区块，全部回收
+    assert not view.chunks and len(view._chunk_pool) == 12